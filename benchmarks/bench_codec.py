@@ -0,0 +1,82 @@
+"""Compares the JSON codecs available in this environment on job reports of increasing sizes, shaped like the reports of
+heavy analyzers (long lists of records in ``full``, taxonomies in ``summary``, and extracted artifacts).
+
+Usage: python -m benchmarks.bench_codec [--rounds N]"""
+import argparse
+import time
+
+from cortex4py.codec import CODECS, JsonCodec
+
+
+def make_report(records):
+    return {
+        'id': 'AWx00000001',
+        'workerDefinitionId': 'VirusTotal_GetReport_3_0',
+        'status': 'Success',
+        'dataType': 'hash',
+        'data': 'e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855',
+        'report': {
+            'success': True,
+            'summary': {
+                'taxonomies': [{
+                    'level': 'malicious',
+                    'namespace': 'VT',
+                    'predicate': 'GetReport',
+                    'value': '{}/{}'.format(i, records)
+                } for i in range(5)]
+            },
+            'full': {
+                'scans': [{
+                    'engine': 'engine-{}'.format(i),
+                    'detected': i % 3 == 0,
+                    'version': '1.{}.{}'.format(i % 10, i % 100),
+                    'result': 'Trojan.Generic.{}'.format(i) if i % 3 == 0 else None,
+                    'update': 20190101 + i % 365,
+                    'score': i / 7.0,
+                    'comment': 'Détection heuristique n°{} — signature mise à jour'.format(i)
+                } for i in range(records)],
+                'permalink': 'https://www.virustotal.com/file/e3b0c442/analysis/'
+            },
+            'artifacts': [{
+                'dataType': 'domain',
+                'data': 'host-{}.example.com'.format(i),
+                'tags': ['vt', 'contacted']
+            } for i in range(records // 10)]
+        }
+    }
+
+
+def timed(fn, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - started) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    codecs = []
+    for cls in CODECS.values():
+        try:
+            codecs.append(cls())
+        except ImportError:
+            print('{:<8} not installed'.format(cls.name))
+
+    for records in (100, 10000, 50000):
+        report = make_report(records)
+        body = JsonCodec().dumps(report)
+        print('report of {} records ({:.1f} MiB)'.format(records, len(body) / 1048576))
+
+        for codec in codecs:
+            rounds = max(1, args.rounds * 1000 // records)
+            loads = timed(lambda: codec.loads(body), rounds)
+            dumps = timed(lambda: codec.dumps(report), rounds)
+            print('  {:<8} loads {:>8.2f} ms {:>7.0f} MiB/s   dumps {:>8.2f} ms {:>7.0f} MiB/s'.format(
+                codec.name, loads * 1000, len(body) / 1048576 / loads, dumps * 1000, len(body) / 1048576 / dumps))
+
+
+if __name__ == '__main__':
+    main()
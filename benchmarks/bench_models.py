@@ -0,0 +1,79 @@
+"""Compares the memory used by a page of jobs wrapped by the historical models (one ``__dict__`` copy per object, built
+eagerly into a list) with the slot-based models, in a list and in a lazy ``ModelList`` (``compact_lists`` option).
+
+Usage: python -m benchmarks.bench_models [--jobs N]"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from types import SimpleNamespace
+
+from cortex4py.controllers.abstract import AbstractController
+from cortex4py.models import Job
+
+
+class LegacyJob(object):
+    def __init__(self, data):
+        self.__dict__ = {k: v for k, v in data.items() if not k.startswith('_')}
+
+
+def legacy_wrap(data, cls):
+    return list(map(lambda item: cls(item), data))
+
+
+def make_jobs(count):
+    return json.dumps([{
+        '_id': 'AWx{:08d}'.format(i),
+        '_type': 'job',
+        '_routing': 'AWx{:08d}'.format(i),
+        '_parent': None,
+        '_version': 1,
+        'id': 'AWx{:08d}'.format(i),
+        'organization': 'cert',
+        'workerId': 'a1b2c3d4e5f6',
+        'workerDefinitionId': 'Abuse_Finder_3_0',
+        'workerName': 'Abuse_Finder_3_0',
+        'status': 'Success',
+        'dataType': 'ip',
+        'data': '10.0.{}.{}'.format(i // 256 % 256, i % 256),
+        'tlp': 2,
+        'pap': 2,
+        'message': '',
+        'parameters': '{}',
+        'startDate': 1560000000000 + i,
+        'endDate': 1560000001000 + i,
+        'createdAt': 1560000000000 + i,
+        'createdBy': 'admin',
+        'date': 1560000000000 + i
+    } for i in range(count)])
+
+
+def measure(label, text, wrap, cls):
+    tracemalloc.start()
+    started = time.perf_counter()
+    jobs = wrap(json.loads(text), cls)
+    size, peak = tracemalloc.get_traced_memory()
+    count = sum(1 for job in jobs if job.status == 'Success')
+    elapsed = time.perf_counter() - started
+    tracemalloc.stop()
+
+    print('{:<24} {:>8.1f} MiB held {:>8.1f} MiB peak {:>6.2f}s ({} jobs)'.format(
+        label, size / 1048576, peak / 1048576, elapsed, count))
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--jobs', type=int, default=100000)
+    args = parser.parse_args()
+
+    text = make_jobs(args.jobs)
+    measure('legacy models', text, legacy_wrap, LegacyJob)
+    measure('slot-based models', text, AbstractController('job', None)._wrap, Job)
+    compact_api = SimpleNamespace(json_codec=None, compact_lists=True)
+    measure('slot-based lazy models', text, AbstractController('job', compact_api)._wrap, Job)
+
+
+if __name__ == '__main__':
+    main()
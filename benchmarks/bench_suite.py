@@ -0,0 +1,144 @@
+"""Measures the throughput, the latency percentiles and the memory of the client on the main operations, against the
+fake Cortex server of ``benchmarks.fake_cortex``, run in a separate process so that it neither competes with the
+client for the GIL nor counts in its memory.
+
+Scenarios: ``status`` (round trip baseline), ``run`` (analyzer runs), ``upload`` (file analyzer runs), ``search``
+(pages of jobs), ``stats`` (aggregations), ``report`` (report fetches), and ``wait`` (analyzer run followed by a wait
+for its report). The latencies are measured per operation over ``--ops`` operations made from ``--threads`` threads.
+The peak memory is the highest amount of memory allocated by Python (``tracemalloc``) during a second, shorter, run of
+the scenario.
+
+Usage: python -m benchmarks.bench_suite [--scenarios run,report,...] [--ops N] [--threads N] [--latency S]
+                                        [--report-records N] [--file-size KiB] [--output results.json]"""
+import argparse
+import io
+import json
+import multiprocessing
+import time
+import tracemalloc
+
+from concurrent.futures import ThreadPoolExecutor
+
+from cortex4py.api import Api
+from cortex4py.stats import Count, GroupBy, TimeHistogram
+from .fake_cortex import FakeCortex, FakeCortexServer
+
+SCENARIOS = ('status', 'run', 'upload', 'search', 'stats', 'report', 'wait')
+
+
+def serve(options, queue):
+    cortex = FakeCortex(latency=options['latency'], jitter=options['jitter'], job_duration=options['job_duration'],
+                        report_records=options['report_records'], jobs=options['jobs'])
+    server = FakeCortexServer(cortex)
+    queue.put(server.url)
+    server.httpd.serve_forever()
+
+
+def scenario(name, api, args, job_ids):
+    analyzer_id = 'an0000'
+    payload = bytes(bytearray(range(256))) * (args.file_size * 4)
+
+    def observable(index):
+        return {'dataType': 'ip', 'data': '10.{}.{}.{}'.format(index // 65536 % 256, index // 256 % 256, index % 256)}
+
+    if name == 'status':
+        return lambda index: api.status()
+    elif name == 'run':
+        return lambda index: api.analyzers.run_by_id(analyzer_id, observable(index))
+    elif name == 'upload':
+        return lambda index: api.analyzers.run_by_id(analyzer_id, {'dataType': 'file', 'data': io.BytesIO(payload),
+                                                                   'filename': 'sample-{}.bin'.format(index)},
+                                                     content_type='application/octet-stream')
+    elif name == 'search':
+        return lambda index: api.jobs.find_all({}, range='0-{}'.format(args.page_size), sort='-createdAt')
+    elif name == 'stats':
+        aggs = [Count(), GroupBy('status'), GroupBy('workerName', Count()), TimeHistogram('createdAt', '1d')]
+        return lambda index: api.jobs.stats({}, aggs)
+    elif name == 'report':
+        return lambda index: api.jobs.get_report(job_ids[index % len(job_ids)])
+    elif name == 'wait':
+        return lambda index: api.jobs.get_report_async(api.analyzers.run_by_id(analyzer_id, observable(index)).id,
+                                                       timeout='1minute')
+    raise ValueError('Unknown scenario {}'.format(name))
+
+
+def measure(call, ops, threads):
+    latencies = [0.0] * ops
+
+    def timed(index):
+        started = time.perf_counter()
+        call(index)
+        latencies[index] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for _ in executor.map(timed, range(ops)):
+            pass
+    return time.perf_counter() - started, sorted(latencies)
+
+
+def percentile(latencies, q):
+    return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+    parser.add_argument('--ops', type=int, default=1000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.0, help='server latency per request, in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0, help='random extra server latency, in seconds')
+    parser.add_argument('--job-duration', type=float, default=0.0, help='time to complete a job, in seconds')
+    parser.add_argument('--report-records', type=int, default=1000, help='records per report')
+    parser.add_argument('--file-size', type=int, default=256, help='size of the uploaded files, in KiB')
+    parser.add_argument('--page-size', type=int, default=100, help='jobs per search page')
+    parser.add_argument('--jobs', type=int, default=2000, help='jobs created before the runs')
+    parser.add_argument('--output', default=None, help='file to write the results to, as JSON')
+    args = parser.parse_args()
+
+    queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(vars(args), queue), daemon=True)
+    server.start()
+    results = []
+    try:
+        url = queue.get(timeout=30)
+        with Api(url, 'benchmark', pool_maxsize=args.threads, retry=None) as api:
+            job_ids = [job.id for job in api.jobs.find_all({}, range='0-{}'.format(args.jobs))]
+
+            print('{:<8} {:>7} {:>9} {:>9} {:>9} {:>9} {:>9} {:>10}'.format(
+                'scenario', 'ops', 'ops/s', 'p50 ms', 'p90 ms', 'p99 ms', 'max ms', 'peak MiB'))
+            for name in args.scenarios.split(','):
+                call = scenario(name, api, args, job_ids)
+                # Warm the connections up before measuring
+                measure(call, args.threads, args.threads)
+                elapsed, latencies = measure(call, args.ops, args.threads)
+
+                tracemalloc.start()
+                measure(call, max(args.threads, args.ops // 10), args.threads)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+                result = {
+                    'scenario': name,
+                    'ops': args.ops,
+                    'throughput': args.ops / elapsed,
+                    'p50': percentile(latencies, 0.5),
+                    'p90': percentile(latencies, 0.9),
+                    'p99': percentile(latencies, 0.99),
+                    'max': latencies[-1],
+                    'peak_memory': peak
+                }
+                results.append(result)
+                print('{:<8} {:>7} {:>9.0f} {:>9.2f} {:>9.2f} {:>9.2f} {:>9.2f} {:>10.1f}'.format(
+                    name, args.ops, result['throughput'], result['p50'] * 1000, result['p90'] * 1000,
+                    result['p99'] * 1000, result['max'] * 1000, peak / 1048576))
+    finally:
+        server.terminate()
+
+    if args.output is not None:
+        with open(args.output, 'w') as file_obj:
+            json.dump({'options': vars(args), 'results': results}, file_obj, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""Compares a fresh connection per call (the historical ``requests.get`` behaviour) with the pooled ``Api`` session.
+
+Usage: python -m benchmarks.bench_transport [--requests N] [--threads N]"""
+import argparse
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from cortex4py.api import Api
+from .stub_server import StubServer
+
+
+def run(label, call, total, threads):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for _ in executor.map(lambda _: call(), range(total)):
+            pass
+    elapsed = time.perf_counter() - started
+    print('{:<24} {:>8.0f} req/s ({} requests in {:.2f}s)'.format(label, total / elapsed, total, elapsed))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=8)
+    args = parser.parse_args()
+
+    with StubServer() as server:
+        url = '{}/api/status'.format(server.url)
+        headers = {'Authorization': 'Bearer benchmark'}
+
+        run('requests.get per call', lambda: requests.get(url, headers=headers).raise_for_status(),
+            args.requests, args.threads)
+
+        with Api(server.url, 'benchmark', pool_maxsize=args.threads) as api:
+            run('pooled Api session', api.status, args.requests, args.threads)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,339 @@
+"""A fake Cortex server implementing, in memory, the endpoints used by the controllers: searches and statistics,
+analyzer and responder lookups and runs (JSON and multipart file submissions), job reports, report waits and
+artifacts, and job deletions.
+
+Every request is delayed by ``latency`` seconds (plus up to ``jitter``), jobs are completed ``job_duration`` seconds
+after their submission, and reports hold ``report_records`` records (about 300 bytes each) and a tenth as many
+artifacts.
+
+Usage: python -m benchmarks.fake_cortex [--port N] [--latency S] [--job-duration S] [--report-records N] [--jobs N]"""
+import argparse
+import heapq
+import json
+import random
+import re
+import threading
+import time
+
+from urllib.parse import urlparse, parse_qs
+
+from .bench_codec import make_report
+from .stub_server import StubHandler, StubServer
+
+_DURATION = re.compile(r'^(\d+)\s*([a-zA-Z]*)$')
+_UNITS = {'': 1, 'ms': 0.001, 'millisecond': 0.001, 'milliseconds': 0.001, 's': 1, 'second': 1, 'seconds': 1,
+          'minute': 60, 'minutes': 60, 'hour': 3600, 'hours': 3600}
+_MULTIPART_JSON = re.compile(rb'name="_json"\r\n(?:[^\r\n]+\r\n)*\r\n(.*?)\r\n--', re.DOTALL)
+
+
+def parse_duration(value):
+    """Returns the number of seconds of a Cortex duration such as ``10seconds`` or ``1minute``, ``None`` for ``Inf``."""
+    match = _DURATION.match(value or '')
+    if match is None:
+        return None
+    return int(match.group(1)) * _UNITS.get(match.group(2).lower(), 1)
+
+
+def match(query, document):
+    if not query:
+        return True
+    if '_and' in query:
+        return all(match(criterion, document) for criterion in query['_and'])
+    if '_or' in query:
+        return any(match(criterion, document) for criterion in query['_or'])
+    if '_not' in query:
+        return not match(query['_not'], document)
+    if '_id' in query:
+        return document['id'] == query['_id']
+    if '_field' in query:
+        return document.get(query['_field']) == query['_value']
+    if '_in' in query:
+        return document.get(query['_in']['_field']) in query['_in']['_values']
+    if '_contains' in query:
+        return document.get(query['_contains']) is not None
+    if '_between' in query:
+        value = document.get(query['_between']['_field'])
+        return value is not None and query['_between']['_from'] <= value < query['_between']['_to']
+    for operator, compare in (('_lt', lambda a, b: a < b), ('_lte', lambda a, b: a <= b),
+                              ('_gt', lambda a, b: a > b), ('_gte', lambda a, b: a >= b)):
+        if operator in query:
+            (field, value), = query[operator].items()
+            return document.get(field) is not None and compare(document[field], value)
+    # Unsupported operators match everything
+    return True
+
+
+def aggregate(aggs, documents):
+    result = {}
+    for agg in aggs:
+        kind = agg['_agg']
+        name = agg.get('_name', kind if kind == 'count' else '{}_{}'.format(kind, agg.get('_field')))
+        if kind == 'count':
+            result[name] = len(documents)
+        elif kind in ('min', 'max', 'avg', 'sum'):
+            values = [doc[agg['_field']] for doc in documents if isinstance(doc.get(agg['_field']), (int, float))]
+            if kind == 'sum':
+                result[name] = sum(values)
+            elif len(values) == 0:
+                result[name] = None
+            else:
+                result[name] = {'min': min, 'max': max, 'avg': lambda v: sum(v) / len(v)}[kind](values)
+        elif kind == 'field':
+            groups = {}
+            for doc in documents:
+                groups.setdefault(str(doc.get(agg['_field'])), []).append(doc)
+            largest = sorted(groups.items(), key=lambda group: -len(group[1]))[:agg.get('_size', 10)]
+            result[name] = dict((key, aggregate(agg.get('_select', []), docs)) for key, docs in largest)
+        elif kind == 'time':
+            unit = {'h': 3600000, 'd': 86400000, 'w': 604800000, 'M': 2592000000}.get(agg['_interval'][-1:], 86400000)
+            interval = unit * int(agg['_interval'][:-1] or 1)
+            buckets = {}
+            for field in agg['_fields']:
+                for doc in documents:
+                    if doc.get(field) is not None:
+                        start = str(doc[field] // interval * interval)
+                        buckets.setdefault(start, {}).setdefault(field, []).append(doc)
+            result[name] = dict((start, dict((field, aggregate(agg.get('_select', []), docs))
+                                             for field, docs in fields.items()))
+                                for start, fields in buckets.items())
+    return result
+
+
+class FakeCortex(object):
+    """State of the fake server: the workers and the jobs, shared by the request threads."""
+
+    def __init__(self, latency=0.0, jitter=0.0, job_duration=0.0, report_records=100, analyzers=5, responders=2,
+                 jobs=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.job_duration = job_duration
+        self.report_records = report_records
+
+        self.lock = threading.Lock()
+        self.workers = {}
+        for kind, count in (('analyzer', analyzers), ('responder', responders)):
+            for index in range(count):
+                worker_id = '{}{:04d}'.format(kind[:2], index)
+                self.workers[worker_id] = {
+                    'id': worker_id,
+                    'type': kind,
+                    'name': '{}_{}_1_0'.format(kind.capitalize(), index),
+                    'workerDefinitionId': '{}_{}_1_0'.format(kind.capitalize(), index),
+                    'dataTypeList': ['ip', 'domain', 'hash', 'file', 'url'],
+                    'rate': None,
+                    'rateUnit': None,
+                    'createdAt': 1546300800000,
+                    'createdBy': 'admin'
+                }
+        self.jobs = {}
+        self._pending = []
+        self._done = {}
+        self._sequence = 0
+
+        report = make_report(report_records)['report']
+        self.report = json.dumps(report).encode('utf-8')
+        self.artifacts = json.dumps(report['artifacts']).encode('utf-8')
+
+        for index in range(jobs):
+            self.submit('an0000', {'dataType': 'ip', 'data': '10.0.{}.{}'.format(index // 256 % 256, index % 256)},
+                        created_at=1546300800000 + index * 1000)
+
+    def submit(self, worker_id, post, created_at=None):
+        worker = self.workers[worker_id]
+        with self.lock:
+            self._sequence += 1
+            job_id = 'AWx{:012d}'.format(self._sequence)
+            now = created_at if created_at is not None else int(time.time() * 1000)
+            job = {
+                'id': job_id,
+                'type': worker['type'],
+                'organization': 'cert',
+                'workerId': worker_id,
+                'workerDefinitionId': worker['workerDefinitionId'],
+                'workerName': worker['name'],
+                'status': 'Waiting',
+                'dataType': post.get('dataType'),
+                'data': post.get('data') if post.get('dataType') != 'file' else None,
+                'attachment': {'name': 'data', 'size': 0} if post.get('dataType') == 'file' else None,
+                'tlp': post.get('tlp', 2),
+                'pap': post.get('pap', 2),
+                'message': post.get('message', ''),
+                'parameters': post.get('parameters', {}),
+                'createdAt': now,
+                'createdBy': 'admin',
+                'startDate': now
+            }
+            self.jobs[job_id] = job
+            self._done[job_id] = (now / 1000.0 if created_at is not None else time.time()) + self.job_duration
+            heapq.heappush(self._pending, (self._done[job_id], job_id))
+            self._settle()
+            return dict(job)
+
+    def _settle(self):
+        # Complete the jobs whose duration has elapsed. The caller holds the lock
+        now = time.time()
+        while len(self._pending) > 0 and self._pending[0][0] <= now:
+            done, job_id = heapq.heappop(self._pending)
+            job = self.jobs[job_id]
+            if job['status'] == 'Waiting':
+                job['status'] = 'Success'
+                job['endDate'] = int(done * 1000)
+
+    def job(self, job_id):
+        """Returns a copy of the job, and the time at which it completes."""
+        with self.lock:
+            self._settle()
+            job = self.jobs.get(job_id, None)
+            return (dict(job) if job is not None else None), self._done.get(job_id, 0)
+
+    def documents(self, kind):
+        """Returns the jobs or workers of type ``kind``, to be read only."""
+        with self.lock:
+            if kind == 'job':
+                self._settle()
+                return list(self.jobs.values())
+            return [worker for worker in self.workers.values() if worker['type'] == kind]
+
+
+class FakeCortexHandler(StubHandler):
+    def _read_body(self):
+        if self.headers.get('Transfer-Encoding', '').lower() != 'chunked':
+            return super(FakeCortexHandler, self)._read_body()
+
+        chunks = []
+        while True:
+            size = int(self.rfile.readline().split(b';')[0], 16)
+            if size == 0:
+                self.rfile.readline()
+                return b''.join(chunks)
+            chunks.append(self.rfile.read(size))
+            self.rfile.readline()
+
+    def _send_bytes(self, body, status=200):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _not_found(self):
+        self._send_json({'type': 'NotFoundError', 'message': self.path}, status=404)
+
+    def _route(self):
+        cortex = self.server.cortex
+        delay = cortex.latency + (random.uniform(0, cortex.jitter) if cortex.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+
+        url = urlparse(self.path)
+        params = dict((key, values[0]) for key, values in parse_qs(url.query).items())
+        return cortex, url.path[len('/api/'):].strip('/').split('/'), params
+
+    def _send_report(self, cortex, job):
+        body = json.dumps(job).encode('utf-8')
+        self._send_bytes(body[:-1] + b', "report": ' + cortex.report + b'}')
+
+    def do_GET(self):
+        cortex, path, params = self._route()
+
+        if path == ['status']:
+            self._send_json({'versions': {'Cortex': 'fake'}, 'config': {'authType': ['key']}})
+        elif path[0] in ('analyzer', 'responder') and len(path) == 3 and path[1] == 'type':
+            self._send_json([worker for worker in cortex.documents(path[0]) if path[2] in worker['dataTypeList']])
+        elif path[0] in ('analyzer', 'responder') and len(path) == 2:
+            worker = cortex.workers.get(path[1], None)
+            self._send_json(worker) if worker is not None else self._not_found()
+        elif path[0] == 'job' and len(path) >= 2:
+            job, done = cortex.job(path[1])
+            if job is None:
+                self._not_found()
+            elif len(path) == 2:
+                self._send_json(job)
+            elif path[2] == 'report':
+                self._send_report(cortex, job)
+            elif path[2] == 'waitreport':
+                timeout = parse_duration(params.get('atMost', 'Inf'))
+                deadline = time.time() + timeout if timeout is not None else None
+                while job['status'] == 'Waiting' and (deadline is None or time.time() < deadline):
+                    time.sleep(min(0.01, max(0.0, done - time.time())))
+                    job, done = cortex.job(path[1])
+                self._send_report(cortex, job)
+            elif path[2] == 'artifacts':
+                self._send_bytes(cortex.artifacts if job['status'] == 'Success' else b'[]')
+            else:
+                self._not_found()
+        else:
+            self._not_found()
+
+    def do_POST(self):
+        body = self._read_body()
+        cortex, path, params = self._route()
+
+        if len(path) == 2 and path[1] in ('_search', '_stats') and path[0] in ('job', 'analyzer', 'responder'):
+            request = json.loads(body or b'{}')
+            documents = [doc for doc in cortex.documents(path[0]) if match(request.get('query'), doc)]
+            if path[1] == '_stats':
+                return self._send_json(aggregate(request.get('stats', []), documents))
+
+            for key in reversed([key for key in (params.get('sort') or '').split(',') if key]):
+                field = key.lstrip('+-')
+                documents.sort(key=lambda doc: (doc.get(field) is None, doc.get(field)), reverse=key[0] == '-')
+            start, _, end = (params.get('range') or '0-10').partition('-')
+            if start != 'all':
+                documents = documents[int(start):int(end or 0)]
+            self._send_json(documents)
+        elif len(path) == 3 and path[0] in ('analyzer', 'responder') and path[2] == 'run':
+            if path[1] not in cortex.workers:
+                return self._not_found()
+            if self.headers.get('Content-Type', '').startswith('multipart/form-data'):
+                found = _MULTIPART_JSON.search(body)
+                post = json.loads(found.group(1)) if found is not None else {'dataType': 'file'}
+            else:
+                post = json.loads(body or b'{}')
+            self._send_json(cortex.submit(path[1], post))
+        else:
+            self._not_found()
+
+    def do_DELETE(self):
+        cortex, path, params = self._route()
+
+        if len(path) == 2 and path[0] == 'job':
+            with cortex.lock:
+                job = cortex.jobs.get(path[1], None)
+                if job is not None:
+                    job['status'] = 'Deleted'
+            if job is None:
+                return self._not_found()
+            self.send_response(204)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        else:
+            self._not_found()
+
+
+class FakeCortexServer(StubServer):
+    """Runs a ``FakeCortex`` on a background thread, bound to a random local port."""
+    def __init__(self, cortex=None, host='127.0.0.1', port=0):
+        super(FakeCortexServer, self).__init__(FakeCortexHandler, host, port)
+        self.cortex = self.httpd.cortex = cortex or FakeCortex()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--port', type=int, default=9001)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--job-duration', type=float, default=0.0)
+    parser.add_argument('--report-records', type=int, default=100)
+    parser.add_argument('--jobs', type=int, default=0)
+    args = parser.parse_args()
+
+    cortex = FakeCortex(latency=args.latency, jitter=args.jitter, job_duration=args.job_duration,
+                        report_records=args.report_records, jobs=args.jobs)
+    server = FakeCortexServer(cortex, port=args.port)
+    print('Fake Cortex listening on {}'.format(server.url))
+    server.httpd.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""A minimal fake Cortex server used by the benchmarks.
+
+It speaks HTTP/1.1 with keep-alive so that connection reuse on the client side can be measured."""
+import json
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def do_GET(self):
+        if self.path.startswith('/api/status'):
+            self._send_json({'versions': {'Cortex': 'stub'}, 'config': {}})
+        else:
+            self._send_json({'type': 'NotFoundError'}, status=404)
+
+    def do_POST(self):
+        self._read_body()
+        self._send_json([])
+
+
+class StubServer(object):
+    """Runs a ``StubHandler`` server on a background thread, bound to a random local port."""
+    def __init__(self, handler=StubHandler, host='127.0.0.1', port=0):
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return 'http://{}:{}'.format(host, port)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
@@ -2,10 +2,20 @@
 # -*- coding: utf-8 -*-
 
 import sys
+import time
 import requests
+from requests.adapters import HTTPAdapter
 import warnings
 
 from .exceptions import *
+from .codec import get_codec
+from .mime import MimeDetector
+from .retry import RetryPolicy
+from .balancer import NodePool
+from .metrics import RequestInfo, body_size
+from .transport import Transport
+from .singleflight import SingleFlight
+from .deadline import deadline, current_deadline
 from .controllers.organizations import OrganizationsController
 from .controllers.users import UsersController
 from .controllers.jobs import JobsController
@@ -15,9 +25,17 @@ from .controllers.responders import RespondersController
 
 class Api(object):
     """This is the main class for communicating with the Cortex API. As this is a new major version, authentication is
-    only possible through the api key. Basic auth with user/pass is deprecated."""
+    only possible through the api key. Basic auth with user/pass is deprecated.
+
+    All the calls go through a single ``requests.Session`` backed by a pool of keep-alive connections, so an ``Api``
+    instance should be reused (and shared between threads) rather than created per call. Call ``close()`` or use the
+    instance as a context manager to release the pooled connections.
+
+    ``url`` can also be a list of URLs of Cortex nodes sharing the same database, the calls are then spread over the
+    nodes by a ``NodePool``, and retried on another node when a node fails."""
     def __init__(self, url, api_key, **kwargs):
-        if not isinstance(url, str) or not isinstance(api_key, str):
+        urls = [url] if isinstance(url, str) else list(url) if isinstance(url, (list, tuple)) else None
+        if not urls or not all(isinstance(value, str) for value in urls) or not isinstance(api_key, str):
             raise TypeError('URL and API key are required and must be of type string.')
 
         # Drop a warning for python2 because reasons
@@ -25,10 +43,40 @@ class Api(object):
             warnings.warn('You are using Python 2.x. That can work, but is not supported.')
 
         self.__api_key = api_key
-        self.__url = url
-        self.__base_url = '{}/api/'.format(url)
         self.__proxies = kwargs.get('proxies', {})
         self.__verify_cert = kwargs.get('verify_cert', kwargs.get('cert', True))
+        self.__session = self.__build_session(
+            pool_connections=kwargs.get('pool_connections', 10),
+            pool_maxsize=kwargs.get('pool_maxsize', 10),
+            pool_block=kwargs.get('pool_block', False),
+            keep_alive=kwargs.get('keep_alive', True)
+        )
+
+        timeout = kwargs.get('timeout', None)
+        if isinstance(timeout, tuple):
+            self.connect_timeout, self.read_timeout = timeout
+        elif timeout is not None:
+            self.connect_timeout = self.read_timeout = timeout
+        else:
+            self.connect_timeout = kwargs.get('connect_timeout', 10)
+            self.read_timeout = kwargs.get('read_timeout', 60)
+
+        self.json_codec = get_codec(kwargs.get('json_codec', None))
+        self.compact_lists = kwargs.get('compact_lists', False)
+        self.catalog_ttl = kwargs.get('catalog_ttl', 60)
+        self.mime_detector = MimeDetector(kwargs.get('mime_hook', None))
+        self.retry_policy = kwargs.get('retry', RetryPolicy())
+        self.report_cache = kwargs.get('report_cache', None)
+        self.rate_limiter = kwargs.get('rate_limiter', None)
+        self.circuit_breaker = kwargs.get('circuit_breaker', None)
+        self.hooks = list(kwargs.get('hooks', []))
+        self.transport = kwargs.get('transport', None) or Transport()
+        self.single_flight = SingleFlight() if kwargs.get('coalesce', False) else None
+        self.nodes = NodePool(urls,
+                              strategy=kwargs.get('balancing', 'round_robin'),
+                              max_failures=kwargs.get('max_node_failures', 3),
+                              probe_interval=kwargs.get('probe_interval', 5),
+                              probe=lambda node: self.status(node=node))
 
         self.organizations = OrganizationsController(self)
         self.users = UsersController(self)
@@ -36,6 +84,35 @@ class Api(object):
         self.analyzers = AnalyzersController(self)
         self.responders = RespondersController(self)
 
+    def __build_session(self, pool_connections, pool_maxsize, pool_block, keep_alive):
+        session = requests.Session()
+        session.headers.update({
+            'Authorization': 'Bearer {}'.format(self.__api_key)
+        })
+        if not keep_alive:
+            session.headers['Connection'] = 'close'
+        session.proxies.update(self.__proxies)
+        session.verify = self.__verify_cert
+
+        adapter = HTTPAdapter(pool_connections=pool_connections,
+                              pool_maxsize=pool_maxsize,
+                              pool_block=pool_block)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        return session
+
+    def close(self):
+        self.nodes.close()
+        self.transport.close()
+        self.__session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     @staticmethod
     def __recover(exception):
 
@@ -46,6 +123,12 @@ class Api(object):
                 raise AuthenticationError("Authentication error") from exception
             elif exception.response.status_code == 403:
                 raise AuthorizationError("Authorization error") from exception
+            elif exception.response.status_code == 429:
+                raise RateLimitError("Rate limit exceeded") from exception
+            elif exception.response.status_code in (502, 503, 504):
+                raise ServiceUnavailableError("Cortex service is unavailable") from exception
+            elif exception.response.status_code >= 500:
+                raise ServerError("Cortex server error") from exception
             else:
                 raise InvalidInputError("Invalid input exception") from exception
         elif isinstance(exception, requests.exceptions.ConnectionError):
@@ -55,95 +138,183 @@ class Api(object):
         else:
             raise CortexError("Unexpected exception") from exception
 
-    def do_get(self, endpoint, params={}):
-        headers = {
-            'Authorization': 'Bearer {}'.format(self.__api_key)
-        }
+    def deadline(self, value):
+        """Context manager bounding the total duration of the calls made within the block to ``value`` seconds (or a
+        ``Deadline``)."""
+        return deadline(value)
 
-        try:
-            response = requests.get('{}{}'.format(self.__base_url, endpoint),
-                                    headers=headers,
-                                    params=params,
-                                    proxies=self.__proxies,
-                                    verify=self.__verify_cert)
+    @staticmethod
+    def __wait(delay, active_deadline):
+        # Do not sleep past the deadline, there would be no time left for the next attempt
+        if active_deadline is not None and delay >= active_deadline.remaining():
+            return False
 
-            response.raise_for_status()
-            return response
-        except Exception as ex:
-            self.__recover(ex)
+        time.sleep(delay)
+        return True
 
-    def do_file_post(self, endpoint, data, **kwargs):
-        headers = {
-            'Authorization': 'Bearer {}'.format(self.__api_key)
-        }
+    def __send(self, node, tried, method, endpoint, active_deadline, **kwargs):
+        node = self.nodes.acquire(tried, node)
+        tried.append(node)
 
+        circuits = None
+        if self.circuit_breaker is not None:
+            try:
+                circuits = self.circuit_breaker.allow(node.url, endpoint)
+            except CircuitOpenError:
+                self.nodes.release(node, 0, None, sent=False)
+                raise
+
+        info = RequestInfo(method, endpoint, node.url, len(tried) - 1, body_size(kwargs.get('data', None))) \
+            if len(self.hooks) > 0 else None
+        if info is not None:
+            for hook in self.hooks:
+                hook.before_request(info)
+
+        started = time.monotonic()
+        failed = status = None
         try:
-            response = requests.post('{}{}'.format(self.__base_url, endpoint),
-                                     headers=headers,
-                                     proxies=self.__proxies,
-                                     data=data,
-                                     verify=self.__verify_cert,
-                                     **kwargs)
-            response.raise_for_status()
+            response = self.transport.request(self.__session, method, '{}{}'.format(node.base_url, endpoint),
+                                              **kwargs)
+            status = response.status_code
+            failed = status in self.nodes.FAILURE_STATUSES
+            if info is not None:
+                info.status = response.status_code
+                info.bytes_received = int(response.headers.get('Content-Length', 0)) if kwargs.get('stream', False) \
+                    else len(response.content)
             return response
         except Exception as ex:
-            self.__recover(ex)
+            # A call cut short by the deadline tells nothing about the health of the node
+            if isinstance(ex, requests.exceptions.RequestException) and \
+                    (active_deadline is None or not active_deadline.expired):
+                failed = True
+            if info is not None:
+                info.error = ex
+            raise
+        finally:
+            elapsed = time.monotonic() - started
+            self.nodes.release(node, elapsed, failed)
+            if circuits is not None:
+                self.circuit_breaker.record(circuits, failed, status)
+            if info is not None:
+                info.elapsed = elapsed
+                for hook in self.hooks:
+                    hook.after_request(info)
 
-    def do_post(self, endpoint, data, params={}, **kwargs):
-        headers = {
-            'Authorization': 'Bearer {}'.format(self.__api_key),
-            'Content-Type': 'application/json'
-        }
+    def __failover(self, node, tried, policy, method, endpoint, status=None, **kwargs):
+        # A call failed by its node is sent to another available node right away, when it can safely be sent again
+        if node is not None or (status is not None and status not in self.nodes.FAILURE_STATUSES) or \
+                not self.nodes.has_alternative(tried) or not policy.should_retry(0, method, endpoint, status=status,
+                                                                                 **kwargs):
+            return False
+
+        self.nodes.record_failover()
+        return True
+
+    def __request(self, method, endpoint, retry=True, node=None, **kwargs):
+        timeout = kwargs.pop('timeout', (self.connect_timeout, self.read_timeout))
+        policy = self.retry_policy if retry else None
+        active_deadline = current_deadline()
+        attempt = 0
+        tried = []
+
+        if policy is not None:
+            policy.record('requests')
 
+        while True:
+            if active_deadline is not None:
+                active_deadline.check()
+                kwargs['timeout'] = active_deadline.clamp(timeout)
+            else:
+                kwargs['timeout'] = timeout
+
+            try:
+                response = self.__send(node, tried, method, endpoint, active_deadline, **kwargs)
+                if response.status_code >= 400 and policy is not None:
+                    if self.__failover(node, tried, policy, method, endpoint, status=response.status_code,
+                                       response=response):
+                        response.close()
+                        continue
+                    elif policy.should_retry(attempt, method, endpoint, status=response.status_code, response=response) \
+                            and self.__wait(policy.delay(attempt, response), active_deadline):
+                        policy.record('retries', response.status_code)
+                        response.close()
+                        attempt += 1
+                        continue
+                    elif attempt > 0:
+                        policy.record('exhausted')
+
+                response.raise_for_status()
+                return self.__decodable(response)
+            except requests.exceptions.HTTPError as ex:
+                self.__recover(ex)
+            except CircuitOpenError:
+                # Fail fast, unless another node can take the call
+                if node is None and self.nodes.has_alternative(tried):
+                    continue
+                raise
+            except requests.exceptions.RequestException as ex:
+                if active_deadline is not None and active_deadline.expired:
+                    raise DeadlineExceededError('Deadline exceeded') from ex
+                if policy is not None and self.__failover(node, tried, policy, method, endpoint, exception=ex):
+                    continue
+                elif policy is not None and policy.should_retry(attempt, method, endpoint, exception=ex) \
+                        and self.__wait(policy.delay(attempt), active_deadline):
+                    policy.record('retries', type(ex).__name__)
+                    attempt += 1
+                    continue
+                elif policy is not None and attempt > 0:
+                    policy.record('exhausted')
+                self.__recover(ex)
+            except Exception as ex:
+                self.__recover(ex)
+
+    def __decodable(self, response):
+        # Make response.json() decode the body with the codec of the client
+        codec = self.json_codec
+        response.json = lambda **kwargs: codec.loads(response.content)
+        return response
+
+    def do_get(self, endpoint, params={}, **kwargs):
+        return self.__request('GET', endpoint, params=params, **kwargs)
+
+    def do_stream(self, endpoint, params={}, chunk_size=65536, **kwargs):
+        """Yields the body of a GET response by chunks of ``chunk_size`` bytes, without loading it in memory."""
+        response = self.__request('GET', endpoint, params=params, stream=True, **kwargs)
         try:
-            response = requests.post('{}{}'.format(self.__base_url, endpoint),
-                                     headers=headers,
-                                     proxies=self.__proxies,
-                                     json=data,
-                                     params=params,
-                                     verify=self.__verify_cert,
-                                     **kwargs)
-            response.raise_for_status()
-            return response
-        except Exception as ex:
+            for chunk in response.iter_content(chunk_size):
+                yield chunk
+        except requests.exceptions.RequestException as ex:
             self.__recover(ex)
+        finally:
+            response.close()
+
+    def do_file_post(self, endpoint, data, **kwargs):
+        # Streamed bodies cannot be sent twice
+        return self.__request('POST', endpoint, retry=False, data=data, **kwargs)
 
-    def do_patch(self, endpoint, data, params={}):
+    def do_post(self, endpoint, data, params={}, **kwargs):
         headers = {
-            'Authorization': 'Bearer {}'.format(self.__api_key),
             'Content-Type': 'application/json'
         }
 
-        try:
-            response = requests.patch('{}{}'.format(self.__base_url, endpoint),
-                                      headers=headers,
-                                      proxies=self.__proxies,
-                                      json=data,
-                                      params=params,
-                                      verify=self.__verify_cert)
-            response.raise_for_status()
-            return response
-        except Exception as ex:
-            self.__recover(ex)
+        return self.__request('POST', endpoint, headers=headers, data=self.json_codec.dumps(data), params=params,
+                              **kwargs)
 
-    def do_delete(self, endpoint):
+    def do_patch(self, endpoint, data, params={}, **kwargs):
         headers = {
-            'Authorization': 'Bearer {}'.format(self.__api_key)
+            'Content-Type': 'application/json'
         }
 
-        try:
-            response = requests.delete('{}{}'.format(self.__base_url, endpoint),
-                                       headers=headers,
-                                       proxies=self.__proxies,
-                                       verify=self.__verify_cert)
-            response.raise_for_status()
-            return True
-        except Exception as ex:
-            self.__recover(ex)
-        pass
+        return self.__request('PATCH', endpoint, headers=headers, data=self.json_codec.dumps(data), params=params,
+                              **kwargs)
+
+    def do_delete(self, endpoint, **kwargs):
+        self.__request('DELETE', endpoint, **kwargs)
+        return True
 
-    def status(self):
-        return self.do_get('status')
+    def status(self, node=None):
+        # Health checks of a given node are not retried
+        return self.do_get('status', node=node, retry=node is None)
 
     """
     Method for backward compatibility 
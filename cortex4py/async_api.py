@@ -0,0 +1,301 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+import time
+
+from .exceptions import *
+from .codec import get_codec
+from .mime import MimeDetector
+from .retry import RetryPolicy
+from .balancer import NodePool
+from .metrics import RequestInfo, body_size
+from .singleflight import AsyncSingleFlight
+from .deadline import deadline, current_deadline
+from .controllers.aio import AsyncOrganizationsController, AsyncUsersController, AsyncJobsController, \
+    AsyncAnalyzersController, AsyncRespondersController
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncResponse(object):
+    """Fully read HTTP response returned by the ``AsyncApi.do_*`` methods. It mimics the subset of
+    ``requests.Response`` used by the controllers."""
+    def __init__(self, status_code, headers, content, codec=None):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.codec = get_codec(codec)
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return self.codec.loads(self.content)
+
+
+class AsyncApi(object):
+    """Asyncio counterpart of ``cortex4py.api.Api``, built on ``aiohttp``.
+
+    The controllers expose the same methods as the synchronous ones, as coroutines. All the calls share a pooled
+    ``aiohttp.ClientSession`` and at most ``limit`` requests are in flight at the same time, so thousands of jobs can be
+    driven from a single event loop."""
+    def __init__(self, url, api_key, **kwargs):
+        if aiohttp is None:
+            raise ImportError('AsyncApi requires the aiohttp package. Install it with: pip install cortex4py[async]')
+
+        if not isinstance(url, str) or not isinstance(api_key, str):
+            raise TypeError('URL and API key are required and must be of type string.')
+
+        self.__api_key = api_key
+        self.__url = url
+        self.__base_url = '{}/api/'.format(url)
+        self.__proxy = kwargs.get('proxy', None)
+        self.__verify_cert = kwargs.get('verify_cert', True)
+        self.__limit = kwargs.get('limit', 100)
+        self.__limit_per_host = kwargs.get('limit_per_host', 0)
+        self.__keep_alive = kwargs.get('keep_alive', True)
+        self.__session = None
+        self.__semaphore = None
+
+        timeout = kwargs.get('timeout', None)
+        if isinstance(timeout, tuple):
+            self.connect_timeout, self.read_timeout = timeout
+        elif timeout is not None:
+            self.connect_timeout = self.read_timeout = timeout
+        else:
+            self.connect_timeout = kwargs.get('connect_timeout', 10)
+            self.read_timeout = kwargs.get('read_timeout', 60)
+
+        self.json_codec = get_codec(kwargs.get('json_codec', None))
+        self.compact_lists = kwargs.get('compact_lists', False)
+        self.catalog_ttl = kwargs.get('catalog_ttl', 60)
+        self.mime_detector = MimeDetector(kwargs.get('mime_hook', None))
+        self.retry_policy = kwargs.get('retry', RetryPolicy())
+        self.rate_limiter = kwargs.get('rate_limiter', None)
+        self.circuit_breaker = kwargs.get('circuit_breaker', None)
+        self.hooks = list(kwargs.get('hooks', []))
+        self.single_flight = AsyncSingleFlight() if kwargs.get('coalesce', False) else None
+
+        self.organizations = AsyncOrganizationsController(self)
+        self.users = AsyncUsersController(self)
+        self.jobs = AsyncJobsController(self)
+        self.analyzers = AsyncAnalyzersController(self)
+        self.responders = AsyncRespondersController(self)
+
+    def __ssl(self):
+        if isinstance(self.__verify_cert, str):
+            import ssl
+            return ssl.create_default_context(cafile=self.__verify_cert)
+        elif self.__verify_cert is False:
+            return False
+        return None
+
+    def __get_session(self):
+        # The session must be created from within a running event loop
+        if self.__session is None or self.__session.closed:
+            connector = aiohttp.TCPConnector(limit=self.__limit,
+                                             limit_per_host=self.__limit_per_host,
+                                             force_close=not self.__keep_alive,
+                                             ssl=self.__ssl())
+            self.__session = aiohttp.ClientSession(
+                connector=connector,
+                headers={'Authorization': 'Bearer {}'.format(self.__api_key)}
+            )
+            self.__semaphore = asyncio.Semaphore(self.__limit or 1000000)
+
+        return self.__session
+
+    async def close(self):
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    @staticmethod
+    def __recover(exception):
+
+        if isinstance(exception, aiohttp.ClientResponseError):
+            if exception.status == 404:
+                raise NotFoundError("Resource not found") from exception
+            elif exception.status == 401:
+                raise AuthenticationError("Authentication error") from exception
+            elif exception.status == 403:
+                raise AuthorizationError("Authorization error") from exception
+            elif exception.status == 429:
+                raise RateLimitError("Rate limit exceeded") from exception
+            elif exception.status in (502, 503, 504):
+                raise ServiceUnavailableError("Cortex service is unavailable") from exception
+            elif exception.status >= 500:
+                raise ServerError("Cortex server error") from exception
+            else:
+                raise InvalidInputError("Invalid input exception") from exception
+        elif isinstance(exception, aiohttp.ClientConnectionError):
+            raise ServiceUnavailableError("Cortex service is unavailable") from exception
+        elif isinstance(exception, (aiohttp.ClientError, asyncio.TimeoutError)):
+            raise ServerError("Cortex request exception") from exception
+        else:
+            raise CortexError("Unexpected exception") from exception
+
+    async def __send(self, method, endpoint, policy, attempt, active_deadline, stream=False, **kwargs):
+        session = self.__get_session()
+        circuits = self.circuit_breaker.allow(self.__url, endpoint) if self.circuit_breaker is not None else None
+
+        info = RequestInfo(method, endpoint, self.__url, attempt, body_size(kwargs.get('data', None))) \
+            if len(self.hooks) > 0 else None
+        if info is not None:
+            for hook in self.hooks:
+                hook.before_request(info)
+
+        started = time.monotonic()
+        failed = status = None
+        try:
+            response = await session.request(method, '{}{}'.format(self.__base_url, endpoint), proxy=self.__proxy,
+                                             **kwargs)
+            status = response.status
+            failed = status in NodePool.FAILURE_STATUSES
+            if info is not None:
+                info.status = response.status
+                info.bytes_received = response.content_length
+        except Exception as ex:
+            # A call cut short by the deadline tells nothing about the health of Cortex
+            if isinstance(ex, (aiohttp.ClientConnectionError, asyncio.TimeoutError)) and \
+                    (active_deadline is None or not active_deadline.expired):
+                failed = True
+            if info is not None:
+                info.error = ex
+            raise
+        finally:
+            if circuits is not None:
+                self.circuit_breaker.record(circuits, failed, status)
+            if info is not None:
+                info.elapsed = time.monotonic() - started
+                for hook in self.hooks:
+                    hook.after_request(info)
+        if stream and response.status < 400:
+            # The caller reads the body and releases the connection
+            return response
+
+        async with response:
+            content = await response.read()
+            if response.status >= 400 and policy is not None:
+                if policy.should_retry(attempt, method, endpoint, status=response.status, response=response):
+                    policy.record('retries', response.status)
+                    return policy.delay(attempt, response)
+                elif attempt > 0:
+                    policy.record('exhausted')
+
+            response.raise_for_status()
+            return AsyncResponse(response.status, response.headers, content, self.json_codec)
+
+    def deadline(self, value):
+        """Context manager bounding the total duration of the calls made within the block to ``value`` seconds (or a
+        ``Deadline``)."""
+        return deadline(value)
+
+    @staticmethod
+    def __client_timeout(timeout, active_deadline):
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        if active_deadline is None:
+            return aiohttp.ClientTimeout(connect=connect, sock_read=read)
+
+        connect, read = active_deadline.clamp((connect, read))
+        return aiohttp.ClientTimeout(total=active_deadline.remaining(), connect=connect, sock_read=read)
+
+    async def __request(self, method, endpoint, retry=True, **kwargs):
+        # aiohttp rejects None values, while requests silently drops them
+        if 'params' in kwargs:
+            kwargs['params'] = dict((k, v) for k, v in kwargs['params'].items() if v is not None)
+
+        timeout = kwargs.pop('timeout', (self.connect_timeout, self.read_timeout))
+        policy = self.retry_policy if retry else None
+        active_deadline = current_deadline()
+        attempt = 0
+
+        if policy is not None:
+            policy.record('requests')
+
+        self.__get_session()
+        while True:
+            if active_deadline is not None:
+                active_deadline.check()
+            kwargs['timeout'] = self.__client_timeout(timeout, active_deadline)
+
+            try:
+                async with self.__semaphore:
+                    response = await self.__send(method, endpoint, policy, attempt, active_deadline, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as ex:
+                if active_deadline is not None and active_deadline.expired:
+                    raise DeadlineExceededError('Deadline exceeded') from ex
+                if policy is not None and policy.should_retry(attempt, method, endpoint, exception=ex):
+                    policy.record('retries', type(ex).__name__)
+                    response = policy.delay(attempt)
+                else:
+                    if policy is not None and attempt > 0:
+                        policy.record('exhausted')
+                    self.__recover(ex)
+            except CircuitOpenError:
+                raise
+            except Exception as ex:
+                self.__recover(ex)
+
+            if isinstance(response, (AsyncResponse, aiohttp.ClientResponse)):
+                return response
+
+            # A retry has been scheduled, response is the delay before the next attempt. Do not sleep past the
+            # deadline, there would be no time left for the next attempt
+            if active_deadline is not None and response >= active_deadline.remaining():
+                raise DeadlineExceededError('Deadline exceeded')
+
+            await asyncio.sleep(response)
+            attempt += 1
+
+    async def do_get(self, endpoint, params={}, **kwargs):
+        return await self.__request('GET', endpoint, params=params, **kwargs)
+
+    async def do_stream(self, endpoint, params={}, chunk_size=65536, **kwargs):
+        """Yields the body of a GET response by chunks of ``chunk_size`` bytes, without loading it in memory."""
+        response = await self.__request('GET', endpoint, params=params, stream=True, **kwargs)
+        try:
+            async for chunk in response.content.iter_chunked(chunk_size):
+                yield chunk
+        except (aiohttp.ClientError, asyncio.TimeoutError) as ex:
+            self.__recover(ex)
+        finally:
+            response.release()
+
+    async def do_file_post(self, endpoint, data, params={}, **kwargs):
+        # Streamed bodies cannot be sent twice
+        return await self.__request('POST', endpoint, retry=False, data=data, params=params, **kwargs)
+
+    async def do_post(self, endpoint, data, params={}, **kwargs):
+        headers = {
+            'Content-Type': 'application/json'
+        }
+
+        return await self.__request('POST', endpoint, headers=headers, data=self.json_codec.dumps(data), params=params,
+                                    **kwargs)
+
+    async def do_patch(self, endpoint, data, params={}, **kwargs):
+        headers = {
+            'Content-Type': 'application/json'
+        }
+
+        return await self.__request('PATCH', endpoint, headers=headers, data=self.json_codec.dumps(data), params=params,
+                                    **kwargs)
+
+    async def do_delete(self, endpoint, **kwargs):
+        await self.__request('DELETE', endpoint, **kwargs)
+        return True
+
+    async def status(self):
+        return await self.do_get('status')
@@ -0,0 +1,157 @@
+import itertools
+import random
+import threading
+
+
+class Node(object):
+    """A Cortex node, with the state used to balance the calls: ``outstanding`` calls, moving average of the
+    ``latency`` of its responses (in seconds), ``failures`` in a row, and whether it is ``ejected``."""
+    def __init__(self, url):
+        self.url = url
+        self.base_url = '{}/api/'.format(url)
+        self.outstanding = 0
+        self.latency = None
+        self.failures = 0
+        self.ejected = False
+        self.requests = 0
+        self.errors = 0
+
+    def __repr__(self):
+        return 'Node({!r})'.format(self.url)
+
+
+class NodePool(object):
+    """Distributes the calls over a list of Cortex nodes.
+
+    ``strategy`` is ``round_robin``, ``least_outstanding`` (the node with the fewest calls in flight) or ``latency``
+    (a random node, weighted by the inverse of its average latency). A node is ejected after ``max_failures``
+    connection errors or 502, 503 and 504 responses in a row, and is no longer selected while another one is
+    available. Ejected nodes are probed every ``probe_interval`` seconds, from a background thread, by calling
+    ``probe(node)``, and are readmitted as soon as a call to them succeeds. Nodes are never ejected from a pool of
+    one."""
+
+    STRATEGIES = ('round_robin', 'least_outstanding', 'latency')
+    FAILURE_STATUSES = frozenset([502, 503, 504])
+    LATENCY_WEIGHT = 0.3
+
+    def __init__(self, urls, strategy='round_robin', max_failures=3, probe_interval=5, probe=None):
+        if strategy not in self.STRATEGIES:
+            raise ValueError('Unknown balancing strategy {}, expected one of {}'.format(
+                strategy, ', '.join(self.STRATEGIES)))
+
+        self.nodes = [Node(url) for url in urls]
+        self.strategy = strategy
+        self.max_failures = max_failures
+        self.probe_interval = probe_interval
+        self.failovers = 0
+
+        self._probe = probe
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._prober = None
+
+    def _select(self, candidates):
+        if self.strategy == 'least_outstanding':
+            # Rotate the candidates first, so that the idle nodes take turns
+            offset = next(self._counter) % len(candidates)
+            return min(candidates[offset:] + candidates[:offset], key=lambda node: node.outstanding)
+        elif self.strategy == 'latency':
+            known = [node.latency for node in candidates if node.latency is not None]
+            # Nodes without a measure yet get the weight of the fastest one, so that they are tried soon
+            fastest = min(known) if len(known) > 0 else 1.0
+            weights = [1.0 / max(node.latency if node.latency is not None else fastest, 0.001) for node in candidates]
+            return random.choices(candidates, weights)[0]
+        else:
+            return candidates[next(self._counter) % len(candidates)]
+
+    def acquire(self, exclude=(), node=None) -> Node:
+        """Selects the node of the next call, preferably an available one that is not in ``exclude``, unless the call
+        is bound to ``node``."""
+        with self._lock:
+            if node is None:
+                candidates = [node for node in self.nodes if not node.ejected and node not in exclude] or \
+                    [node for node in self.nodes if node not in exclude] or self.nodes
+                node = self._select(candidates)
+
+            node.outstanding += 1
+            node.requests += 1
+            return node
+
+    def release(self, node, elapsed, failed, sent=True):
+        """Records the outcome of a call to ``node`` that took ``elapsed`` seconds, ``failed`` being ``None`` when the
+        call tells nothing about the health of the node. ``sent`` is ``False`` when the call was finally not made, so
+        that it is not counted in the requests of the node."""
+        with self._lock:
+            node.outstanding = max(0, node.outstanding - 1)
+            if not sent:
+                node.requests = max(0, node.requests - 1)
+            if failed is None:
+                return
+            elif not failed:
+                node.latency = elapsed if node.latency is None else \
+                    self.LATENCY_WEIGHT * elapsed + (1 - self.LATENCY_WEIGHT) * node.latency
+                node.failures = 0
+                node.ejected = False
+                return
+
+            node.errors += 1
+            node.failures += 1
+            if node.failures >= self.max_failures and not node.ejected and len(self.nodes) > 1:
+                node.ejected = True
+                self._start_prober()
+
+    def has_alternative(self, tried):
+        """Tells whether an available node, other than the ``tried`` ones, can take a call."""
+        with self._lock:
+            return any(not node.ejected and node not in tried for node in self.nodes)
+
+    def record_failover(self):
+        with self._lock:
+            self.failovers += 1
+
+    def _start_prober(self):
+        if self._probe is None or self._closed.is_set() or self._prober is not None:
+            return
+
+        self._prober = threading.Thread(target=self._run_prober, name='cortex4py-node-prober', daemon=True)
+        self._prober.start()
+
+    def _run_prober(self):
+        while not self._closed.wait(self.probe_interval):
+            with self._lock:
+                ejected = [node for node in self.nodes if node.ejected]
+                if len(ejected) == 0:
+                    self._prober = None
+                    return
+            for node in ejected:
+                self._check(node)
+
+    def _check(self, node):
+        try:
+            self._probe(node)
+            return True
+        except Exception:
+            return False
+
+    def check(self):
+        """Probes all the nodes now, and returns their health by URL."""
+        return dict((node.url, self._check(node)) for node in self.nodes)
+
+    def close(self):
+        self._closed.set()
+
+    @property
+    def stats(self):
+        """State of the nodes by URL, and number of calls moved to another node after a failure (``failovers``)."""
+        with self._lock:
+            return {
+                'failovers': self.failovers,
+                'nodes': dict((node.url, {
+                    'outstanding': node.outstanding,
+                    'latency': node.latency,
+                    'requests': node.requests,
+                    'errors': node.errors,
+                    'ejected': node.ejected
+                }) for node in self.nodes)
+            }
@@ -0,0 +1,198 @@
+import collections
+import re
+import threading
+import time
+
+from .exceptions import CircuitOpenError
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+_WORKER_RUN = re.compile(r'^((?:analyzer|responder)/[^/]+)/run')
+
+
+class Circuit(object):
+    """State of the calls made to a node, or to a worker. Outcomes are counted per second over the last ``window``
+    seconds of the breaker."""
+    def __init__(self, name, breaker):
+        self.name = name
+        self.state = CLOSED
+        self.opened_at = None
+        self._breaker = breaker
+        self._buckets = collections.deque()
+        self._trials = 0
+        self._successes = 0
+
+    def _prune(self, now):
+        while len(self._buckets) > 0 and self._buckets[0][0] <= now - self._breaker.window:
+            self._buckets.popleft()
+
+    def _counts(self):
+        return sum(bucket[1] for bucket in self._buckets), sum(bucket[2] for bucket in self._buckets)
+
+    def _retry_in(self, now):
+        return max(0.0, self.opened_at + self._breaker.open_duration - now) if self.state == OPEN else 0.0
+
+    def _set_state(self, state, now):
+        previous, self.state = self.state, state
+        self.opened_at = now if state == OPEN else None
+        self._trials = self._successes = 0
+        if state == CLOSED:
+            self._buckets.clear()
+        return previous, state
+
+    def allow(self):
+        """Raises a ``CircuitOpenError`` when the call must not be made. In the half-open state, only
+        ``half_open_calls`` trial calls are let through at a time."""
+        breaker = self._breaker
+        now = time.monotonic()
+        with breaker._lock:
+            change = None
+            if self.state == OPEN and self._retry_in(now) <= 0:
+                change = self._set_state(HALF_OPEN, now)
+
+            if self.state == CLOSED or (self.state == HALF_OPEN and self._trials < breaker.half_open_calls):
+                if self.state == HALF_OPEN:
+                    self._trials += 1
+                rejected = None
+            else:
+                rejected = self._retry_in(now)
+
+        breaker._notify(self, change)
+        if rejected is not None:
+            raise CircuitOpenError('Circuit {} is open'.format(self.name), circuit=self.name, retry_after=rejected)
+
+    def record(self, failed):
+        """Records the outcome of a call let through by ``allow()``: ``None`` when the call says nothing about the
+        health of Cortex (such as a call cut short by a deadline)."""
+        breaker = self._breaker
+        now = time.monotonic()
+        with breaker._lock:
+            change = None
+            if self.state == HALF_OPEN:
+                self._trials = max(0, self._trials - 1)
+                if failed:
+                    change = self._set_state(OPEN, now)
+                elif failed is not None:
+                    self._successes += 1
+                    if self._successes >= breaker.half_open_calls:
+                        change = self._set_state(CLOSED, now)
+            elif self.state == CLOSED and failed is not None:
+                second = int(now)
+                if len(self._buckets) == 0 or self._buckets[-1][0] != second:
+                    self._buckets.append([second, 0, 0])
+                self._buckets[-1][1] += 1
+                self._buckets[-1][2] += 1 if failed else 0
+                self._prune(now)
+
+                calls, failures = self._counts()
+                if failed and calls >= breaker.min_calls and failures >= breaker.failure_rate * calls:
+                    change = self._set_state(OPEN, now)
+
+        breaker._notify(self, change)
+
+    @property
+    def stats(self):
+        now = time.monotonic()
+        with self._breaker._lock:
+            self._prune(now)
+            calls, failures = self._counts()
+            return {
+                'state': self.state,
+                'calls': calls,
+                'failures': failures,
+                'failure_rate': failures / calls if calls > 0 else 0.0,
+                'retry_in': self._retry_in(now)
+            }
+
+
+class CircuitBreaker(object):
+    """Stops sending calls to a Cortex node when too many of them fail, so that callers fail fast with a
+    ``CircuitOpenError`` instead of waiting for connection errors and timeouts.
+
+    A circuit opens when, over the last ``window`` seconds, at least ``min_calls`` calls were made and a share of at
+    least ``failure_rate`` of them failed (connection errors, timeouts, 502, 503 and 504 responses). It stays open
+    for ``open_duration`` seconds, then lets ``half_open_calls`` trial calls through: the circuit closes if they all
+    succeed and opens again if one fails.
+
+    There is one circuit per node. With ``per_worker``, the runs of each analyzer and responder also go through a
+    circuit of their worker. Connection errors and timeouts count against both circuits, while the failure responses
+    of a run only count against the circuit of its worker, so that a failing worker does not cut the access to the
+    whole node. ``listener`` is called with the
+    circuit name and its previous and new states on every change."""
+
+    def __init__(self, failure_rate=0.5, min_calls=20, window=30, open_duration=30, half_open_calls=1,
+                 per_worker=False, listener=None):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.open_duration = open_duration
+        self.half_open_calls = half_open_calls
+        self.per_worker = per_worker
+        self.listener = listener
+
+        self._lock = threading.Lock()
+        self._circuits = {}
+
+    def name(self, url, endpoint=''):
+        match = _WORKER_RUN.match(endpoint) if self.per_worker else None
+        return '{}/api/{}'.format(url, match.group(1)) if match is not None else url
+
+    def circuit(self, url, endpoint='') -> Circuit:
+        """Returns the circuit of a call to ``endpoint`` on the node ``url``."""
+        name = self.name(url, endpoint)
+        with self._lock:
+            circuit = self._circuits.get(name, None)
+            if circuit is None:
+                circuit = self._circuits[name] = Circuit(name, self)
+            return circuit
+
+    def circuits(self, url, endpoint=''):
+        """Returns the circuits of a call: the circuit of the node, followed by the circuit of the worker for a run
+        with ``per_worker``."""
+        circuits = [self.circuit(url)]
+        if self.name(url, endpoint) != url:
+            circuits.append(self.circuit(url, endpoint))
+        return circuits
+
+    def allow(self, url, endpoint=''):
+        """Checks all the circuits of a call and returns them, to be given to ``record()``. Raises a
+        ``CircuitOpenError`` when one of them is open."""
+        circuits = self.circuits(url, endpoint)
+        for index, circuit in enumerate(circuits):
+            try:
+                circuit.allow()
+            except CircuitOpenError:
+                # Give back the trial calls taken from the circuits already checked
+                for allowed in circuits[:index]:
+                    allowed.record(None)
+                raise
+        return circuits
+
+    def record(self, circuits, failed, status=None):
+        """Records the outcome of a call on the ``circuits`` returned by ``allow()``, ``status`` being the status of
+        its response, if any."""
+        for circuit in circuits:
+            # The node answered: a failure response of a run only tells about the worker
+            node_answered = status is not None and circuit is not circuits[-1]
+            circuit.record(None if node_answered and failed else failed)
+
+    def state(self, url, endpoint=''):
+        """Returns the state of the circuit of a call: ``closed``, ``open`` or ``half_open``. An open circuit whose
+        ``open_duration`` has elapsed is reported as ``half_open``."""
+        stats = self.circuit(url, endpoint).stats
+        return HALF_OPEN if stats['state'] == OPEN and stats['retry_in'] <= 0 else stats['state']
+
+    def _notify(self, circuit, change):
+        if change is not None and self.listener is not None:
+            self.listener(circuit.name, *change)
+
+    @property
+    def stats(self):
+        """State, number of calls and failures over the window, and delay before the next trial call, by circuit."""
+        with self._lock:
+            circuits = list(self._circuits.values())
+        return dict((circuit.name, circuit.stats) for circuit in circuits)
+
+    def reset(self):
+        with self._lock:
+            self._circuits.clear()
@@ -0,0 +1,69 @@
+import time
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .result import OperationResult
+
+
+class BulkResult(OperationResult):
+    """Outcome of a bulk operation. ``items`` holds the inputs and ``results`` the matching return values, or the
+    exceptions raised while processing them."""
+    def __init__(self):
+        super().__init__()
+        self.items = []
+        self.results = []
+
+    def __len__(self):
+        return len(self.results)
+
+    def __iter__(self):
+        return iter(zip(self.items, self.results))
+
+    def add(self, item, result):
+        self.items.append(item)
+        self.results.append(result)
+
+    @property
+    def succeeded(self):
+        return len([r for r in self.results if not isinstance(r, Exception)])
+
+    @property
+    def failed(self):
+        return len(self.results) - self.succeeded
+
+    def _processed(self):
+        return len(self.results)
+
+    def _counters(self):
+        return {
+            'total': len(self.results),
+            'succeeded': self.succeeded,
+            'failed': self.failed
+        }
+
+
+def run_bulk(func, items, max_workers=8, ordered=True) -> BulkResult:
+    """Calls ``func`` with every item of ``items`` over a pool of ``max_workers`` threads. Exceptions are collected in
+    the result instead of being raised. With ``ordered=False``, the results are stored in completion order."""
+    def call(item):
+        try:
+            return func(item)
+        except Exception as ex:
+            return ex
+
+    items = list(items)
+    result = BulkResult()
+    started = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        if ordered:
+            for item, value in zip(items, executor.map(call, items)):
+                result.add(item, value)
+        else:
+            futures = dict((executor.submit(call, item), item) for item in items)
+            for future in as_completed(futures):
+                result.add(futures[future], future.result())
+
+    result.elapsed = time.monotonic() - started
+
+    return result
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+from .codec import get_codec
+
+
+class ReportCache(object):
+    """Client-side cache of the analysis reports, stored in a SQLite database so that it can be shared between
+    processes and survive restarts (use ``path=':memory:'`` for a per-process cache).
+
+    Reports are indexed by the analyzed observable (see ``ReportCache.key``) and expire after ``ttl`` seconds. When
+    there are more than ``max_entries`` reports, or their total size exceeds ``max_size`` bytes, the least recently
+    used ones are evicted. The reports are stored as JSON, encoded with ``codec`` (see ``cortex4py.codec.get_codec``)."""
+
+    def __init__(self, path=':memory:', ttl=86400, max_entries=10000, max_size=None, codec=None):
+        self.ttl = ttl
+        self.codec = get_codec(codec)
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('CREATE TABLE IF NOT EXISTS reports ('
+                         'key TEXT PRIMARY KEY, value TEXT, size INTEGER, created REAL, accessed REAL)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS reports_accessed ON reports (accessed)')
+        self._db.execute('CREATE TABLE IF NOT EXISTS jobs (job_id TEXT PRIMARY KEY, key TEXT, created REAL)')
+
+    @staticmethod
+    def hash_data(data_type, data):
+        digest = hashlib.sha256()
+        if data_type == 'file' and isinstance(data, str):
+            with open(data, 'rb') as file_obj:
+                for chunk in iter(lambda: file_obj.read(65536), b''):
+                    digest.update(chunk)
+        elif isinstance(data, (bytes, bytearray, memoryview)):
+            digest.update(data)
+        elif hasattr(data, 'read'):
+            position = data.tell()
+            for chunk in iter(lambda: data.read(65536), b''):
+                digest.update(chunk)
+            data.seek(position)
+        elif isinstance(data, str):
+            digest.update(data.encode('utf-8'))
+        else:
+            digest.update(json.dumps(data, sort_keys=True).encode('utf-8'))
+
+        return digest.hexdigest()
+
+    @staticmethod
+    def key(worker_definition_id, data_type, data, tlp, pap):
+        data_hash = ReportCache.hash_data(data_type, data)
+        return '{}|{}|{}|{}|{}'.format(worker_definition_id, data_type, data_hash, tlp, pap)
+
+    @property
+    def stats(self):
+        with self._lock:
+            count, size = self._db.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM reports').fetchone()
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': count,
+            'size': size
+        }
+
+    def get(self, key):
+        """Returns the report cached under ``key``, or ``None``."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute('SELECT value, created FROM reports WHERE key = ?', (key,)).fetchone()
+            if row is not None and self.ttl is not None and row[1] + self.ttl < now:
+                self._db.execute('DELETE FROM reports WHERE key = ?', (key,))
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._db.execute('UPDATE reports SET accessed = ? WHERE key = ?', (now, key))
+            self.hits += 1
+
+        return self.codec.loads(row[0])
+
+    def put(self, key, report):
+        value = self.codec.dumps(report)
+        now = time.time()
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO reports (key, value, size, created, accessed) '
+                             'VALUES (?, ?, ?, ?, ?)', (key, value, len(value), now, now))
+            self._evict()
+
+    def _evict(self):
+        if self.max_entries is not None:
+            self._db.execute('DELETE FROM reports WHERE key IN (SELECT key FROM reports ORDER BY accessed DESC '
+                             'LIMIT -1 OFFSET ?)', (self.max_entries,))
+
+        if self.max_size is not None:
+            total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM reports').fetchone()[0]
+            rows = self._db.execute('SELECT key, size FROM reports ORDER BY accessed').fetchall()
+            for key, size in rows:
+                if total <= self.max_size:
+                    break
+                self._db.execute('DELETE FROM reports WHERE key = ?', (key,))
+                total -= size
+
+    def bind(self, job_id, key):
+        """Remembers that the report of job ``job_id`` has to be cached under ``key`` once it is available."""
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO jobs (job_id, key, created) VALUES (?, ?, ?)',
+                             (job_id, key, time.time()))
+
+    def job_key(self, job_id):
+        with self._lock:
+            row = self._db.execute('SELECT key FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+
+        return row[0] if row is not None else None
+
+    def get_job(self, job_id):
+        """Returns the cached report of job ``job_id``, or ``None``."""
+        key = self.job_key(job_id)
+        return self.get(key) if key is not None else None
+
+    def put_job(self, job_id, report):
+        """Caches the report of job ``job_id``, if the job has been bound to a key."""
+        key = self.job_key(job_id)
+        if key is not None:
+            self.put(key, report)
+            with self._lock:
+                self._db.execute('DELETE FROM jobs WHERE created < ?', (time.time() - (self.ttl or 86400),))
+
+    def clear(self):
+        with self._lock:
+            self._db.execute('DELETE FROM reports')
+            self._db.execute('DELETE FROM jobs')
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,45 @@
+import threading
+import time
+
+
+class WorkerCatalog(object):
+    """In-memory cache of the enabled workers (analyzers or responders) of the organization, indexed by name and by
+    data type. Entries expire after ``ttl`` seconds, and a ``ttl`` of 0 disables the cache."""
+
+    def __init__(self, ttl=60):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.ttl is not None and self.ttl > 0
+
+    def get(self, kind, key):
+        """Returns the cached value for ``(kind, key)``, or ``None`` when missing or expired."""
+        with self._lock:
+            entry = self._entries.get((kind, key), None)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[(kind, key)]
+                return None
+            return value
+
+    def put(self, kind, key, value):
+        if not self.enabled or value is None:
+            return value
+
+        with self._lock:
+            self._entries[(kind, key)] = (time.monotonic() + self.ttl, value)
+        return value
+
+    def invalidate(self, kind=None, key=None):
+        """Drops the cached entries, all of them by default, or the ones of a ``kind`` and optionally a ``key``."""
+        with self._lock:
+            if kind is None:
+                self._entries.clear()
+            else:
+                for entry in [e for e in self._entries if e[0] == kind and (key is None or e[1] == key)]:
+                    del self._entries[entry]
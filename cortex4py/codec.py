@@ -0,0 +1,91 @@
+import json
+import threading
+
+
+class JsonCodec(object):
+    """Encodes the request bodies and decodes the response bodies, with the standard ``json`` module."""
+
+    name = 'json'
+
+    def loads(self, data):
+        return json.loads(data)
+
+    def dumps(self, obj):
+        return json.dumps(obj).encode('utf-8')
+
+    def pretty(self, obj):
+        return json.dumps(obj, indent=2)
+
+
+class OrjsonCodec(JsonCodec):
+    """Codec based on ``orjson``, the fastest of the supported libraries."""
+
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def loads(self, data):
+        return self._orjson.loads(data)
+
+    def dumps(self, obj):
+        return self._orjson.dumps(obj, option=self._orjson.OPT_NON_STR_KEYS)
+
+    def pretty(self, obj):
+        return self._orjson.dumps(obj, option=self._orjson.OPT_NON_STR_KEYS | self._orjson.OPT_INDENT_2).decode('utf-8')
+
+
+class UjsonCodec(JsonCodec):
+    """Codec based on ``ujson``."""
+
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson
+        self._ujson = ujson
+
+    def loads(self, data):
+        return self._ujson.loads(data)
+
+    def dumps(self, obj):
+        return self._ujson.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+    def pretty(self, obj):
+        return self._ujson.dumps(obj, ensure_ascii=False, indent=2)
+
+
+# By order of preference
+CODECS = {
+    'orjson': OrjsonCodec,
+    'ujson': UjsonCodec,
+    'json': JsonCodec
+}
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def get_codec(codec=None):
+    """Returns the codec to use: ``codec`` itself when it is a codec instance, the codec named ``codec`` (``orjson``,
+    ``ujson`` or ``json``), or, by default, the fastest one whose library is installed."""
+    global _default
+
+    if isinstance(codec, JsonCodec):
+        return codec
+    elif codec is not None:
+        if codec not in CODECS:
+            raise ValueError('Unknown JSON codec {}, expected one of {}'.format(codec, ', '.join(CODECS)))
+        return CODECS[codec]()
+
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                for cls in CODECS.values():
+                    try:
+                        _default = cls()
+                        break
+                    except ImportError:
+                        pass
+
+    return _default
@@ -1,13 +1,30 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from ..models import ModelList
+from ..stats import Count, StatsResult, stats_payload
+
+
 class AbstractController(object):
     def __init__(self, endpoint, api):
         self._api = api
         self._endpoint = endpoint
 
+    @property
+    def _json_codec(self):
+        # The models decode their lazy fields with the codec of the Api
+        return getattr(self._api, 'json_codec', None)
+
     def _wrap(self, data, cls):
         if isinstance(data, dict):
-            return cls(data)
+            return cls._from_response(data, self._json_codec)
         elif isinstance(data, list):
-            return list(map(lambda item: cls(item), data))
+            if getattr(self._api, 'compact_lists', False):
+                return ModelList(data, cls, self._json_codec)
+            # The items are replaced in place, so that the original dicts are freed as the models are built
+            for index, item in enumerate(data):
+                if isinstance(item, dict):
+                    data[index] = cls._from_response(item, self._json_codec)
+            return data
         else:
             return data
 
@@ -17,6 +34,46 @@ class AbstractController(object):
 
         return self._api.do_post(url, {'query': query or {}}, params).json()
 
+    def _iter_wrap(self, items, cls):
+        for item in items:
+            yield cls._from_response(item, self._json_codec)
+
+    def _fetch_page(self, query, start, page_size, sort=None):
+        url = '{}/_search'.format(self._endpoint)
+        params = {
+            'range': '{}-{}'.format(start, start + page_size),
+            'sort': sort
+        }
+
+        return self._api.do_post(url, {'query': query or {}}, params).json()
+
+    def _iter_all(self, query, page_size=100, sort=None, prefetch=False):
+        """Pages through all the results of ``query``, ``page_size`` items at a time. With ``prefetch``, the next page
+        is downloaded in the background while the current one is consumed."""
+        if prefetch:
+            executor = ThreadPoolExecutor(max_workers=1)
+            try:
+                future = executor.submit(self._fetch_page, query, 0, page_size, sort)
+                start = 0
+                while future is not None:
+                    page = future.result()
+                    start += page_size
+                    future = executor.submit(self._fetch_page, query, start, page_size, sort) \
+                        if len(page) >= page_size else None
+                    for item in page:
+                        yield item
+            finally:
+                executor.shutdown(wait=False)
+        else:
+            start = 0
+            while True:
+                page = self._fetch_page(query, start, page_size, sort)
+                for item in page:
+                    yield item
+                if len(page) < page_size:
+                    break
+                start += page_size
+
     def _find_one_by(self, query, **kwargs):
         url = '{}/_search'.format(self._endpoint)
 
@@ -34,21 +91,13 @@ class AbstractController(object):
             return None
 
     def _count(self, query):
-        url = '{}/_stats'.format(self._endpoint)
+        return self._stats(query, Count()).count
 
-        payload = {
-            'query': query or {},
-            'stats': [{
-                '_agg': 'count'
-            }]
-        }
-
-        response = self._api.do_post(url, payload, {}).json()
+    def _stats(self, query, aggs=None):
+        url = '{}/_stats'.format(self._endpoint)
+        aggs, payload = stats_payload(query, aggs)
 
-        if response is not None:
-            return response.get('count', None)
-        else:
-            return None
+        return StatsResult.parse(aggs, self._api.do_post(url, payload, {}).json())
 
     def _get_by_id(self, obj_id):
         url = '{}/{}'.format(self._endpoint, obj_id)
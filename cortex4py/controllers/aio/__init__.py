@@ -0,0 +1,7 @@
+from .abstract import AsyncAbstractController
+
+from .organizations import AsyncOrganizationsController
+from .users import AsyncUsersController
+from .jobs import AsyncJobsController
+from .analyzers import AsyncAnalyzersController
+from .responders import AsyncRespondersController
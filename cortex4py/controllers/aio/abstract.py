@@ -0,0 +1,79 @@
+import asyncio
+
+from ..abstract import AbstractController
+from ...stats import Count, StatsResult, stats_payload
+
+
+class AsyncAbstractController(AbstractController):
+    async def _find_all(self, query, **kwargs):
+        url = '{}/_search'.format(self._endpoint)
+        params = dict((k, kwargs.get(k, None)) for k in ('sort', 'range'))
+
+        return (await self._api.do_post(url, {'query': query or {}}, params)).json()
+
+    async def _iter_wrap(self, items, cls):
+        async for item in items:
+            yield cls._from_response(item, self._json_codec)
+
+    async def _fetch_page(self, query, start, page_size, sort=None):
+        url = '{}/_search'.format(self._endpoint)
+        params = {
+            'range': '{}-{}'.format(start, start + page_size),
+            'sort': sort
+        }
+
+        return (await self._api.do_post(url, {'query': query or {}}, params)).json()
+
+    async def _iter_all(self, query, page_size=100, sort=None, prefetch=False):
+        start = 0
+        task = asyncio.ensure_future(self._fetch_page(query, start, page_size, sort)) if prefetch else None
+        try:
+            while True:
+                if task is not None:
+                    page = await task
+                else:
+                    page = await self._fetch_page(query, start, page_size, sort)
+
+                more = len(page) >= page_size
+                start += page_size
+                task = None
+                if prefetch and more:
+                    task = asyncio.ensure_future(self._fetch_page(query, start, page_size, sort))
+
+                for item in page:
+                    yield item
+                if not more:
+                    break
+        finally:
+            if task is not None:
+                task.cancel()
+
+    async def _find_one_by(self, query, **kwargs):
+        url = '{}/_search'.format(self._endpoint)
+
+        params = {
+            'range': '0-1'
+        }
+        if 'sort' in kwargs:
+            params['sort'] = kwargs['sort']
+
+        collection = (await self._api.do_post(url, {'query': query or {}}, params)).json()
+
+        if len(collection) > 0:
+            return collection[0]
+        else:
+            return None
+
+    async def _count(self, query):
+        return (await self._stats(query, Count())).count
+
+    async def _stats(self, query, aggs=None):
+        url = '{}/_stats'.format(self._endpoint)
+        aggs, payload = stats_payload(query, aggs)
+
+        return StatsResult.parse(aggs, (await self._api.do_post(url, payload, {})).json())
+
+    async def _get_by_id(self, obj_id):
+        url = '{}/{}'.format(self._endpoint, obj_id)
+
+        return (await self._api.do_get(url)).json()
@@ -0,0 +1,161 @@
+import asyncio
+import json
+from typing import AsyncIterator, Sequence
+
+from cortex4py.query import *
+from .abstract import AsyncAbstractController
+from ..analyzers import AnalyzersController
+from ...models import Analyzer, Job, AnalyzerDefinition
+from ...stats import StatsResult
+from ...catalog import WorkerCatalog
+from ...exceptions import CortexError
+from ...multipart import MultipartEncoder
+
+
+class AsyncAnalyzersController(AsyncAbstractController):
+    def __init__(self, api):
+        AsyncAbstractController.__init__(self, 'analyzer', api)
+        self.catalog = WorkerCatalog(api.catalog_ttl)
+
+    async def find_all(self, query, **kwargs) -> Sequence[Analyzer]:
+        return self._wrap(await self._find_all(query, **kwargs), Analyzer)
+
+    def iter_all(self, query, **kwargs) -> AsyncIterator[Analyzer]:
+        return self._iter_wrap(self._iter_all(query, **kwargs), Analyzer)
+
+    async def find_one_by(self, query, **kwargs) -> Analyzer:
+        return self._wrap(await self._find_one_by(query, **kwargs), Analyzer)
+
+    async def stats(self, query, aggs=None) -> StatsResult:
+        return await self._stats(query, aggs)
+
+    async def get_by_id(self, analyzer_id) -> Analyzer:
+        return self._wrap(await self._get_by_id(analyzer_id), Analyzer)
+
+    async def get_by_name(self, name) -> Analyzer:
+        return self._wrap(await self._find_one_by(Eq('name', name)), Analyzer)
+
+    async def get_by_type(self, data_type) -> Sequence[Analyzer]:
+        workers = self.catalog.get('type', data_type)
+        if workers is None:
+            url = 'analyzer/type/{}'.format(data_type)
+            workers = self.catalog.put('type', data_type, self._wrap((await self._api.do_get(url)).json(), Analyzer))
+
+        return workers
+
+    async def definitions(self) -> Sequence[AnalyzerDefinition]:
+        return self._wrap((await self._api.do_get('analyzerdefinition')).json(), AnalyzerDefinition)
+
+    async def enable(self, analyzer_name, config) -> Analyzer:
+        url = 'organization/analyzer/{}'.format(analyzer_name)
+        config['name'] = analyzer_name
+
+        analyzer = self._wrap((await self._api.do_post(url, config)).json(), Analyzer)
+        self.catalog.invalidate()
+
+        return analyzer
+
+    async def update(self, analyzer_id, config) -> Analyzer:
+        url = 'analyzer/{}'.format(analyzer_id)
+        config.pop('name', None)
+
+        analyzer = self._wrap((await self._api.do_patch(url, config)).json(), Analyzer)
+        self.catalog.invalidate()
+
+        return analyzer
+
+    async def disable(self, analyzer_id) -> bool:
+        deleted = await self._api.do_delete('analyzer/{}'.format(analyzer_id))
+        self.catalog.invalidate()
+
+        return deleted
+
+    async def run_by_id(self, analyzer_id, observable, **kwargs) -> Job:
+        with self._api.deadline(kwargs.get('deadline', None)):
+            return await self._run_by_id(analyzer_id, observable, **kwargs)
+
+    async def _run_by_id(self, analyzer_id, observable, **kwargs) -> Job:
+        tlp = observable.get('tlp', 2)
+        pap = observable.get('pap', 2)
+        data_type = observable.get('dataType', None)
+
+        post = {
+            'dataType': data_type,
+            'tlp': tlp,
+            'pap': pap
+        }
+
+        params = {}
+        if 'force' in kwargs:
+            params['force'] = kwargs.get('force', 1)
+
+        # add additional details
+        for key in ['message', 'parameters']:
+            if key in observable:
+                post[key] = observable.get(key, None)
+
+        flight = self._api.single_flight
+        if flight is not None and data_type != 'file':
+            flight_key = json.dumps(['analyzer', analyzer_id, post, observable.get('data'), params],
+                                    sort_keys=True, default=str)
+            return await flight.do(flight_key, lambda: self._submit(analyzer_id, observable, post, params, **kwargs))
+
+        return await self._submit(analyzer_id, observable, post, params, **kwargs)
+
+    async def _submit(self, analyzer_id, observable, post, params, **kwargs) -> Job:
+        # The file and SQLite accesses block, they are made on the default executor instead of the event loop
+        loop = asyncio.get_running_loop()
+        limiter = self._api.rate_limiter
+        if limiter is not None:
+            analyzer = await self._get_worker(analyzer_id)
+            await asyncio.sleep(await loop.run_in_executor(None, limiter.reserve, analyzer_id,
+                                                           getattr(analyzer, 'rate', None),
+                                                           getattr(analyzer, 'rateUnit', None)))
+
+        if observable.get('dataType') == "file":
+            content = observable.get('data', None)
+            content_type = kwargs.get('content_type', None) or \
+                await loop.run_in_executor(None, self._api.mime_detector.detect, content)
+            encoder = await loop.run_in_executor(None, lambda: MultipartEncoder([
+                ('_json', json.dumps(post)),
+                ('data', (AnalyzersController._file_name(observable), content, content_type))
+            ], callback=kwargs.get('progress', None)))
+
+            with encoder:
+                response = await self._api.do_file_post('analyzer/{}/run'.format(analyzer_id),
+                                                        self._stream(encoder, loop), params=params,
+                                                        headers={'Content-Type': encoder.content_type,
+                                                                 'Content-Length': str(len(encoder))})
+
+            return self._wrap(response.json(), Job)
+        else:
+            post = dict(post, data=observable.get('data'))
+
+            return self._wrap((await self._api.do_post('analyzer/{}/run'.format(analyzer_id), post, params)).json(),
+                              Job)
+
+    @staticmethod
+    async def _stream(encoder, loop):
+        while True:
+            chunk = await loop.run_in_executor(None, encoder.read, encoder.chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    async def _get_worker(self, analyzer_id) -> Analyzer:
+        analyzer = self.catalog.get('id', analyzer_id)
+        if analyzer is None:
+            analyzer = self.catalog.put('id', analyzer_id, await self.get_by_id(analyzer_id))
+
+        return analyzer
+
+    async def run_by_name(self, analyzer_name, observable, **kwargs) -> Job:
+        with self._api.deadline(kwargs.get('deadline', None)) as current:
+            analyzer = self.catalog.get('name', analyzer_name)
+            if analyzer is None:
+                analyzer = self.catalog.put('name', analyzer_name, await self.get_by_name(analyzer_name))
+
+            if analyzer is None:
+                raise CortexError("Analyzer %s not found" % analyzer_name)
+
+            return await self.run_by_id(analyzer.id, observable, **dict(kwargs, deadline=current))
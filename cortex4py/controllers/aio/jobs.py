@@ -0,0 +1,72 @@
+from typing import AsyncIterator, Sequence
+
+from .abstract import AsyncAbstractController
+from ...models import Job, JobArtifact
+from ...stats import StatsResult
+from ...stream import JsonStreamParser, open_spool
+
+
+class AsyncJobsController(AsyncAbstractController):
+    def __init__(self, api):
+        AsyncAbstractController.__init__(self, 'job', api)
+
+    async def find_all(self, query, **kwargs) -> Sequence[Job]:
+        return self._wrap(await self._find_all(query, **kwargs), Job)
+
+    def iter_all(self, query, **kwargs) -> AsyncIterator[Job]:
+        return self._iter_wrap(self._iter_all(query, **kwargs), Job)
+
+    async def find_one_by(self, query, **kwargs) -> Job:
+        return self._wrap(await self._find_one_by(query, **kwargs), Job)
+
+    async def stats(self, query, aggs=None) -> StatsResult:
+        return await self._stats(query, aggs)
+
+    async def get_by_id(self, org_id) -> Job:
+        return self._wrap(await self._get_by_id(org_id), Job)
+
+    async def get_report(self, job_id) -> Job:
+        return self._wrap((await self._api.do_get('job/{}/report'.format(job_id))).json(), Job)
+
+    async def get_report_stream(self, job_id, fields=None, spool=None, chunk_size=65536) -> Job:
+        # Spooled reports are not parsed, unless some fields are requested
+        parser = JsonStreamParser(fields if fields is not None or spool is None else (), codec=self._api.json_codec)
+        with open_spool(spool) as spool_file:
+            async for chunk in self._api.do_stream('job/{}/report'.format(job_id), chunk_size=chunk_size):
+                if spool_file is not None:
+                    spool_file.write(chunk)
+                parser.feed(chunk)
+        parser.close()
+
+        return self._wrap(parser.document, Job)
+
+    async def iter_report_items(self, job_id, path, chunk_size=65536) -> AsyncIterator[dict]:
+        parser = JsonStreamParser(items=path, codec=self._api.json_codec)
+        async for chunk in self._api.do_stream('job/{}/report'.format(job_id), chunk_size=chunk_size):
+            for item in parser.feed(chunk):
+                yield item
+        for item in parser.close():
+            yield item
+
+    async def get_report_async(self, job_id, timeout='Inf', deadline=None) -> Job:
+        with self._api.deadline(deadline) as current:
+            if current is not None and timeout == 'Inf':
+                timeout = '{}seconds'.format(int(current.remaining()))
+
+            # Cortex holds the request for up to the given timeout, the read timeout must not cut it
+            url = 'job/{}/waitreport?atMost={}'.format(job_id, timeout)
+            connect_timeout = (self._api.connect_timeout, None)
+            flight = self._api.single_flight
+            if flight is not None:
+                return await flight.do(url, lambda: self._get_report(url, timeout=connect_timeout))
+
+            return await self._get_report(url, timeout=connect_timeout)
+
+    async def _get_report(self, url, **kwargs) -> Job:
+        return self._wrap((await self._api.do_get(url, **kwargs)).json(), Job)
+
+    async def get_artifacts(self, job_id) -> Sequence[JobArtifact]:
+        return self._wrap((await self._api.do_get('job/{}/artifacts'.format(job_id))).json(), JobArtifact)
+
+    async def delete(self, job_id) -> bool:
+        return await self._api.do_delete('job/{}'.format(job_id))
@@ -0,0 +1,61 @@
+from typing import AsyncIterator, Sequence
+
+from .abstract import AsyncAbstractController
+from ...models import Organization, Analyzer, User
+from ...stats import StatsResult
+
+
+class AsyncOrganizationsController(AsyncAbstractController):
+    def __init__(self, api):
+        AsyncAbstractController.__init__(self, 'organization', api)
+
+    async def find_all(self, query, **kwargs) -> Sequence[Organization]:
+        return self._wrap(await self._find_all(query, **kwargs), Organization)
+
+    def iter_all(self, query, **kwargs) -> AsyncIterator[Organization]:
+        return self._iter_wrap(self._iter_all(query, **kwargs), Organization)
+
+    async def find_one_by(self, query, **kwargs) -> Organization:
+        return self._wrap(await self._find_one_by(query, **kwargs), Organization)
+
+    async def stats(self, query, aggs=None) -> StatsResult:
+        return await self._stats(query, aggs)
+
+    async def get_by_id(self, org_id) -> Organization:
+        return self._wrap(await self._get_by_id(org_id), Organization)
+
+    async def get_users(self, organization_id, query, **kwargs):
+        url = 'organization/{}/user/_search'.format(organization_id)
+        params = dict((k, kwargs.get(k, None)) for k in ('sort', 'range'))
+
+        return self._wrap((await self._api.do_post(url, {'query': query or {}}, params)).json(), User)
+
+    async def count(self, query) -> int:
+        return await self._count(query)
+
+    async def get_analyzers(self) -> Sequence[Analyzer]:
+        url = 'analyzer'
+
+        return self._wrap((await self._api.do_get(url)).json(), Analyzer)
+
+    async def create(self, data) -> Organization:
+
+        if isinstance(data, dict):
+            data = Organization(data).json()
+        elif isinstance(data, Organization):
+            data = data.json()
+
+        response = (await self._api.do_post('organization', data)).json()
+
+        return Organization(response)
+
+    async def update(self, org_id, data, fields=None) -> Organization:
+        if isinstance(data, Organization):
+            data = data.json()
+
+        url = 'organization/{}'.format(org_id)
+        patch = AsyncAbstractController._clean_changes(data, ['description', 'status'], fields)
+        return self._wrap((await self._api.do_patch(url, patch)).json(), Organization)
+
+    async def delete(self, org_id) -> bool:
+        return await self._api.do_delete('organization/{}'.format(org_id))
@@ -0,0 +1,107 @@
+import asyncio
+from typing import AsyncIterator, Sequence
+
+from cortex4py.query import *
+from .abstract import AsyncAbstractController
+from ...models import Responder, Job, ResponderDefinition
+from ...stats import StatsResult
+from ...catalog import WorkerCatalog
+
+
+class AsyncRespondersController(AsyncAbstractController):
+    def __init__(self, api):
+        AsyncAbstractController.__init__(self, 'responder', api)
+        self.catalog = WorkerCatalog(api.catalog_ttl)
+
+    async def find_all(self, query, **kwargs) -> Sequence[Responder]:
+        return self._wrap(await self._find_all(query, **kwargs), Responder)
+
+    def iter_all(self, query, **kwargs) -> AsyncIterator[Responder]:
+        return self._iter_wrap(self._iter_all(query, **kwargs), Responder)
+
+    async def find_one_by(self, query, **kwargs) -> Responder:
+        return self._wrap(await self._find_one_by(query, **kwargs), Responder)
+
+    async def stats(self, query, aggs=None) -> StatsResult:
+        return await self._stats(query, aggs)
+
+    async def get_by_id(self, worker_id) -> Responder:
+        return self._wrap(await self._get_by_id(worker_id), Responder)
+
+    async def get_by_name(self, name) -> Responder:
+        return self._wrap(await self._find_one_by(Eq('name', name)), Responder)
+
+    async def get_by_type(self, data_type) -> Sequence[Responder]:
+        workers = self.catalog.get('type', data_type)
+        if workers is None:
+            url = 'responder/type/{}'.format(data_type)
+            workers = self.catalog.put('type', data_type, self._wrap((await self._api.do_get(url)).json(), Responder))
+
+        return workers
+
+    async def definitions(self) -> Sequence[ResponderDefinition]:
+        return self._wrap((await self._api.do_get('responderdefinition')).json(), ResponderDefinition)
+
+    async def enable(self, responder_name, config) -> Responder:
+        url = 'organization/responder/{}'.format(responder_name)
+        config['name'] = responder_name
+
+        responder = self._wrap((await self._api.do_post(url, config)).json(), Responder)
+        self.catalog.invalidate()
+
+        return responder
+
+    async def update(self, worker_id, config) -> Responder:
+        url = 'responder/{}'.format(worker_id)
+        config.pop('name', None)
+
+        responder = self._wrap((await self._api.do_patch(url, config)).json(), Responder)
+        self.catalog.invalidate()
+
+        return responder
+
+    async def disable(self, worker_id) -> bool:
+        deleted = await self._api.do_delete('responder/{}'.format(worker_id))
+        self.catalog.invalidate()
+
+        return deleted
+
+    async def run_by_id(self, worker_id, data, **kwargs) -> Job:
+        tlp = data.get('tlp', 2)
+        data_type = data.get('dataType', None)
+
+        post = {
+            'dataType': data_type,
+            'tlp': tlp
+        }
+
+        # add additional details
+        for key in ['message', 'parameters']:
+            if key in data:
+                post[key] = data.get(key, None)
+
+        post['data'] = data.get('data')
+
+        with self._api.deadline(kwargs.get('deadline', None)):
+            limiter = self._api.rate_limiter
+            if limiter is not None:
+                responder = await self._get_worker(worker_id)
+                await asyncio.sleep(limiter.reserve(worker_id, getattr(responder, 'rate', None),
+                                                    getattr(responder, 'rateUnit', None)))
+
+            return self._wrap((await self._api.do_post('responder/{}/run'.format(worker_id), post)).json(), Job)
+
+    async def _get_worker(self, worker_id) -> Responder:
+        responder = self.catalog.get('id', worker_id)
+        if responder is None:
+            responder = self.catalog.put('id', worker_id, await self.get_by_id(worker_id))
+
+        return responder
+
+    async def run_by_name(self, responder_name, data, **kwargs) -> Job:
+        with self._api.deadline(kwargs.get('deadline', None)) as current:
+            responder = self.catalog.get('name', responder_name)
+            if responder is None:
+                responder = self.catalog.put('name', responder_name, await self.get_by_name(responder_name))
+
+            return await self.run_by_id(responder.id, data, **dict(kwargs, deadline=current))
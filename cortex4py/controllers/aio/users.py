@@ -0,0 +1,73 @@
+from typing import AsyncIterator, Sequence
+
+from .abstract import AsyncAbstractController
+from ...models import User
+from ...stats import StatsResult
+
+
+class AsyncUsersController(AsyncAbstractController):
+    def __init__(self, api):
+        AsyncAbstractController.__init__(self, 'user', api)
+
+    async def find_all(self, query, **kwargs) -> Sequence[User]:
+        return self._wrap(await self._find_all(query, **kwargs), User)
+
+    def iter_all(self, query, **kwargs) -> AsyncIterator[User]:
+        return self._iter_wrap(self._iter_all(query, **kwargs), User)
+
+    async def find_one_by(self, query, **kwargs) -> User:
+        return self._wrap(await self._find_one_by(query, **kwargs), User)
+
+    async def stats(self, query, aggs=None) -> StatsResult:
+        return await self._stats(query, aggs)
+
+    async def get_by_id(self, org_id) -> User:
+        return self._wrap(await self._get_by_id(org_id), User)
+
+    async def create(self, data) -> User:
+
+        if isinstance(data, dict):
+            data = User(data).json()
+        elif isinstance(data, User):
+            data = data.json()
+
+        response = (await self._api.do_post('user', data)).json()
+
+        return User(response)
+
+    async def update(self, user_id, data, fields=None) -> User:
+        url = 'user/{}'.format(user_id)
+        patch = AsyncAbstractController._clean_changes(data, ['name', 'organization', 'roles'], fields)
+        return self._wrap((await self._api.do_patch(url, patch)).json(), User)
+
+    async def lock(self, user_id) -> User:
+        user = (await self._api.do_patch('user/{}'.format(user_id), {
+            'status': 'Locked'
+        })).json()
+
+        return User(user)
+
+    async def set_password(self, user_id, password):
+        await self._api.do_post('user/{}/password/set'.format(user_id), {'password': password})
+
+        return True
+
+    async def change_password(self, user_id, current_password, new_password):
+        await self._api.do_post('user/{}/password/change'.format(user_id), {
+            'currentPassword': current_password,
+            'password': new_password
+        })
+
+        return True
+
+    async def set_key(self, user_id):
+        return (await self._api.do_post('user/{}/key/renew'.format(user_id), {})).text
+
+    async def renew_key(self, user_id):
+        return await self.set_key(user_id)
+
+    async def get_key(self, user_id):
+        return (await self._api.do_get('user/{}/key'.format(user_id))).text
+
+    async def revoke_key(self, user_id):
+        return await self._api.do_delete('user/{}/key'.format(user_id))
@@ -1,53 +1,83 @@
 import os
 
-import magic
 import json
-from typing import List
+from typing import Iterator, Sequence
 
 from cortex4py.query import *
 from .abstract import AbstractController
 from ..models import Analyzer, Job, AnalyzerDefinition
+from ..stats import StatsResult
+from ..catalog import WorkerCatalog
+from ..cache import ReportCache
 from ..exceptions import CortexError
+from ..bulk import BulkResult, run_bulk
+from ..multipart import MultipartEncoder
+from ..deadline import Deadline
 
 
 class AnalyzersController(AbstractController):
     def __init__(self, api):
         AbstractController.__init__(self, 'analyzer', api)
+        self.catalog = WorkerCatalog(api.catalog_ttl)
 
-    def find_all(self, query, **kwargs) -> List[Analyzer]:
+    def find_all(self, query, **kwargs) -> Sequence[Analyzer]:
         return self._wrap(self._find_all(query, **kwargs), Analyzer)
 
+    def iter_all(self, query, **kwargs) -> Iterator[Analyzer]:
+        return self._iter_wrap(self._iter_all(query, **kwargs), Analyzer)
+
     def find_one_by(self, query, **kwargs) -> Analyzer:
         return self._wrap(self._find_one_by(query, **kwargs), Analyzer)
 
+    def stats(self, query, aggs=None) -> StatsResult:
+        return self._stats(query, aggs)
+
     def get_by_id(self, analyzer_id) -> Analyzer:
         return self._wrap(self._get_by_id(analyzer_id), Analyzer)
 
     def get_by_name(self, name) -> Analyzer:
         return self._wrap(self._find_one_by(Eq('name', name)), Analyzer)
 
-    def get_by_type(self, data_type) -> List[Analyzer]:
-        return self._wrap(self._api.do_get('analyzer/type/{}'.format(data_type)).json(), Analyzer)
+    def get_by_type(self, data_type) -> Sequence[Analyzer]:
+        workers = self.catalog.get('type', data_type)
+        if workers is None:
+            url = 'analyzer/type/{}'.format(data_type)
+            workers = self.catalog.put('type', data_type, self._wrap(self._api.do_get(url).json(), Analyzer))
+
+        return workers
 
-    def definitions(self) -> List[AnalyzerDefinition]:
+    def definitions(self) -> Sequence[AnalyzerDefinition]:
         return self._wrap(self._api.do_get('analyzerdefinition').json(), AnalyzerDefinition)
 
     def enable(self, analyzer_name, config) -> Analyzer:
         url = 'organization/analyzer/{}'.format(analyzer_name)
         config['name'] = analyzer_name
 
-        return self._wrap(self._api.do_post(url, config).json(), Analyzer)
+        analyzer = self._wrap(self._api.do_post(url, config).json(), Analyzer)
+        self.catalog.invalidate()
+
+        return analyzer
 
     def update(self, analyzer_id, config) -> Analyzer:
         url = 'analyzer/{}'.format(analyzer_id)
         config.pop('name', None)
 
-        return self._wrap(self._api.do_patch(url, config).json(), Analyzer)
+        analyzer = self._wrap(self._api.do_patch(url, config).json(), Analyzer)
+        self.catalog.invalidate()
+
+        return analyzer
 
     def disable(self, analyzer_id) -> bool:
-        return self._api.do_delete('analyzer/{}'.format(analyzer_id))
+        deleted = self._api.do_delete('analyzer/{}'.format(analyzer_id))
+        self.catalog.invalidate()
+
+        return deleted
 
     def run_by_id(self, analyzer_id, observable, **kwargs) -> Job:
+        with self._api.deadline(kwargs.get('deadline', None)):
+            return self._run_by_id(analyzer_id, observable, **kwargs)
+
+    def _run_by_id(self, analyzer_id, observable, **kwargs) -> Job:
         tlp = observable.get('tlp', 2)
         pap = observable.get('pap', 2)
         data_type = observable.get('dataType', None)
@@ -67,28 +97,85 @@ class AnalyzersController(AbstractController):
             if key in observable:
                 post[key] = observable.get(key, None)
 
+        cache = self._api.report_cache
+        cache_key = None
+        if cache is not None:
+            worker_definition_id = self._get_worker(analyzer_id).workerDefinitionId
+            cache_key = ReportCache.key(worker_definition_id, data_type, observable.get('data'), tlp, pap)
+            report = cache.get(cache_key) if 'force' not in params else None
+            if report is not None:
+                return self._wrap(report, Job)
+
+        flight = self._api.single_flight
+        if flight is not None and data_type != 'file':
+            flight_key = json.dumps(['analyzer', analyzer_id, post, observable.get('data'), params],
+                                    sort_keys=True, default=str)
+            job = flight.do(flight_key, lambda: self._submit(analyzer_id, observable, post, params, **kwargs))
+        else:
+            job = self._submit(analyzer_id, observable, post, params, **kwargs)
+
+        if cache_key is not None:
+            cache.bind(job.id, cache_key)
+
+        return job
+
+    def _submit(self, analyzer_id, observable, post, params, **kwargs) -> Job:
+        limiter = self._api.rate_limiter
+        if limiter is not None:
+            analyzer = self._get_worker(analyzer_id)
+            limiter.acquire(analyzer_id, getattr(analyzer, 'rate', None), getattr(analyzer, 'rateUnit', None))
+
         if observable.get('dataType') == "file":
-            file_path = observable.get('data', None)
-            file_def = {
-                "data": (os.path.basename(file_path), open(file_path, 'rb'),
-                         magic.Magic(mime=True).from_file(file_path))
-            }
-
-            data = {
-                '_json': json.dumps(post)
-            }
-
-            return self._wrap(self._api.do_file_post('analyzer/{}/run'.format(analyzer_id), data,
-                                                     files=file_def, params=params).json(), Job)
+            content = observable.get('data', None)
+            content_type = kwargs.get('content_type', None) or self._api.mime_detector.detect(content)
+            encoder = MultipartEncoder([
+                ('_json', json.dumps(post)),
+                ('data', (self._file_name(observable), content, content_type))
+            ], callback=kwargs.get('progress', None))
+
+            with encoder:
+                return self._wrap(self._api.do_file_post('analyzer/{}/run'.format(analyzer_id), encoder,
+                                                         headers={'Content-Type': encoder.content_type},
+                                                         params=params).json(), Job)
         else:
-            post['data'] = observable.get('data')
+            post = dict(post, data=observable.get('data'))
 
             return self._wrap(self._api.do_post('analyzer/{}/run'.format(analyzer_id), post, params).json(), Job)
 
-    def run_by_name(self, analyzer_name, observable, **kwargs) -> Job:
-        analyzer = self.get_by_name(analyzer_name)
+    @staticmethod
+    def _file_name(observable):
+        content = observable.get('data', None)
+        if 'filename' in observable:
+            return observable.get('filename')
+        elif isinstance(content, str):
+            return os.path.basename(content)
+        elif isinstance(getattr(content, 'name', None), str):
+            return os.path.basename(content.name)
+        else:
+            return 'data'
 
+    def _get_worker(self, analyzer_id) -> Analyzer:
+        analyzer = self.catalog.get('id', analyzer_id)
         if analyzer is None:
-            raise CortexError("Analyzer %s not found" % analyzer_name)
+            analyzer = self.catalog.put('id', analyzer_id, self.get_by_id(analyzer_id))
+
+        return analyzer
+
+    def run_by_name(self, analyzer_name, observable, **kwargs) -> Job:
+        with self._api.deadline(kwargs.get('deadline', None)) as current:
+            analyzer = self.catalog.get('name', analyzer_name)
+            if analyzer is None:
+                analyzer = self.catalog.put('name', analyzer_name, self.get_by_name(analyzer_name))
+
+            if analyzer is None:
+                raise CortexError("Analyzer %s not found" % analyzer_name)
+
+            return self.run_by_id(analyzer.id, observable, **dict(kwargs, deadline=current))
+
+    def run_many(self, observables, analyzers, max_workers=8, ordered=True, **kwargs) -> BulkResult:
+        analyzer_ids = [a.id if isinstance(a, Analyzer) else a for a in analyzers]
+        kwargs['deadline'] = Deadline.of(kwargs.get('deadline', None))
+        items = [(observable, analyzer_id) for observable in observables for analyzer_id in analyzer_ids]
 
-        return self.run_by_id(analyzer.id, observable, **kwargs)
+        return run_bulk(lambda item: self.run_by_id(item[1], item[0], **kwargs), items,
+                        max_workers=max_workers, ordered=ordered)
@@ -1,29 +1,98 @@
-from typing import List
+from typing import Iterator, Sequence
 from .abstract import AbstractController
 from ..models import Job, JobArtifact
+from ..stats import StatsResult
+from ..watcher import JobWatcher
+from ..purge import JobPurge, PurgeResult
+from ..sync import JobSync
+from ..export import JobExporter, ExportResult
+from ..stream import JsonStreamParser, open_spool
 
 
 class JobsController(AbstractController):
     def __init__(self, api):
         AbstractController.__init__(self, 'job', api)
 
-    def find_all(self, query, **kwargs) -> List[Job]:
+    def find_all(self, query, **kwargs) -> Sequence[Job]:
         return self._wrap(self._find_all(query, **kwargs), Job)
 
+    def iter_all(self, query, **kwargs) -> Iterator[Job]:
+        return self._iter_wrap(self._iter_all(query, **kwargs), Job)
+
     def find_one_by(self, query, **kwargs) -> Job:
         return self._wrap(self._find_one_by(query, **kwargs), Job)
 
+    def stats(self, query, aggs=None) -> StatsResult:
+        return self._stats(query, aggs)
+
     def get_by_id(self, org_id) -> Job:
         return self._wrap(self._get_by_id(org_id), Job)
 
+    def _get_report(self, job_id, url, **kwargs) -> Job:
+        cache = self._api.report_cache
+        if cache is not None:
+            report = cache.get_job(job_id)
+            if report is not None:
+                return self._wrap(report, Job)
+
+        report = self._api.do_get(url, **kwargs).json()
+        if cache is not None and report.get('status') == 'Success':
+            cache.put_job(job_id, report)
+
+        return self._wrap(report, Job)
+
     def get_report(self, job_id) -> Job:
-        return self._wrap(self._api.do_get('job/{}/report'.format(job_id)).json(), Job)
+        return self._get_report(job_id, 'job/{}/report'.format(job_id))
+
+    def get_report_stream(self, job_id, fields=None, spool=None, chunk_size=65536) -> Job:
+        # Spooled reports are not parsed, unless some fields are requested
+        parser = JsonStreamParser(fields if fields is not None or spool is None else (), codec=self._api.json_codec)
+        with open_spool(spool) as spool_file:
+            for chunk in self._api.do_stream('job/{}/report'.format(job_id), chunk_size=chunk_size):
+                if spool_file is not None:
+                    spool_file.write(chunk)
+                parser.feed(chunk)
+        parser.close()
+
+        return self._wrap(parser.document, Job)
 
-    def get_report_async(self, job_id, timeout='Inf') -> Job:
-        return self._wrap(self._api.do_get('job/{}/waitreport?atMost={}'.format(job_id, timeout)).json(), Job)
+    def iter_report_items(self, job_id, path, chunk_size=65536) -> Iterator[dict]:
+        parser = JsonStreamParser(items=path, codec=self._api.json_codec)
+        for chunk in self._api.do_stream('job/{}/report'.format(job_id), chunk_size=chunk_size):
+            for item in parser.feed(chunk):
+                yield item
+        for item in parser.close():
+            yield item
 
-    def get_artifacts(self, job_id) -> List[JobArtifact]:
+    def get_report_async(self, job_id, timeout='Inf', deadline=None) -> Job:
+        with self._api.deadline(deadline) as current:
+            if current is not None and timeout == 'Inf':
+                timeout = '{}seconds'.format(int(current.remaining()))
+
+            # Cortex holds the request for up to the given timeout, the read timeout must not cut it
+            url = 'job/{}/waitreport?atMost={}'.format(job_id, timeout)
+            connect_timeout = (self._api.connect_timeout, None)
+            flight = self._api.single_flight
+            if flight is not None:
+                return flight.do(url, lambda: self._get_report(job_id, url, timeout=connect_timeout))
+
+            return self._get_report(job_id, url, timeout=connect_timeout)
+
+    def watch(self, job_ids, **kwargs) -> JobWatcher:
+        return JobWatcher(self._api, job_ids, **kwargs)
+
+    def sync_since(self, cursor=None, query=None, **kwargs) -> JobSync:
+        return JobSync(self._api, cursor, query, **kwargs)
+
+    def get_artifacts(self, job_id) -> Sequence[JobArtifact]:
         return self._wrap(self._api.do_get('job/{}/artifacts'.format(job_id)).json(), JobArtifact)
 
     def delete(self, job_id) -> bool:
         return self._api.do_delete('job/{}'.format(job_id))
+
+    def export(self, path, query=None, **kwargs) -> ExportResult:
+        return JobExporter(self._api, path, query, **kwargs).run()
+
+    def purge(self, query, dry_run=False, **kwargs) -> PurgeResult:
+        purge = JobPurge(self._api, query, **kwargs)
+        return purge.dry_run() if dry_run else purge.run()
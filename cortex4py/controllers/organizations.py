@@ -1,19 +1,26 @@
-from typing import List
+from typing import Iterator, Sequence
 
 from .abstract import AbstractController
 from ..models import Organization, Analyzer, User
+from ..stats import StatsResult
 
 
 class OrganizationsController(AbstractController):
     def __init__(self, api):
         AbstractController.__init__(self, 'organization', api)
 
-    def find_all(self, query, **kwargs) -> List[Organization]:
+    def find_all(self, query, **kwargs) -> Sequence[Organization]:
         return self._wrap(self._find_all(query, **kwargs), Organization)
 
+    def iter_all(self, query, **kwargs) -> Iterator[Organization]:
+        return self._iter_wrap(self._iter_all(query, **kwargs), Organization)
+
     def find_one_by(self, query, **kwargs) -> Organization:
         return self._wrap(self._find_one_by(query, **kwargs), Organization)
 
+    def stats(self, query, aggs=None) -> StatsResult:
+        return self._stats(query, aggs)
+
     def get_by_id(self, org_id) -> Organization:
         return self._wrap(self._get_by_id(org_id), Organization)
 
@@ -26,7 +33,7 @@ class OrganizationsController(AbstractController):
     def count(self, query) -> int:
         return self._count(query)
 
-    def get_analyzers(self) -> List[Analyzer]:
+    def get_analyzers(self) -> Sequence[Analyzer]:
         url = 'analyzer'
 
         return self._wrap(self._api.do_get(url).json(), Analyzer)
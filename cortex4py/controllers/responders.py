@@ -1,46 +1,69 @@
-from typing import List
+from typing import Iterator, Sequence
 
 from cortex4py.query import *
 from .abstract import AbstractController
 from ..models import Responder, Job, ResponderDefinition
+from ..stats import StatsResult
+from ..catalog import WorkerCatalog
 
 
 class RespondersController(AbstractController):
     def __init__(self, api):
         AbstractController.__init__(self, 'responder', api)
+        self.catalog = WorkerCatalog(api.catalog_ttl)
 
-    def find_all(self, query, **kwargs) -> List[Responder]:
+    def find_all(self, query, **kwargs) -> Sequence[Responder]:
         return self._wrap(self._find_all(query, **kwargs), Responder)
 
+    def iter_all(self, query, **kwargs) -> Iterator[Responder]:
+        return self._iter_wrap(self._iter_all(query, **kwargs), Responder)
+
     def find_one_by(self, query, **kwargs) -> Responder:
         return self._wrap(self._find_one_by(query, **kwargs), Responder)
 
+    def stats(self, query, aggs=None) -> StatsResult:
+        return self._stats(query, aggs)
+
     def get_by_id(self, worker_id) -> Responder:
         return self._wrap(self._get_by_id(worker_id), Responder)
 
     def get_by_name(self, name) -> Responder:
         return self._wrap(self._find_one_by(Eq('name', name)), Responder)
 
-    def get_by_type(self, data_type) -> List[Responder]:
-        return self._wrap(self._api.do_get('responder/type/{}'.format(data_type)).json(), Responder)
+    def get_by_type(self, data_type) -> Sequence[Responder]:
+        workers = self.catalog.get('type', data_type)
+        if workers is None:
+            url = 'responder/type/{}'.format(data_type)
+            workers = self.catalog.put('type', data_type, self._wrap(self._api.do_get(url).json(), Responder))
+
+        return workers
 
-    def definitions(self) -> List[ResponderDefinition]:
+    def definitions(self) -> Sequence[ResponderDefinition]:
         return self._wrap(self._api.do_get('responderdefinition').json(), ResponderDefinition)
 
     def enable(self, responder_name, config) -> Responder:
         url = 'organization/responder/{}'.format(responder_name)
         config['name'] = responder_name
 
-        return self._wrap(self._api.do_post(url, config).json(), Responder)
+        responder = self._wrap(self._api.do_post(url, config).json(), Responder)
+        self.catalog.invalidate()
+
+        return responder
 
     def update(self, worker_id, config) -> Responder:
         url = 'responder/{}'.format(worker_id)
         config.pop('name', None)
 
-        return self._wrap(self._api.do_patch(url, config).json(), Responder)
+        responder = self._wrap(self._api.do_patch(url, config).json(), Responder)
+        self.catalog.invalidate()
+
+        return responder
 
     def disable(self, worker_id) -> bool:
-        return self._api.do_delete('responder/{}'.format(worker_id))
+        deleted = self._api.do_delete('responder/{}'.format(worker_id))
+        self.catalog.invalidate()
+
+        return deleted
 
     def run_by_id(self, worker_id, data, **kwargs) -> Job:
         tlp = data.get('tlp', 2)
@@ -58,9 +81,25 @@ class RespondersController(AbstractController):
 
         post['data'] = data.get('data')
 
-        return self._wrap(self._api.do_post('responder/{}/run'.format(worker_id), post).json(), Job)
+        with self._api.deadline(kwargs.get('deadline', None)):
+            limiter = self._api.rate_limiter
+            if limiter is not None:
+                responder = self._get_worker(worker_id)
+                limiter.acquire(worker_id, getattr(responder, 'rate', None), getattr(responder, 'rateUnit', None))
+
+            return self._wrap(self._api.do_post('responder/{}/run'.format(worker_id), post).json(), Job)
+
+    def _get_worker(self, worker_id) -> Responder:
+        responder = self.catalog.get('id', worker_id)
+        if responder is None:
+            responder = self.catalog.put('id', worker_id, self.get_by_id(worker_id))
+
+        return responder
 
     def run_by_name(self, responder_name, data, **kwargs) -> Job:
-        responder = self.get_by_name(responder_name)
+        with self._api.deadline(kwargs.get('deadline', None)) as current:
+            responder = self.catalog.get('name', responder_name)
+            if responder is None:
+                responder = self.catalog.put('name', responder_name, self.get_by_name(responder_name))
 
-        return self.run_by_id(responder.id, data, **kwargs)
+            return self.run_by_id(responder.id, data, **dict(kwargs, deadline=current))
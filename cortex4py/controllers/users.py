@@ -1,19 +1,26 @@
-from typing import List
+from typing import Iterator, Sequence
 
 from .abstract import AbstractController
 from ..models import User
+from ..stats import StatsResult
 
 
 class UsersController(AbstractController):
     def __init__(self, api):
         AbstractController.__init__(self, 'user', api)
 
-    def find_all(self, query, **kwargs) -> List[User]:
+    def find_all(self, query, **kwargs) -> Sequence[User]:
         return self._wrap(self._find_all(query, **kwargs), User)
 
+    def iter_all(self, query, **kwargs) -> Iterator[User]:
+        return self._iter_wrap(self._iter_all(query, **kwargs), User)
+
     def find_one_by(self, query, **kwargs) -> User:
         return self._wrap(self._find_one_by(query, **kwargs), User)
 
+    def stats(self, query, aggs=None) -> StatsResult:
+        return self._stats(query, aggs)
+
     def get_by_id(self, org_id) -> User:
         return self._wrap(self._get_by_id(org_id), User)
 
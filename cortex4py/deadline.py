@@ -0,0 +1,65 @@
+import contextvars
+import time
+
+from contextlib import contextmanager
+
+from .exceptions import DeadlineExceededError
+
+_current = contextvars.ContextVar('cortex4py_deadline', default=None)
+
+
+class Deadline(object):
+    """Point in time after which the calls of an operation must not wait anymore. The calls made while a deadline is
+    active (see ``deadline()``) get their timeouts reduced to the remaining time, and fail with a
+    ``DeadlineExceededError`` once it is reached."""
+
+    def __init__(self, seconds):
+        self.expires_at = time.monotonic() + seconds
+
+    @staticmethod
+    def of(value):
+        if value is None or isinstance(value, Deadline):
+            return value
+        return Deadline(value)
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self):
+        return self.remaining() <= 0
+
+    def check(self):
+        if self.expired:
+            raise DeadlineExceededError('Deadline exceeded')
+
+    def clamp(self, timeout):
+        """Reduces ``timeout``, a number of seconds or a ``(connect, read)`` tuple, to the remaining time."""
+        remaining = self.remaining()
+        if isinstance(timeout, tuple):
+            return tuple(remaining if t is None else min(t, remaining) for t in timeout)
+
+        return remaining if timeout is None else min(timeout, remaining)
+
+
+def current_deadline():
+    """Returns the deadline active in the current thread or task, or ``None``."""
+    return _current.get()
+
+
+@contextmanager
+def deadline(value):
+    """Makes ``value`` (a ``Deadline`` or a number of seconds) the deadline of the calls made within the block. An
+    enclosing deadline that expires earlier is kept. ``None`` leaves the current deadline unchanged."""
+    new = Deadline.of(value)
+    outer = _current.get()
+
+    if new is None or (outer is not None and outer.expires_at <= new.expires_at):
+        yield outer
+        return
+
+    token = _current.set(new)
+    try:
+        yield new
+    finally:
+        _current.reset(token)
@@ -22,9 +22,23 @@ class ServiceUnavailableError(CortexException):
     pass
 
 
+class RateLimitError(CortexException):
+    pass
+
+
+class DeadlineExceededError(CortexException):
+    pass
+
+
 class ServerError(CortexException):
     pass
 
 
 class CortexError(CortexException):
-    pass
\ No newline at end of file
+    pass
+
+class CircuitOpenError(ServiceUnavailableError):
+    def __init__(self, message, circuit=None, retry_after=None):
+        super(CircuitOpenError, self).__init__(message)
+        self.circuit = circuit
+        self.retry_after = retry_after
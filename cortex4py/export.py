@@ -0,0 +1,219 @@
+import gzip
+import os
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from cortex4py.query import *
+from .result import OperationResult
+
+
+class JsonlWriter(object):
+    """Writes records as JSON lines, gzip compressed unless ``compression`` is ``None``."""
+
+    def __init__(self, path, codec, compression='gzip'):
+        self._codec = codec
+        self._file = gzip.open(path, 'wb') if compression == 'gzip' else open(path, 'wb')
+
+    def write(self, records):
+        self._file.write(b''.join(self._codec.dumps(record) + b'\n' for record in records))
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetWriter(object):
+    """Writes records to a Parquet file, one row group per batch. The fields of the job are typed columns, the
+    structured ones (``parameters``, ``report``...) and the unknown ones are stored as JSON strings."""
+
+    STRING_FIELDS = ('id', 'type', 'organization', 'workerId', 'workerDefinitionId', 'workerName', 'status',
+                     'dataType', 'data', 'message', 'createdBy', 'updatedBy')
+    INTEGER_FIELDS = ('tlp', 'pap', 'startDate', 'endDate', 'date', 'createdAt', 'updatedAt')
+    JSON_FIELDS = ('parameters', 'attachment', 'report', 'artifacts', 'extra')
+
+    def __init__(self, path, codec, compression='snappy'):
+        # pyarrow is an optional dependency, only needed by this format
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError('The parquet format requires the pyarrow package. Install it with: pip install pyarrow')
+
+        self._pyarrow = pyarrow
+        self._codec = codec
+        self._known = set(self.STRING_FIELDS + self.INTEGER_FIELDS + self.JSON_FIELDS)
+        self._schema = pyarrow.schema([(name, pyarrow.string()) for name in self.STRING_FIELDS] +
+                                      [(name, pyarrow.int64()) for name in self.INTEGER_FIELDS] +
+                                      [(name, pyarrow.string()) for name in self.JSON_FIELDS])
+        self._writer = pyarrow.parquet.ParquetWriter(path, self._schema, compression=compression or 'none')
+
+    def _json(self, value):
+        return self._codec.dumps(value).decode('utf-8') if value is not None else None
+
+    def write(self, records):
+        columns = {}
+        for name in self.STRING_FIELDS + self.INTEGER_FIELDS:
+            columns[name] = [record.get(name, None) for record in records]
+        for name in self.JSON_FIELDS[:-1]:
+            columns[name] = [self._json(record.get(name, None)) for record in records]
+        columns['extra'] = [self._json(dict((k, v) for k, v in record.items() if k not in self._known) or None)
+                            for record in records]
+
+        self._writer.write_table(self._pyarrow.Table.from_pydict(columns, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+
+WRITERS = {
+    'jsonl': JsonlWriter,
+    'parquet': ParquetWriter
+}
+
+
+class ExportResult(OperationResult):
+    """Outcome of an export: the ``files`` written, the number of ``records``, and the jobs whose report or artifacts
+    could not be fetched (``failed``, job id to error message). These jobs are exported without them."""
+    def __init__(self):
+        super().__init__()
+        self.files = []
+        self.records = 0
+        self.failed = {}
+
+    def _processed(self):
+        return self.records
+
+    def _counters(self):
+        return {
+            'files': len(self.files),
+            'records': self.records,
+            'failed': len(self.failed)
+        }
+
+
+class JobExporter(object):
+    """Exports the jobs matching a query, with their reports and artifacts when requested, to JSONL or Parquet files.
+
+    Jobs are processed ``batch_size`` at a time: the reports and artifacts of a batch are fetched over ``max_workers``
+    threads, then the batch is written and released, so the memory used does not depend on the number of jobs. The
+    batches are searched from the ``sort`` field value of the last job exported, excluding the jobs already exported
+    with that value, rather than by offset, so that each search costs the same however deep the export goes. A new
+    file is started every ``max_records`` records: ``path`` may contain an ``{index}`` field, otherwise the file number
+    is added before its extension. Files are written under a ``.part`` name and renamed once complete."""
+
+    def __init__(self, api, path, query=None, **kwargs):
+        self._api = api
+        self._path = path
+        self._query = query or {}
+        self._format = kwargs.get('format', 'jsonl')
+        self._compression = kwargs.get('compression', 'gzip' if self._format == 'jsonl' else 'snappy')
+        self._reports = kwargs.get('reports', False)
+        self._artifacts = kwargs.get('artifacts', False)
+        self._max_workers = kwargs.get('max_workers', 8)
+        self._batch_size = kwargs.get('batch_size', 500)
+        self._max_records = kwargs.get('max_records', 1000000)
+        self._sort = kwargs.get('sort', '+createdAt')
+        self._callback = kwargs.get('callback', None)
+
+        if self._format not in WRITERS:
+            raise ValueError('Unknown export format {}, expected one of {}'.format(self._format, ', '.join(WRITERS)))
+        if ',' in self._sort:
+            raise ValueError('Jobs can only be exported in the order of a single field, got {}'.format(self._sort))
+
+    def _file_path(self, index):
+        if '{index' in self._path:
+            return self._path.format(index=index)
+
+        directory, name = os.path.split(self._path)
+        base, dot, extension = name.partition('.')
+        return os.path.join(directory, '{}-{:05d}{}{}'.format(base, index, dot, extension))
+
+    def _record(self, job, result):
+        record = job.json()
+        try:
+            if self._reports and job.status in ('Success', 'Failure'):
+                record['report'] = self._api.jobs.get_report(job.id).json().get('report', None)
+            if self._artifacts and job.status == 'Success':
+                record['artifacts'] = [artifact.json() for artifact in self._api.jobs.get_artifacts(job.id)]
+        except Exception as ex:
+            result.failed[job.id] = str(ex)
+
+        return record
+
+    def _batches(self):
+        field = self._sort.lstrip('+-')
+        bound = Lte if self._sort.startswith('-') else Gte
+        # Value of the field for the last job exported, and ids of the jobs exported with that value
+        last, seen = None, []
+
+        while True:
+            criteria = [self._query, Contains(field)]
+            if last is not None:
+                criteria.append(bound(field, last))
+                criteria.append(Not(Or(*[Id(job_id) for job_id in seen])))
+
+            batch = self._api.jobs.find_all(And(*criteria), range='0-{}'.format(self._batch_size), sort=self._sort)
+            for job in batch:
+                value = getattr(job, field)
+                if value != last:
+                    last, seen = value, []
+                seen.append(job.id)
+
+            if len(batch) > 0:
+                yield batch
+            if len(batch) < self._batch_size:
+                break
+
+    @staticmethod
+    def _complete(writer, path):
+        writer.close()
+        os.replace('{}.part'.format(path), path)
+
+    def run(self) -> ExportResult:
+        result = ExportResult()
+        started = time.monotonic()
+        writer = None
+        file_records = 0
+
+        executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        try:
+            for batch in self._batches():
+                if self._reports or self._artifacts:
+                    records = list(executor.map(lambda job: self._record(job, result), batch))
+                else:
+                    records = [job.json() for job in batch]
+
+                while len(records) > 0:
+                    if writer is None:
+                        path = self._file_path(len(result.files))
+                        writer = WRITERS[self._format]('{}.part'.format(path), self._api.json_codec,
+                                                       self._compression)
+                        result.files.append(path)
+                        file_records = 0
+
+                    count = min(len(records), self._max_records - file_records)
+                    writer.write(records[:count])
+                    records = records[count:]
+                    file_records += count
+                    result.records += count
+
+                    if file_records >= self._max_records:
+                        self._complete(writer, result.files[-1])
+                        writer = None
+
+                result.elapsed = time.monotonic() - started
+                if self._callback is not None:
+                    self._callback(result)
+
+            if writer is not None:
+                self._complete(writer, result.files[-1])
+                writer = None
+        finally:
+            executor.shutdown(wait=False)
+            # An interrupted export leaves its last file under the .part name
+            if writer is not None:
+                writer.close()
+
+        result.elapsed = time.monotonic() - started
+
+        return result
@@ -0,0 +1,210 @@
+import threading
+
+from collections import Counter
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Segments of the Cortex API paths, the other ones are ids. The id of the worker is kept for the runs, so that the
+# calls to each analyzer and responder are measured separately
+_PATH_WORDS = frozenset(['analyzer', 'responder', 'organization', 'user', 'job', 'status', 'type', 'definitions',
+                         'run', 'report', 'waitreport', 'artifacts', 'password', 'set', 'change', 'key', 'renew'])
+
+
+def endpoint_template(endpoint):
+    """Returns ``endpoint`` without its query string and with its ids replaced by ``{id}``, such as
+    ``job/{id}/waitreport``."""
+    segments = endpoint.split('?', 1)[0].strip('/').split('/')
+    for index, segment in enumerate(segments):
+        worker_run = index == 1 and segments[0] in ('analyzer', 'responder') and segments[2:3] == ['run']
+        if index > 0 and not worker_run and segment not in _PATH_WORDS and not segment.startswith('_'):
+            segments[index] = '{id}'
+    return '/'.join(segments)
+
+
+def body_size(data):
+    if data is None:
+        return 0
+    try:
+        return len(data)
+    except TypeError:
+        return None
+
+
+class RequestInfo(object):
+    """A call to Cortex, as seen by the hooks: ``attempt`` is 0 for the first attempt of a call and is increased by
+    its retries and failovers. ``status`` (the HTTP status) or ``error`` (the exception raised), ``elapsed`` (in
+    seconds, up to the reception of the response headers) and ``bytes_received`` are set after the request."""
+    __slots__ = ('method', 'endpoint', 'url', 'attempt', 'bytes_sent', 'status', 'error', 'elapsed', 'bytes_received')
+
+    def __init__(self, method, endpoint, url, attempt=0, bytes_sent=None):
+        self.method = method
+        self.endpoint = endpoint
+        self.url = url
+        self.attempt = attempt
+        self.bytes_sent = bytes_sent
+        self.status = None
+        self.error = None
+        self.elapsed = None
+        self.bytes_received = None
+
+    @property
+    def template(self):
+        return endpoint_template(self.endpoint)
+
+
+class Hook(object):
+    """Base class of the objects given to the ``hooks`` option of ``Api`` and ``AsyncApi``. ``before_request`` and
+    ``after_request`` are called around every HTTP request, including the retries, from the calling thread or task.
+    They must be quick and must not raise."""
+
+    def before_request(self, info):
+        pass
+
+    def after_request(self, info):
+        pass
+
+
+class Histogram(object):
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        index = 0
+        while index < len(self.buckets) and value > self.buckets[index]:
+            index += 1
+        self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Estimates the ``q`` quantile, as the upper bound of the bucket that contains it."""
+        if self.count == 0:
+            return None
+
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+
+def _labels(**labels):
+    return '{' + ','.join('{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"')
+                                                  .replace('\n', '\\n'))
+                          for name, value in labels.items()) + '}'
+
+
+def _number(value):
+    return '+Inf' if value == float('inf') else repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsCollector(Hook):
+    """Hook keeping, in memory, the metrics of the calls by method and endpoint template: number of calls by status
+    (or exception), latency histogram, bytes sent and received and number of retries, along with the number of calls
+    in flight. ``prometheus()`` dumps them in the Prometheus text format."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, prefix='cortex4py'):
+        self.buckets = tuple(buckets)
+        self.prefix = prefix
+
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.in_flight = 0
+            self.requests = Counter()
+            self.retries = Counter()
+            self.bytes_sent = Counter()
+            self.bytes_received = Counter()
+            self.latency = {}
+
+    def before_request(self, info):
+        with self._lock:
+            self.in_flight += 1
+
+    def after_request(self, info):
+        key = (info.method, info.template)
+        outcome = str(info.status) if info.status is not None else type(info.error).__name__
+        with self._lock:
+            self.in_flight -= 1
+            self.requests[key + (outcome,)] += 1
+            if info.attempt > 0:
+                self.retries[key] += 1
+            self.bytes_sent[key] += info.bytes_sent or 0
+            self.bytes_received[key] += info.bytes_received or 0
+            if info.elapsed is not None:
+                histogram = self.latency.get(key, None)
+                if histogram is None:
+                    histogram = self.latency[key] = Histogram(self.buckets)
+                histogram.observe(info.elapsed)
+
+    @property
+    def stats(self):
+        """Summary by ``METHOD endpoint``: number of calls, errors (status >= 500 or exceptions), retries, average,
+        median and 99th percentile latencies, and bytes sent and received."""
+        with self._lock:
+            stats = {}
+            for key, histogram in self.latency.items():
+                errors = sum(count for (method, endpoint, outcome), count in self.requests.items()
+                             if (method, endpoint) == key and not (outcome.isdigit() and int(outcome) < 500))
+                stats['{} {}'.format(*key)] = {
+                    'calls': histogram.count,
+                    'errors': errors,
+                    'retries': self.retries[key],
+                    'avg': histogram.sum / histogram.count,
+                    'p50': histogram.quantile(0.5),
+                    'p99': histogram.quantile(0.99),
+                    'bytes_sent': self.bytes_sent[key],
+                    'bytes_received': self.bytes_received[key]
+                }
+            return stats
+
+    def slowest(self, count=10):
+        """Returns the ``count`` endpoints with the highest total time spent, with their stats."""
+        stats = self.stats
+        return sorted(stats.items(), key=lambda item: item[1]['avg'] * item[1]['calls'], reverse=True)[:count]
+
+    def prometheus(self):
+        """Returns the metrics in the Prometheus text exposition format."""
+        prefix = self.prefix
+        lines = []
+
+        def header(name, kind, description):
+            lines.append('# HELP {}_{} {}'.format(prefix, name, description))
+            lines.append('# TYPE {}_{} {}'.format(prefix, name, kind))
+
+        with self._lock:
+            header('requests_total', 'counter', 'Requests sent to Cortex, by status or exception.')
+            for (method, endpoint, outcome), count in sorted(self.requests.items()):
+                lines.append('{}_requests_total{} {}'.format(
+                    prefix, _labels(method=method, endpoint=endpoint, status=outcome), count))
+
+            header('request_duration_seconds', 'histogram', 'Time until the response headers are received.')
+            for (method, endpoint), histogram in sorted(self.latency.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float('inf'),), histogram.counts):
+                    cumulative += count
+                    lines.append('{}_request_duration_seconds_bucket{} {}'.format(
+                        prefix, _labels(method=method, endpoint=endpoint, le=_number(bound)), cumulative))
+                labels = _labels(method=method, endpoint=endpoint)
+                lines.append('{}_request_duration_seconds_sum{} {}'.format(prefix, labels, _number(histogram.sum)))
+                lines.append('{}_request_duration_seconds_count{} {}'.format(prefix, labels, histogram.count))
+
+            for name, counter, description in (('request_retries_total', self.retries, 'Retried requests.'),
+                                               ('request_sent_bytes_total', self.bytes_sent, 'Request body bytes.'),
+                                               ('response_received_bytes_total', self.bytes_received,
+                                                'Response body bytes.')):
+                header(name, 'counter', description)
+                for (method, endpoint), count in sorted(counter.items()):
+                    lines.append('{}_{}{} {}'.format(prefix, name, _labels(method=method, endpoint=endpoint), count))
+
+            header('requests_in_flight', 'gauge', 'Requests waiting for their response.')
+            lines.append('{}_requests_in_flight {}'.format(prefix, self.in_flight))
+
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,70 @@
+import hashlib
+import threading
+
+from collections import OrderedDict
+
+# libmagic does not look further than the first MiB of a file
+SAMPLE_SIZE = 1024 * 1024
+
+_magic = None
+_magic_lock = threading.Lock()
+
+
+def _libmagic():
+    """Loads libmagic on first use, so that importing cortex4py does not pay for it."""
+    global _magic
+
+    if _magic is None:
+        with _magic_lock:
+            if _magic is None:
+                import magic
+                _magic = magic.Magic(mime=True)
+
+    return _magic
+
+
+def read_sample(content, size=SAMPLE_SIZE):
+    """Returns the first ``size`` bytes of ``content``, which can be a path, a bytes-like object or a binary file
+    object. The position of file objects is restored."""
+    if isinstance(content, str):
+        with open(content, 'rb') as file_obj:
+            return file_obj.read(size)
+    elif isinstance(content, (bytes, bytearray, memoryview)):
+        return memoryview(content).cast('B')[:size].tobytes()
+    else:
+        position = content.tell()
+        sample = content.read(size)
+        content.seek(position)
+        return sample
+
+
+class MimeDetector(object):
+    """Detects the MIME type of the submitted files with libmagic, through a single shared detector, and caches the
+    results by content hash. ``hook``, when set, is called first with the content sample and can return a MIME type,
+    or ``None`` to fall back to libmagic."""
+
+    def __init__(self, hook=None, cache_size=1024):
+        self.hook = hook
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def detect(self, content):
+        sample = read_sample(content)
+        key = hashlib.sha256(sample).digest()
+
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        mime_type = self.hook(sample) if self.hook is not None else None
+        if mime_type is None:
+            mime_type = _libmagic().from_buffer(sample)
+
+        with self._lock:
+            self._cache[key] = mime_type
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return mime_type
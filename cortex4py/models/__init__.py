@@ -1,3 +1,4 @@
+from .model import Model, ModelList
 from .organization import Organization
 from .user import User
 from .analyzer import Analyzer
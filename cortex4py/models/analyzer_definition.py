@@ -2,6 +2,7 @@ from .model import Model
 
 
 class AnalyzerDefinition(Model):
+    __slots__ = ()
 
     def __init__(self, data):
         defaults = {
@@ -20,4 +21,4 @@ class AnalyzerDefinition(Model):
         if data is None:
             data = dict(defaults)
 
-        self.__dict__ = {k: v for k, v in data.items() if not k.startswith('_')}
\ No newline at end of file
+        self._set(data)
\ No newline at end of file
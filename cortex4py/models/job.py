@@ -2,6 +2,9 @@ from .model import Model
 
 
 class Job(Model):
+    __slots__ = ()
+
+    _lazy = ('parameters', 'report')
 
     def __init__(self, data):
         defaults = {
@@ -25,4 +28,4 @@ class Job(Model):
         if data is None:
             data = dict(defaults)
 
-        self.__dict__ = {k: v for k, v in data.items() if not k.startswith('_')}
+        self._set(data)
@@ -1,9 +1,143 @@
-import json
+from collections.abc import Sequence
+
+from ..codec import get_codec
 
 
 class Model(object):
+    """Base of the models, exposing the fields of a Cortex object as attributes.
+
+    The fields are kept in a single dict held in a slot, instead of an instance ``__dict__``. The fields listed in
+    ``_lazy`` may be received as JSON strings: they are only decoded when first accessed, or by ``json()``, with the
+    codec of the ``Api`` that received them."""
+
+    __slots__ = ('_data', '_codec')
+
+    _lazy = ()
+
+    def _set(self, data):
+        self._data = {k: v for k, v in data.items() if not k.startswith('_')}
+        self._codec = None
+
+    @classmethod
+    def _from_response(cls, data, codec=None):
+        """Builds a model around ``data``, a dict decoded from a response, only copied to drop its ``_`` fields."""
+        if any(k.startswith('_') for k in data):
+            # A new dict is smaller than the original one with its keys deleted
+            data = {k: v for k, v in data.items() if not k.startswith('_')}
+
+        model = cls.__new__(cls)
+        model._data = data
+        model._codec = codec
+        return model
+
+    def _json_codec(self):
+        return getattr(self, '_codec', None) or get_codec()
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        try:
+            value = self._data[name]
+        except KeyError:
+            raise AttributeError(name)
+
+        if name in self._lazy:
+            value = self._decode(name, value)
+
+        return value
+
+    def _decode(self, name, value):
+        if isinstance(value, str):
+            try:
+                value = self._data[name] = self._json_codec().loads(value)
+            except ValueError:
+                pass
+        return value
+
+    def __setattr__(self, name, value):
+        if name.startswith('_'):
+            object.__setattr__(self, name, value)
+        else:
+            self._data[name] = value
+
+    def __delattr__(self, name):
+        if name.startswith('_'):
+            object.__delattr__(self, name)
+        elif name in self._data:
+            del self._data[name]
+        else:
+            raise AttributeError(name)
+
+    def __dir__(self):
+        return sorted(set(super(Model, self).__dir__()) | set(self._data))
+
+    @property
+    def __dict__(self):
+        return self._data
+
     def __str__(self):
-        return json.dumps(self.__dict__, indent=2)
+        return self._json_codec().pretty(self.json())
 
     def json(self):
-        return self.__dict__
+        """Returns the fields of the model, with the ``_lazy`` ones decoded."""
+        for name in self._lazy:
+            if name in self._data:
+                self._decode(name, self._data[name])
+        return self._data
+
+
+class ModelList(Sequence):
+    """Read-only sequence of models, built when they are first accessed.
+
+    The items of the response are compacted into tuples of values sharing their tuple of field names, which takes a
+    fraction of the memory of a dict per item. A model replaces its row once built, so that later accesses return the
+    same object, with its changes. The sequence compares equal to a list of the same models."""
+
+    __slots__ = ('_rows', '_cls', '_codec')
+
+    def __init__(self, items, cls, codec=None):
+        # The items are replaced one at a time, so that the original dicts are freed as the rows are built
+        shapes = {}
+        for index, item in enumerate(items):
+            if isinstance(item, dict):
+                fields = tuple(k for k in item if not k.startswith('_'))
+                fields = shapes.setdefault(fields, fields)
+                items[index] = (fields,) + tuple(item[k] for k in fields)
+
+        self._rows = items
+        self._cls = cls
+        self._codec = codec
+
+    def _build(self, index):
+        row = self._rows[index]
+        if isinstance(row, tuple):
+            model = self._cls.__new__(self._cls)
+            model._data = dict(zip(row[0], row[1:]))
+            model._codec = self._codec
+            self._rows[index] = row = model
+        return row
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._build(i) for i in range(*index.indices(len(self._rows)))]
+
+        return self._build(index)
+
+    def __iter__(self):
+        for index in range(len(self._rows)):
+            yield self._build(index)
+
+    def __eq__(self, other):
+        if not isinstance(other, (ModelList, list)):
+            return NotImplemented
+        if len(self) != len(other):
+            return False
+        return all(a is b or (isinstance(a, Model) and type(a) is type(b) and a.json() == b.json()) or a == b
+                   for a, b in zip(self, other))
+
+    def __repr__(self):
+        return '<{} of {} {}>'.format(self.__class__.__name__, len(self._rows), self._cls.__name__)
@@ -2,6 +2,7 @@ from .model import Model
 
 
 class User(Model):
+    __slots__ = ()
 
     def __init__(self, data):
         defaults = {
@@ -16,4 +17,4 @@ class User(Model):
         if data is None:
             data = dict(defaults)
 
-        self.__dict__ = {k: v for k, v in data.items() if not k.startswith('_')}
+        self._set(data)
@@ -0,0 +1,150 @@
+import io
+import os
+import uuid
+
+
+class _BufferReader(object):
+    """Reads a bytes-like object chunk by chunk, without copying it as a whole."""
+    def __init__(self, buffer):
+        self._view = memoryview(buffer).cast('B')
+        self._offset = 0
+
+    def __len__(self):
+        return self._view.nbytes
+
+    def read(self, size=-1):
+        end = len(self._view) if size is None or size < 0 else self._offset + size
+        chunk = self._view[self._offset:end].tobytes()
+        self._offset += len(chunk)
+        return chunk
+
+
+class MultipartEncoder(object):
+    """Streaming ``multipart/form-data`` body.
+
+    It behaves as a read-only file object of known length, so that ``requests`` sends it chunk by chunk instead of
+    building the whole body in memory. ``fields`` is a list of ``(name, value)`` tuples, where ``value`` is either a
+    string or a ``(filename, content, content_type)`` tuple. ``content`` can be a path, a binary file object, ``bytes``
+    or a ``memoryview``. The files opened from a path are closed once read, or by ``close()``; file objects given by
+    the caller are left open.
+
+    ``callback``, when set, is called with the number of bytes sent so far and the total size of the body."""
+
+    def __init__(self, fields, boundary=None, chunk_size=65536, callback=None):
+        self.boundary = boundary or uuid.uuid4().hex
+        self.chunk_size = chunk_size
+        self.callback = callback
+
+        self._parts = []
+        self._opened = []
+        self._length = 0
+        self._position = 0
+        self._current = None
+        self._remaining = 0
+
+        for name, value in fields:
+            if isinstance(value, tuple):
+                filename, content, content_type = value
+                header = self._header(name, filename, content_type)
+                stream, size = self._open(content)
+                self._add(io.BytesIO(header), len(header))
+                self._add(stream, size)
+                self._add(io.BytesIO(b'\r\n'), 2)
+            else:
+                part = self._header(name) + str(value).encode('utf-8') + b'\r\n'
+                self._add(io.BytesIO(part), len(part))
+
+        footer = '--{}--\r\n'.format(self.boundary).encode('utf-8')
+        self._add(io.BytesIO(footer), len(footer))
+        self._parts = iter(self._parts)
+
+    @property
+    def content_type(self):
+        return 'multipart/form-data; boundary={}'.format(self.boundary)
+
+    def _header(self, name, filename=None, content_type=None):
+        header = '--{}\r\nContent-Disposition: form-data; name="{}"'.format(self.boundary, name)
+        if filename is not None:
+            header += '; filename="{}"'.format(filename.replace('"', '%22'))
+        if content_type is not None:
+            header += '\r\nContent-Type: {}'.format(content_type)
+
+        return (header + '\r\n\r\n').encode('utf-8')
+
+    def _open(self, content):
+        if isinstance(content, str):
+            stream = open(content, 'rb')
+            self._opened.append(stream)
+            return stream, os.fstat(stream.fileno()).st_size
+        elif isinstance(content, (bytes, bytearray, memoryview)):
+            reader = _BufferReader(content)
+            return reader, len(reader)
+        else:
+            position = content.tell()
+            size = content.seek(0, os.SEEK_END) - position
+            content.seek(position)
+            return content, size
+
+    def _add(self, stream, size):
+        self._parts.append((stream, size))
+        self._length += size
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self._length - self._position
+
+        chunks = []
+        wanted = size
+        while wanted > 0:
+            if self._current is None:
+                self._current = next(self._parts, None)
+                if self._current is None:
+                    break
+                self._remaining = self._current[1]
+
+            stream = self._current[0]
+            chunk = stream.read(min(wanted, self._remaining, self.chunk_size))
+            if not chunk:
+                self._release(stream)
+                self._current = None
+                continue
+
+            chunks.append(chunk)
+            wanted -= len(chunk)
+            self._remaining -= len(chunk)
+            if self._remaining <= 0:
+                self._release(stream)
+                self._current = None
+
+        data = b''.join(chunks)
+        self._position += len(data)
+        if self.callback is not None and len(data) > 0:
+            self.callback(self._position, self._length)
+
+        return data
+
+    def _release(self, stream):
+        if stream in self._opened:
+            stream.close()
+            self._opened.remove(stream)
+
+    def close(self):
+        for stream in self._opened:
+            stream.close()
+        self._opened = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
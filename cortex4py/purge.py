@@ -0,0 +1,148 @@
+import json
+import os
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from cortex4py.query import *
+from .exceptions import NotFoundError
+from .ratelimit import RateLimiter
+from .result import OperationResult
+
+
+class PurgeResult(OperationResult):
+    """Progress of a purge: number of jobs ``matched`` by the query, ``deleted`` jobs, and ``failed`` deletions (job id
+    to error message). ``completed`` is set once no job is left to delete."""
+    def __init__(self, query=None):
+        super().__init__()
+        self.query = query
+        self.matched = 0
+        self.deleted = 0
+        self.failed = {}
+        self.completed = False
+
+    def _processed(self):
+        return self.deleted
+
+    def _counters(self):
+        return {
+            'matched': self.matched,
+            'deleted': self.deleted,
+            'failed': len(self.failed)
+        }
+
+    def save(self, path):
+        # Write to a temporary file first, so that an interruption never leaves a truncated checkpoint
+        temp_path = '{}.tmp'.format(path)
+        with open(temp_path, 'w') as file_obj:
+            json.dump({
+                'query': self.query,
+                'matched': self.matched,
+                'deleted': self.deleted,
+                'failed': self.failed,
+                'elapsed': self.elapsed
+            }, file_obj)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def load(path, query):
+        """Returns the progress saved in the checkpoint file ``path``, if it exists and belongs to a purge of
+        ``query``."""
+        result = PurgeResult(query)
+        if path is None or not os.path.exists(path):
+            return result
+
+        with open(path) as file_obj:
+            saved = json.load(file_obj)
+
+        if json.dumps(saved.get('query'), sort_keys=True) != json.dumps(query, sort_keys=True):
+            return result
+
+        result.matched = saved.get('matched', 0)
+        result.deleted = saved.get('deleted', 0)
+        result.failed = saved.get('failed', {})
+        result.elapsed = saved.get('elapsed', 0.0)
+        return result
+
+
+class JobPurge(object):
+    """Deletes all the jobs matching a query, ``page_size`` jobs at a time, over ``max_workers`` threads.
+
+    Every page is fetched from the start of the (oldest first) search results, excluding the jobs already deleted and
+    the ones that failed to be deleted, so that the deletions never shift the pages. Deletions are limited to ``rate``
+    per second when set, and the purge stops once more than ``max_failures`` deletions have failed.
+
+    With ``checkpoint``, the progress is saved to that file after every page, and a purge of the same query started
+    later resumes from it. The file is removed once the purge is completed."""
+
+    SORT = '+createdAt'
+
+    def __init__(self, api, query, **kwargs):
+        self._api = api
+        self._query = query or {}
+        self._max_workers = kwargs.get('max_workers', 8)
+        self._page_size = kwargs.get('page_size', 500)
+        self._rate = kwargs.get('rate', None)
+        self._max_failures = kwargs.get('max_failures', 100)
+        self._checkpoint = kwargs.get('checkpoint', None)
+        self._callback = kwargs.get('callback', None)
+        self._limiter = RateLimiter(burst=self._max_workers) if self._rate else None
+
+    def _search(self, result):
+        criteria = [self._query, Not(Eq('status', 'Deleted'))]
+        if len(result.failed) > 0:
+            criteria.append(Not(Or(*[Id(job_id) for job_id in result.failed])))
+
+        return And(*criteria)
+
+    def _delete(self, job_id):
+        if self._limiter is not None:
+            self._limiter.acquire('purge', self._rate, 'Second')
+
+        try:
+            self._api.jobs.delete(job_id)
+        except NotFoundError:
+            # Already deleted
+            pass
+
+    def dry_run(self) -> PurgeResult:
+        """Counts the jobs that would be deleted, without deleting them."""
+        result = PurgeResult(self._query)
+        started = time.monotonic()
+        result.matched = self._api.jobs._count(self._search(result))
+        result.elapsed = time.monotonic() - started
+
+        return result
+
+    def run(self) -> PurgeResult:
+        result = PurgeResult.load(self._checkpoint, self._query)
+        started = time.monotonic() - result.elapsed
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            while len(result.failed) <= self._max_failures:
+                page = self._api.jobs.find_all(self._search(result), range='0-{}'.format(self._page_size),
+                                               sort=self.SORT)
+                job_ids = [job.id for job in page]
+                result.matched += len(job_ids)
+
+                futures = [executor.submit(self._delete, job_id) for job_id in job_ids]
+                for job_id, future in zip(job_ids, futures):
+                    error = future.exception()
+                    if error is None:
+                        result.deleted += 1
+                    else:
+                        result.failed[job_id] = str(error)
+
+                result.elapsed = time.monotonic() - started
+                result.completed = len(job_ids) < self._page_size
+                if self._checkpoint is not None and not result.completed:
+                    result.save(self._checkpoint)
+                if self._callback is not None:
+                    self._callback(result)
+                if result.completed:
+                    break
+
+        if result.completed and self._checkpoint is not None and os.path.exists(self._checkpoint):
+            os.remove(self._checkpoint)
+
+        return result
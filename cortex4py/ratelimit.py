@@ -0,0 +1,102 @@
+import sqlite3
+import threading
+import time
+
+from .exceptions import RateLimitError
+from .deadline import current_deadline
+
+
+class RateLimiter(object):
+    """Token bucket scheduler keeping the job submissions of every worker within its ``rate`` per ``rateUnit`` quota.
+
+    Each worker gets a bucket of ``burst`` tokens (the whole quota by default), refilled continuously at
+    ``rate / rateUnit``. Submissions reserve a token and wait until it is available, so concurrent callers are served
+    in order and spread over time. A reservation that would wait for more than ``max_wait`` seconds raises a
+    ``RateLimitError`` instead.
+
+    The buckets are kept in memory and shared by the threads of the process. With ``path``, they are stored in a
+    SQLite database so that several processes of the same host share the same quotas."""
+
+    UNITS = {
+        'Second': 1,
+        'Minute': 60,
+        'Hour': 3600,
+        'Day': 86400,
+        'Month': 30 * 86400
+    }
+
+    def __init__(self, burst=None, max_wait=None, path=None):
+        self.burst = burst
+        self.max_wait = max_wait
+
+        self._lock = threading.Lock()
+        self._buckets = {}
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+            self._db.execute('CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL, updated REAL)')
+
+    def _load(self, key):
+        if self._db is None:
+            return self._buckets.get(key, None)
+
+        return self._db.execute('SELECT tokens, updated FROM buckets WHERE key = ?', (key,)).fetchone()
+
+    def _store(self, key, tokens, updated):
+        if self._db is None:
+            self._buckets[key] = (tokens, updated)
+        else:
+            self._db.execute('INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)',
+                             (key, tokens, updated))
+
+    def reserve(self, key, rate, rate_unit):
+        """Takes a token from the bucket of ``key`` and returns the number of seconds to wait before using it."""
+        if not rate or rate_unit not in self.UNITS:
+            return 0.0
+
+        capacity = float(min(self.burst, rate) if self.burst else rate)
+        refill = float(rate) / self.UNITS[rate_unit]
+
+        # Never wait past the deadline of the current operation
+        max_wait = self.max_wait
+        active_deadline = current_deadline()
+        if active_deadline is not None:
+            max_wait = min(max_wait, active_deadline.remaining()) if max_wait is not None \
+                else active_deadline.remaining()
+
+        with self._lock:
+            if self._db is not None:
+                self._db.execute('BEGIN IMMEDIATE')
+            try:
+                now = time.time()
+                state = self._load(key)
+                tokens, updated = state if state is not None else (capacity, now)
+                tokens = min(capacity, tokens + (now - updated) * refill)
+
+                wait = 0.0 if tokens >= 1 else (1 - tokens) / refill
+                if max_wait is not None and wait > max_wait:
+                    raise RateLimitError('Rate limit of {} per {} reached for {}'.format(rate, rate_unit, key))
+
+                self._store(key, tokens - 1, now)
+            finally:
+                if self._db is not None:
+                    self._db.execute('COMMIT')
+
+        return wait
+
+    def acquire(self, key, rate, rate_unit):
+        """Blocks until a submission is allowed for ``key``."""
+        wait = self.reserve(key, rate, rate_unit)
+        if wait > 0:
+            time.sleep(wait)
+
+    def reset(self, key=None):
+        with self._lock:
+            if key is None:
+                self._buckets.clear()
+                if self._db is not None:
+                    self._db.execute('DELETE FROM buckets')
+            else:
+                self._buckets.pop(key, None)
+                if self._db is not None:
+                    self._db.execute('DELETE FROM buckets WHERE key = ?', (key,))
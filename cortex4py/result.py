@@ -0,0 +1,23 @@
+class OperationResult(object):
+    """Base class of the outcomes of the long running operations (bulk runs, purges, exports, replays). ``elapsed`` is
+    their duration in seconds. Subclasses return the number of units processed by ``_processed()``, on which the
+    ``throughput`` is based, and their own counters by ``_counters()``."""
+    def __init__(self):
+        self.elapsed = 0.0
+
+    def _processed(self):
+        raise NotImplementedError
+
+    def _counters(self):
+        return {}
+
+    @property
+    def throughput(self):
+        return self._processed() / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def stats(self):
+        stats = self._counters()
+        stats['elapsed'] = self.elapsed
+        stats['throughput'] = self.throughput
+        return stats
@@ -0,0 +1,97 @@
+import random
+import threading
+import time
+
+from collections import Counter
+from email.utils import parsedate_to_datetime
+
+
+class RetryPolicy(object):
+    """Decides whether a failed call must be retried, and how long to wait before the next attempt.
+
+    Calls are retried at most ``total`` times, with an exponential backoff of ``backoff_factor * 2 ** attempt``
+    seconds, capped to ``max_backoff``, and randomized when ``jitter`` is set. The ``Retry-After`` header of 429 and 503
+    responses is honored, unless it asks to wait for more than ``max_retry_after`` seconds.
+
+    Calls are only retried when that cannot submit the same job twice: idempotent methods, searches and statistics,
+    and responses telling that the request has not been processed (429 and 503). Other calls, such as analyzer runs,
+    are only retried on errors or on ``status_forcelist`` statuses when ``retry_non_idempotent`` is set."""
+
+    IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+    READ_ONLY_ENDPOINTS = ('_search', '_stats')
+    NOT_PROCESSED_STATUSES = frozenset([429, 503])
+
+    def __init__(self, total=3, backoff_factor=0.5, max_backoff=30, jitter=True,
+                 status_forcelist=(429, 502, 503, 504), max_retry_after=120, retry_non_idempotent=False):
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.status_forcelist = frozenset(status_forcelist)
+        self.max_retry_after = max_retry_after
+        self.retry_non_idempotent = retry_non_idempotent
+
+        self._lock = threading.Lock()
+        self._counters = Counter()
+
+    def is_idempotent(self, method, endpoint):
+        path = endpoint.split('?', 1)[0].rstrip('/')
+        return method.upper() in self.IDEMPOTENT_METHODS or path.split('/')[-1] in self.READ_ONLY_ENDPOINTS
+
+    @staticmethod
+    def retry_after(response):
+        """Returns the delay, in seconds, requested by the ``Retry-After`` header of ``response``, or ``None``."""
+        value = response.headers.get('Retry-After', None) if response is not None else None
+        if value is None:
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def should_retry(self, attempt, method, endpoint, status=None, exception=None, response=None):
+        if attempt >= self.total:
+            return False
+
+        if status is not None:
+            if status not in self.status_forcelist:
+                return False
+            if status in self.NOT_PROCESSED_STATUSES:
+                retry_after = self.retry_after(response)
+                return retry_after is None or retry_after <= self.max_retry_after
+
+        return self.retry_non_idempotent or self.is_idempotent(method, endpoint)
+
+    def delay(self, attempt, response=None):
+        retry_after = self.retry_after(response)
+        if retry_after is not None:
+            return retry_after
+
+        delay = min(self.backoff_factor * (2 ** attempt), self.max_backoff)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        return delay
+
+    def record(self, event, reason=None):
+        with self._lock:
+            self._counters[event] += 1
+            if reason is not None:
+                self._counters['{}.{}'.format(event, reason)] += 1
+
+    @property
+    def stats(self):
+        """Counters of the calls (``requests``), of the retries (``retries``, and ``retries.<reason>`` per status code or
+        exception) and of the calls that failed after having been retried (``exhausted``)."""
+        with self._lock:
+            return dict(self._counters)
+
+    def reset_stats(self):
+        with self._lock:
+            self._counters.clear()
@@ -0,0 +1,72 @@
+import asyncio
+import threading
+
+
+class _Call(object):
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """Coalesces concurrent identical calls: while a call for a given key is in flight, the other callers asking for
+    the same key wait for it and share its result (or its exception) instead of calling Cortex again."""
+
+    def __init__(self):
+        self.calls = 0
+        self.saved = 0
+
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    @property
+    def stats(self):
+        """Number of ``calls`` made to Cortex, and number of calls ``saved`` by sharing an in-flight one."""
+        return {
+            'calls': self.calls,
+            'saved': self.saved
+        }
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key, None)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.saved += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as ex:
+            call.error = ex
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+
+class AsyncSingleFlight(SingleFlight):
+    """Asyncio counterpart of ``SingleFlight``, coalescing the calls made from the same event loop."""
+
+    async def do(self, key, fn):
+        future = self._calls.get(key, None)
+        if future is not None:
+            self.saved += 1
+        else:
+            self.calls += 1
+            future = self._calls[key] = asyncio.ensure_future(fn())
+            future.add_done_callback(lambda _: self._calls.pop(key, None))
+
+        # A cancelled caller must not cancel the call shared with the others
+        return await asyncio.shield(future)
@@ -0,0 +1,94 @@
+def Count(name='count'):
+    return {'_agg': 'count', '_name': name}
+
+
+def Avg(field, name=None):
+    return {'_agg': 'avg', '_field': field, '_name': name or 'avg_{}'.format(field)}
+
+
+def Min(field, name=None):
+    return {'_agg': 'min', '_field': field, '_name': name or 'min_{}'.format(field)}
+
+
+def Max(field, name=None):
+    return {'_agg': 'max', '_field': field, '_name': name or 'max_{}'.format(field)}
+
+
+def Sum(field, name=None):
+    return {'_agg': 'sum', '_field': field, '_name': name or 'sum_{}'.format(field)}
+
+
+def GroupBy(field, *select, size=10, order=None, name=None):
+    """Groups by the ``size`` most frequent values of ``field`` (or sorted by ``order``, such as ``['-count']``), and
+    computes the ``select`` aggregations, a count by default, per value."""
+    agg = {'_agg': 'field', '_field': field, '_name': name or field, '_size': size,
+           '_select': list(select) or [Count()]}
+    if order is not None:
+        agg['_order'] = order
+    return agg
+
+
+def TimeHistogram(field, interval, *select, name=None):
+    """Groups by ``interval`` (such as ``1h``, ``1d``, ``1w`` or ``1M``) of the date ``field``, and computes the
+    ``select`` aggregations, a count by default, per interval."""
+    return {'_agg': 'time', '_fields': [field], '_interval': interval, '_name': name or field,
+            '_select': list(select) or [Count()]}
+
+
+def _time_key(key):
+    # Timestamps in milliseconds, unless the server formats the dates
+    return int(key) if isinstance(key, str) and key.isdigit() else key
+
+
+class StatsResult(dict):
+    """Results of a list of aggregations, by aggregation name, also readable as attributes: an ``int`` for ``Count``,
+    a number (``None`` without matching values) for ``Avg``, ``Min``, ``Max`` and ``Sum``, and ``Buckets`` for
+    ``GroupBy`` and ``TimeHistogram``."""
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    @staticmethod
+    def parse(aggs, data):
+        result = StatsResult()
+        data = data or {}
+        for agg in aggs:
+            name = agg['_name']
+            value = data.get(name, None)
+            if agg['_agg'] == 'count':
+                value = int(value or 0)
+            elif agg['_agg'] == 'field':
+                value = Buckets((key, StatsResult.parse(agg['_select'], sub)) for key, sub in (value or {}).items())
+            elif agg['_agg'] == 'time':
+                field = agg['_fields'][0]
+                # Buckets are keyed by the start of the interval, each holding the results per field
+                value = Buckets(sorted(((_time_key(key), StatsResult.parse(agg['_select'], (sub or {}).get(field, sub)))
+                                        for key, sub in (value or {}).items()), key=lambda bucket: bucket[0]))
+            result[name] = value
+
+        return result
+
+
+class Buckets(dict):
+    """Results of a ``GroupBy`` (by field value) or a ``TimeHistogram`` (by interval start timestamp, in
+    milliseconds and ascending order), each one a ``StatsResult``."""
+
+    def values_of(self, name):
+        """Returns the ``(key, value)`` pairs of the ``name`` aggregation across the buckets."""
+        return [(key, stats[name]) for key, stats in self.items()]
+
+
+def stats_payload(query, aggs):
+    if aggs is None:
+        aggs = [Count()]
+    elif isinstance(aggs, dict):
+        aggs = [aggs]
+
+    names = [agg['_name'] for agg in aggs]
+    if len(set(names)) < len(names):
+        raise ValueError('Aggregation names must be unique, got {}'.format(', '.join(names)))
+
+    return aggs, {'query': query or {}, 'stats': aggs}
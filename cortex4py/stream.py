@@ -0,0 +1,234 @@
+import re
+
+from contextlib import contextmanager
+
+from .codec import get_codec
+
+_WHITESPACE = re.compile(rb'\s*')
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_SCALAR = re.compile(rb'[^\s,\]}]+')
+# Moves past the strings and other characters up to the next bracket. Group 1: opening bracket, 2: closing bracket,
+# 3: truncated string, none: end of the buffer
+_STRUCTURE = re.compile(rb'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*(?:([\[{])|([\]}])|(")|\Z)', re.DOTALL)
+
+_QUOTE, _OPEN_OBJECT, _CLOSE_OBJECT, _OPEN_ARRAY, _CLOSE_ARRAY, _COMMA, _COLON = b'"{}[],:'
+
+_ALL = True
+_ITEMS = object()
+_MISSING = object()
+
+
+def _projection(fields, items):
+    """Builds the tree of the selected fields: a dict per object, ``_ALL`` for the fields decoded as a whole and
+    ``_ITEMS`` for the array whose items are emitted one at a time."""
+    if fields is None and items is None:
+        return _ALL
+
+    tree = {}
+    for path, leaf in [(field, _ALL) for field in fields or ()] + ([(items, _ITEMS)] if items is not None else []):
+        node = tree
+        keys = path.split('.')
+        for key in keys[:-1]:
+            child = node.get(key, None)
+            if child is _ALL:
+                break
+            if not isinstance(child, dict):
+                child = node[key] = {}
+            node = child
+        else:
+            node[keys[-1]] = leaf
+
+    return tree
+
+
+class JsonStreamParser(object):
+    """Incremental JSON parser, fed with the chunks of a response body as they are received.
+
+    Only the fields listed in ``fields`` (dotted paths such as ``report.summary`` or ``report.full.scans``) are decoded,
+    the others are skipped without being held in memory; the scalar fields of the top-level object are always kept.
+    When ``items`` is the path of an array, its items are decoded one at a time and returned by ``feed()`` and
+    ``close()`` instead of being kept in the document. Without ``fields`` nor ``items``, the whole document is decoded."""
+
+    def __init__(self, fields=None, items=None, codec=None):
+        self._codec = get_codec(codec)
+        self._tree = _projection(fields, items)
+        self._buffer = bytearray()
+        self._pos = 0
+        self._mark = None
+        self._need = 0
+        self._eof = False
+        self._items = []
+        self.document = None
+
+        self._parser = self._parse()
+        next(self._parser)
+
+    def feed(self, chunk):
+        """Parses ``chunk`` and returns the items of the ``items`` array completed by it."""
+        self._buffer += chunk
+        if self._parser is not None and len(self._buffer) - self._pos >= self._need:
+            self._resume()
+
+        items, self._items = self._items, []
+        return items
+
+    def close(self):
+        """Ends the body and returns the last items of the ``items`` array. The projected document is then available
+        as ``document``."""
+        self._eof = True
+        if self._parser is not None:
+            self._resume()
+
+        items, self._items = self._items, []
+        return items
+
+    def _resume(self):
+        try:
+            next(self._parser)
+        except StopIteration:
+            self._parser = None
+
+    def _more(self, need=1):
+        """Waits until ``need`` more bytes, past the current position, are available."""
+        if self._eof:
+            raise ValueError('Truncated JSON document')
+
+        cut = self._pos if self._mark is None else self._mark
+        if cut > 0:
+            del self._buffer[:cut]
+            self._pos -= cut
+            if self._mark is not None:
+                self._mark -= cut
+
+        self._need = need
+        while len(self._buffer) - self._pos < need and not self._eof:
+            yield
+
+    def _next_char(self):
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            yield from self._more()
+
+    def _expect(self, chars):
+        char = yield from self._next_char()
+        if char not in chars:
+            raise ValueError('Invalid JSON document at byte {}'.format(self._pos))
+        self._pos += 1
+        return char
+
+    def _token(self, pattern):
+        while True:
+            match = pattern.match(self._buffer, self._pos)
+            # A scalar ending with the buffer may continue in the next chunk
+            if match is not None and (pattern is _STRING or match.end() < len(self._buffer) or self._eof):
+                self._pos = match.end()
+                return match.start()
+            if match is None and pattern is _SCALAR:
+                raise ValueError('Invalid JSON document at byte {}'.format(self._pos))
+            # Wait for twice the pending data, so that long tokens are not scanned once per chunk
+            yield from self._more(2 * (len(self._buffer) - self._pos) + 1)
+
+    def _skip(self):
+        """Moves past the value at the current position."""
+        char = yield from self._next_char()
+        if char == _QUOTE:
+            yield from self._token(_STRING)
+            return
+        elif char not in (_OPEN_OBJECT, _OPEN_ARRAY):
+            yield from self._token(_SCALAR)
+            return
+
+        depth = 0
+        while True:
+            match = _STRUCTURE.match(self._buffer, self._pos)
+            group = match.lastindex
+            if group == 1:
+                depth += 1
+                self._pos = match.end()
+            elif group == 2:
+                depth -= 1
+                self._pos = match.end()
+                if depth == 0:
+                    return
+            else:
+                self._pos = match.start(3) if group == 3 else match.end()
+                yield from self._more(2 * (len(self._buffer) - self._pos) + 1)
+
+    def _decode(self):
+        yield from self._next_char()
+        # Keep the buffer from the start of the value until it is complete
+        self._mark = self._pos
+        try:
+            yield from self._skip()
+            return self._codec.loads(bytes(self._buffer[self._mark:self._pos]))
+        finally:
+            self._mark = None
+
+    def _value(self, tree, keep=False):
+        if tree is _ALL:
+            return (yield from self._decode())
+
+        char = yield from self._next_char()
+        if isinstance(tree, dict) and char == _OPEN_OBJECT:
+            return (yield from self._object(tree))
+        elif tree is _ITEMS and char == _OPEN_ARRAY:
+            yield from self._array()
+        elif keep and char not in (_OPEN_OBJECT, _OPEN_ARRAY):
+            return (yield from self._decode())
+        else:
+            yield from self._skip()
+
+        return _MISSING
+
+    def _object(self, tree, scalars=False):
+        yield from self._expect((_OPEN_OBJECT,))
+        document = {}
+        if (yield from self._next_char()) == _CLOSE_OBJECT:
+            self._pos += 1
+            return document
+
+        while True:
+            yield from self._next_char()
+            start = yield from self._token(_STRING)
+            key = self._codec.loads(bytes(self._buffer[start:self._pos]))
+            yield from self._expect((_COLON,))
+
+            value = yield from self._value(tree.get(key, None), scalars)
+            if value is not _MISSING:
+                document[key] = value
+
+            if (yield from self._expect((_COMMA, _CLOSE_OBJECT))) == _CLOSE_OBJECT:
+                return document
+
+    def _array(self):
+        yield from self._expect((_OPEN_ARRAY,))
+        if (yield from self._next_char()) == _CLOSE_ARRAY:
+            self._pos += 1
+            return
+
+        while True:
+            item = yield from self._decode()
+            self._items.append(item)
+            if (yield from self._expect((_COMMA, _CLOSE_ARRAY))) == _CLOSE_ARRAY:
+                return
+
+    def _parse(self):
+        yield
+        if isinstance(self._tree, dict):
+            self.document = yield from self._object(self._tree, scalars=True)
+        else:
+            self.document = yield from self._value(self._tree)
+
+
+@contextmanager
+def open_spool(spool):
+    """Opens ``spool``, a path or a binary file object, to copy a response body to. File objects are left open."""
+    if spool is None:
+        yield None
+    elif isinstance(spool, str):
+        with open(spool, 'wb') as file_obj:
+            yield file_obj
+    else:
+        yield spool
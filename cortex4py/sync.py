@@ -0,0 +1,90 @@
+import json
+
+from cortex4py.query import *
+
+
+class SyncCursor(object):
+    """Position of an incremental sync: the highest ``field`` value synced, and the ids of the jobs synced with a value
+    within ``overlap`` of it, so that they are not returned again. Persist it with ``dumps()`` and restore it with
+    ``SyncCursor.loads()``."""
+    def __init__(self, field='updatedAt', value=None, ids=None, overlap=0):
+        self.field = field
+        self.value = value
+        self.ids = dict(ids or {})
+        self.overlap = overlap
+
+    @property
+    def threshold(self):
+        return self.value - self.overlap if self.value is not None else None
+
+    def advance(self, job_id, value):
+        if self.value is None or value > self.value:
+            self.value = value
+        self.ids[job_id] = value
+
+    def prune(self):
+        threshold = self.threshold
+        self.ids = dict((job_id, value) for job_id, value in self.ids.items() if value >= threshold)
+
+    def dumps(self):
+        return json.dumps({
+            'field': self.field,
+            'value': self.value,
+            'ids': self.ids,
+            'overlap': self.overlap
+        })
+
+    @staticmethod
+    def loads(text):
+        data = json.loads(text)
+        return SyncCursor(data['field'], data['value'], data['ids'], data.get('overlap', 0))
+
+
+class JobSync(object):
+    """Iterates over the jobs created or changed since ``cursor``, in ascending order of the cursor field, and advances
+    the cursor as the jobs are returned.
+
+    Pages are fetched with a ``Gte`` range on the field, starting ``overlap`` milliseconds before the cursor value,
+    and exclude the jobs already returned with their current value in that window. Jobs sharing the same timestamp are
+    therefore neither skipped nor returned twice, even across pages and syncs, while a job changed again after it was
+    returned is returned once more. A non zero ``overlap`` also catches the jobs that become visible late, after the
+    sync went past their timestamp (Cortex, through Elasticsearch, makes the indexed documents searchable about one
+    second later)."""
+
+    def __init__(self, api, cursor=None, query=None, **kwargs):
+        if cursor is None:
+            cursor = SyncCursor(kwargs.get('field', 'updatedAt'), overlap=kwargs.get('overlap', 0))
+        elif isinstance(cursor, str):
+            cursor = SyncCursor.loads(cursor)
+
+        self._api = api
+        self._query = query
+        self._page_size = kwargs.get('page_size', 500)
+        self.cursor = cursor
+
+    def _search(self):
+        cursor = self.cursor
+        criteria = [Contains(cursor.field)]
+        if self._query:
+            criteria.append(self._query)
+        if cursor.value is not None:
+            criteria.append(Gte(cursor.field, cursor.threshold))
+        if len(cursor.ids) > 0:
+            # A job is excluded only while its value is the one it was synced with, so that a later change is returned
+            criteria.append(Not(Or(*[And(Id(job_id), Eq(cursor.field, value))
+                                     for job_id, value in cursor.ids.items()])))
+
+        return And(*criteria)
+
+    def __iter__(self):
+        field = self.cursor.field
+        while True:
+            page = self._api.jobs.find_all(self._search(), range='0-{}'.format(self._page_size),
+                                           sort='+{}'.format(field))
+            for job in page:
+                self.cursor.advance(job.id, getattr(job, field))
+                yield job
+
+            self.cursor.prune()
+            if len(page) < self._page_size:
+                break
@@ -0,0 +1,256 @@
+import base64
+import collections
+import gzip
+import hashlib
+import json
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .result import OperationResult
+
+# Response headers kept in the recordings, the others are dropped
+_HEADERS = ('Content-Type', 'Retry-After', 'Location')
+
+
+def _endpoint(url):
+    # The path after the /api/ prefix, so that the recordings do not depend on the node called
+    return url.split('/api/', 1)[-1]
+
+
+def _query(params):
+    return urlencode(sorted((k, v) for k, v in (params or {}).items() if v is not None))
+
+
+def _body_hash(data):
+    if data is None:
+        return ''
+    elif isinstance(data, bytes):
+        # JSON bodies are hashed in a canonical form, as their bytes depend on the JSON codec of the Api
+        try:
+            data = json.dumps(json.loads(data), sort_keys=True, separators=(',', ':')).encode('utf-8')
+        except ValueError:
+            pass
+        return hashlib.sha1(data).hexdigest()
+    # Streamed bodies, such as the files, are not read
+    return 'stream'
+
+
+def request_key(method, endpoint, query, body_hash):
+    return '{} {}?{} {}'.format(method, endpoint, query, body_hash)
+
+
+class Transport(object):
+    """Sends the requests of an ``Api`` through its pooled session. The ``transport`` option of ``Api`` takes another
+    object with the same ``request(session, method, url, **kwargs)`` method, returning a ``requests.Response``."""
+
+    def request(self, session, method, url, **kwargs):
+        return session.request(method, url, **kwargs)
+
+    def close(self):
+        pass
+
+
+class RecordingTransport(Transport):
+    """Sends the requests through ``transport`` (the pooled session by default) and appends them to ``path``, a gzip
+    compressed JSON lines file, with their responses, their latency and their time since the start of the recording.
+    The response bodies are read at once, including the streamed ones. Close the ``Api`` to complete the file."""
+
+    def __init__(self, path, transport=None):
+        self._transport = transport or Transport()
+        self._file = gzip.open(path, 'wt', encoding='utf-8')
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self.recorded = 0
+
+    def request(self, session, method, url, **kwargs):
+        offset = time.monotonic() - self._started
+        response = self._transport.request(session, method, url, **kwargs)
+
+        data = kwargs.get('data', None)
+        content = response.content
+        try:
+            body, encoding = content.decode('utf-8'), None
+        except UnicodeDecodeError:
+            body, encoding = base64.b64encode(content).decode('ascii'), 'base64'
+
+        line = json.dumps({
+            'offset': offset,
+            'method': method,
+            'endpoint': _endpoint(url),
+            'query': _query(kwargs.get('params', None)),
+            'body_hash': _body_hash(data),
+            'request': data.decode('utf-8', 'replace') if isinstance(data, bytes) else None,
+            'status': response.status_code,
+            'headers': dict((name, response.headers[name]) for name in _HEADERS if name in response.headers),
+            'content': body,
+            'encoding': encoding,
+            'elapsed': response.elapsed.total_seconds()
+        })
+        with self._lock:
+            self._file.write(line + '\n')
+            self.recorded += 1
+
+        return response
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+        self._transport.close()
+
+
+def load_recording(path):
+    """Returns the calls recorded in ``path``, in the order they were made."""
+    with gzip.open(path, 'rt', encoding='utf-8') as file_obj:
+        return sorted((json.loads(line) for line in file_obj if line.strip()), key=lambda call: call['offset'])
+
+
+class ReplayTransport(Transport):
+    """Serves the responses recorded in ``path`` instead of calling Cortex. The responses are looked up by method,
+    endpoint, query string and hash of the request body, and served in the order they were recorded; the last one
+    is served again once they have all been used. The recorded latency is reproduced, divided by ``speed``, unless
+    ``speed`` is ``None``. Requests without recording get a 404 response, or raise a ``KeyError`` (reported by the
+    ``Api`` as the cause of a ``CortexError``) when ``strict`` is set."""
+
+    def __init__(self, path, speed=1.0, strict=False):
+        self.speed = speed
+        self.strict = strict
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._responses = collections.defaultdict(collections.deque)
+        for call in load_recording(path):
+            key = request_key(call['method'], call['endpoint'], call['query'], call['body_hash'])
+            self._responses[key].append(call)
+
+    def _next(self, key):
+        with self._lock:
+            responses = self._responses.get(key, None)
+            if not responses:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return responses.popleft() if len(responses) > 1 else responses[0]
+
+    def request(self, session, method, url, **kwargs):
+        key = request_key(method, _endpoint(url), _query(kwargs.get('params', None)),
+                          _body_hash(kwargs.get('data', None)))
+        call = self._next(key)
+        if call is None and self.strict:
+            raise KeyError('No recorded response for {}'.format(key))
+
+        if call is not None and self.speed:
+            time.sleep(call['elapsed'] / self.speed)
+
+        response = requests.Response()
+        response.url = url
+        response.encoding = 'utf-8'
+        if call is None:
+            response.status_code = 404
+            response.headers = CaseInsensitiveDict({'Content-Type': 'application/json'})
+            response._content = json.dumps({'type': 'NotFoundError', 'message': 'No recorded response'}).encode()
+        else:
+            response.status_code = call['status']
+            response.headers = CaseInsensitiveDict(call['headers'])
+            response._content = base64.b64decode(call['content']) if call['encoding'] == 'base64' \
+                else call['content'].encode('utf-8')
+        response._content_consumed = True
+
+        return response
+
+    @property
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+class ReplayResult(OperationResult):
+    """Outcome of a traffic replay: number of ``calls`` made, ``errors`` by exception name, ``skipped`` calls (file
+    submissions, whose content is not recorded), and the highest delay between the scheduled time of a call and the
+    time it actually started (``lag``)."""
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+        self.errors = collections.Counter()
+        self.skipped = 0
+        self.lag = 0.0
+
+    def _processed(self):
+        return self.calls
+
+    def _counters(self):
+        return {
+            'calls': self.calls,
+            'errors': sum(self.errors.values()),
+            'skipped': self.skipped,
+            'lag': self.lag
+        }
+
+
+class TrafficReplayer(object):
+    """Makes again, through ``api``, the calls recorded in ``path``, at their recorded times divided by ``speed``
+    (``speed=10`` replays an hour of traffic in six minutes), over ``max_workers`` threads. Calls are not queued: when
+    all the threads are busy, the next calls wait for one of them and start late, which shows in the ``lag`` of the
+    result. Combined with an ``Api`` using a ``ReplayTransport`` on the same recording, it load tests the client
+    without Cortex."""
+
+    def __init__(self, api, path, speed=1.0, max_workers=32):
+        self._api = api
+        self._calls = load_recording(path)
+        self._speed = speed
+        self._max_workers = max_workers
+        self._lock = threading.Lock()
+
+    def _call(self, call, due, result, slots):
+        lag = time.monotonic() - due
+        with self._lock:
+            result.lag = max(result.lag, lag)
+
+        method, endpoint = call['method'], call['endpoint']
+        params = dict(parse_qsl(call['query']))
+        try:
+            if method == 'GET':
+                self._api.do_get(endpoint, params)
+            elif method in ('POST', 'PATCH'):
+                data = json.loads(call['request']) if call['request'] else {}
+                (self._api.do_post if method == 'POST' else self._api.do_patch)(endpoint, data, params)
+            elif method == 'DELETE':
+                self._api.do_delete(endpoint)
+        except Exception as ex:
+            with self._lock:
+                result.errors[type(ex).__name__] += 1
+        finally:
+            slots.release()
+
+    def run(self) -> ReplayResult:
+        result = ReplayResult()
+        started = time.monotonic()
+        first = self._calls[0]['offset'] if len(self._calls) > 0 else 0.0
+        # Submissions are bounded by the number of workers, so that late calls are not hidden in the queue
+        slots = threading.Semaphore(self._max_workers)
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            for call in self._calls:
+                if call['method'] in ('POST', 'PATCH') and call['request'] is None:
+                    result.skipped += 1
+                    continue
+
+                due = started + (call['offset'] - first) / self._speed
+                delay = due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+
+                slots.acquire()
+                result.calls += 1
+                executor.submit(self._call, call, due, result, slots)
+
+        result.elapsed = time.monotonic() - started
+        return result
@@ -0,0 +1,146 @@
+import time
+
+from cortex4py.query import *
+from .deadline import Deadline
+from .exceptions import CortexException, DeadlineExceededError, RateLimitError, ServerError, ServiceUnavailableError
+
+
+class JobWatcher(object):
+    """Watches many jobs at once by polling their status in bulk through ``job/_search``, instead of parking one
+    ``waitreport`` request per job.
+
+    The poll interval starts at ``min_interval`` seconds, grows by ``backoff`` after every poll where no job has
+    finished, up to ``max_interval``, and is reset when a job finishes. Reports are only fetched for the finished jobs.
+
+    A job that is not found by ``max_missing`` polls in a row (a wrong id, or a job deleted meanwhile) stops being
+    watched, and is listed in ``missing``. A few polls are allowed because Cortex only finds a new job once it has
+    been indexed. A finished job whose report cannot be fetched because Cortex is failing stays pending, so that its
+    report is fetched again on the next poll. Other errors are kept in ``errors``, by job id, and the job is returned
+    without its report.
+    """
+
+    FINISHED_STATUSES = ('Success', 'Failure', 'Deleted')
+
+    def __init__(self, api, job_ids=(), **kwargs):
+        self._api = api
+        # Dicts keyed by job id, used as ordered sets
+        self._pending = {}
+        self._not_found = {}
+        self._missing = {}
+        self.errors = {}
+        self._min_interval = kwargs.get('min_interval', 1)
+        self._max_interval = kwargs.get('max_interval', 30)
+        self._backoff = kwargs.get('backoff', 1.5)
+        self._batch_size = kwargs.get('batch_size', 100)
+        self._fetch_reports = kwargs.get('fetch_reports', True)
+        self._callback = kwargs.get('callback', None)
+        self._max_missing = kwargs.get('max_missing', 3)
+        self._interval = self._min_interval
+
+        self.add(*job_ids)
+
+    @property
+    def pending(self):
+        return list(self._pending)
+
+    @property
+    def missing(self):
+        """Ids of the jobs given up on because Cortex did not find them."""
+        return list(self._missing)
+
+    def add(self, *job_ids):
+        for job_id in job_ids:
+            self._missing.pop(job_id, None)
+            self._pending[job_id] = None
+        self._interval = self._min_interval
+
+    def remove(self, job_id):
+        self._pending.pop(job_id, None)
+        self._not_found.pop(job_id, None)
+
+    def _finished(self, job):
+        if self._fetch_reports and job.status != 'Deleted':
+            return self._api.jobs.get_report(job.id)
+        return job
+
+    def poll(self):
+        """Checks the status of all the pending jobs once, and returns the finished ones whose report was fetched."""
+        finished = []
+        found = set()
+        pending = list(self._pending)
+        for start in range(0, len(pending), self._batch_size):
+            batch = pending[start:start + self._batch_size]
+            jobs = self._api.jobs.find_all(Or(*[Id(job_id) for job_id in batch]), range='0-{}'.format(len(batch)))
+
+            for job in jobs:
+                found.add(job.id)
+                if job.status in self.FINISHED_STATUSES:
+                    finished.append(job)
+
+        for job_id in pending:
+            if job_id in found:
+                self._not_found.pop(job_id, None)
+                continue
+
+            self._not_found[job_id] = self._not_found.get(job_id, 0) + 1
+            if self._not_found[job_id] >= self._max_missing:
+                self.remove(job_id)
+                self._missing[job_id] = None
+
+        # A job is only removed once its report is fetched, so that a failed fetch is retried on the next poll
+        done = []
+        for job in finished:
+            error = None
+            try:
+                report = self._finished(job)
+            except DeadlineExceededError:
+                break
+            except (ServiceUnavailableError, ServerError, RateLimitError):
+                continue
+            except CortexException as ex:
+                report, error = job, ex
+
+            self.remove(job.id)
+            if error is not None:
+                self.errors[job.id] = error
+            done.append(report)
+
+        return done
+
+    def watch(self, timeout=None):
+        """Yields every job as it reaches a final status, until all the jobs are finished or ``timeout`` seconds
+        (or the ``Deadline``) have elapsed. The calls made to Cortex are bounded by the same deadline."""
+        watch_deadline = Deadline.of(timeout)
+
+        while len(self._pending) > 0:
+            try:
+                with self._api.deadline(watch_deadline):
+                    finished = self.poll()
+            except DeadlineExceededError:
+                break
+
+            for job in finished:
+                if self._callback is not None:
+                    self._callback(job)
+                yield job
+
+            if len(self._pending) == 0:
+                break
+
+            if len(finished) > 0:
+                self._interval = self._min_interval
+
+            delay = self._interval
+            if watch_deadline is not None:
+                if watch_deadline.expired:
+                    break
+                delay = min(delay, watch_deadline.remaining())
+
+            time.sleep(delay)
+
+            if len(finished) == 0:
+                self._interval = min(self._interval * self._backoff, self._max_interval)
+
+    def wait(self, timeout=None):
+        """Blocks until all the jobs are finished, or ``timeout`` is reached, and returns the finished jobs."""
+        return list(self.watch(timeout))
@@ -19,7 +19,7 @@ setup(
     maintainer='TheHive-Project',
     url='https://github.com/Thehive-Project/Cortex4py',
     license='AGPL-V3',
-    packages=['cortex4py', 'cortex4py.models', 'cortex4py.controllers'],
+    packages=['cortex4py', 'cortex4py.models', 'cortex4py.controllers', 'cortex4py.controllers.aio'],
     classifiers=[
         'Development Status :: 4 - Beta',
         'Intended Audience :: Developers',
@@ -29,9 +29,15 @@ setup(
         'Natural Language :: English',
         'Operating System :: OS Independent',
         'Programming Language :: Python',
+        'Programming Language :: Python :: 3',
         'Topic :: Security',
         'Topic :: Software Development :: Libraries :: Python Modules'
     ],
     include_package_data=True,
-    install_requires=['typing', 'requests', 'python-magic']
+    python_requires='>=3.7',
+    install_requires=['typing', 'requests', 'python-magic'],
+    extras_require={
+        'async': ['aiohttp'],
+        'parquet': ['pyarrow']
+    }
 )
@@ -0,0 +1,105 @@
+import threading
+import unittest
+
+from cortex4py.balancer import NodePool
+
+URLS = ['http://node1', 'http://node2', 'http://node3']
+
+
+class NodePoolTest(unittest.TestCase):
+    def call(self, pool, failed=False, elapsed=0.1, **kwargs):
+        node = pool.acquire(**kwargs)
+        pool.release(node, elapsed, failed)
+        return node
+
+    def test_unknown_strategy(self):
+        self.assertRaises(ValueError, NodePool, URLS, strategy='random')
+
+    def test_round_robin(self):
+        pool = NodePool(URLS)
+        self.assertEqual([self.call(pool).url for _ in range(6)], URLS + URLS)
+        self.assertEqual([stats['requests'] for stats in pool.stats['nodes'].values()], [2, 2, 2])
+
+    def test_least_outstanding(self):
+        pool = NodePool(URLS, strategy='least_outstanding')
+        busy = [pool.acquire(), pool.acquire()]
+        self.assertEqual(len(set(busy)), 2)
+        idle = pool.acquire()
+        self.assertNotIn(idle, busy)
+        pool.release(busy[0], 0.1, False)
+        self.assertIs(pool.acquire(), busy[0])
+        self.assertEqual([node.outstanding for node in pool.nodes], [1, 1, 1])
+
+    def test_latency(self):
+        pool = NodePool(URLS[:2], strategy='latency')
+        pool.release(pool.acquire(node=pool.nodes[0]), 0.01, False)
+        pool.release(pool.acquire(node=pool.nodes[1]), 1.0, False)
+        selected = [self.call(pool, elapsed=None, failed=None).url for _ in range(500)]
+        self.assertGreater(selected.count(URLS[0]), 400)
+        self.assertGreater(selected.count(URLS[1]), 0)
+
+    def test_latency_average(self):
+        pool = NodePool(URLS[:1])
+        self.call(pool, elapsed=1.0)
+        self.call(pool, elapsed=2.0)
+        self.assertAlmostEqual(pool.nodes[0].latency, 0.3 * 2.0 + 0.7 * 1.0)
+
+    def test_ejection(self):
+        pool = NodePool(URLS, max_failures=2)
+        node = pool.nodes[0]
+        for _ in range(2):
+            pool.release(pool.acquire(node=node), 0.1, True)
+        self.assertTrue(node.ejected)
+        self.assertNotIn(node, [self.call(pool) for _ in range(6)])
+
+        # A call to the node readmits it
+        pool.release(pool.acquire(node=node), 0.1, False)
+        self.assertFalse(node.ejected)
+        self.assertEqual(pool.stats['nodes'][node.url]['errors'], 2)
+
+    def test_undetermined_calls_do_not_eject(self):
+        pool = NodePool(URLS, max_failures=1)
+        self.call(pool, failed=None)
+        self.assertFalse(any(node.ejected for node in pool.nodes))
+        self.assertEqual(pool.nodes[0].latency, None)
+
+    def test_single_node_never_ejected(self):
+        pool = NodePool(URLS[:1], max_failures=1)
+        self.call(pool, failed=True)
+        self.assertFalse(pool.nodes[0].ejected)
+
+    def test_all_ejected(self):
+        pool = NodePool(URLS[:2], max_failures=1)
+        for node in pool.nodes:
+            pool.release(pool.acquire(node=node), 0.1, True)
+        # The calls still go somewhere
+        self.assertIn(self.call(pool), pool.nodes)
+
+    def test_has_alternative(self):
+        pool = NodePool(URLS[:2], max_failures=1)
+        first, second = pool.nodes
+        self.assertTrue(pool.has_alternative([first]))
+        self.assertIs(pool.acquire(exclude=[first]), second)
+        pool.release(second, 0.1, True)
+        self.assertFalse(pool.has_alternative([first]))
+        self.assertFalse(pool.has_alternative([first, second]))
+
+    def test_release_not_sent(self):
+        pool = NodePool(URLS)
+        node = pool.acquire()
+        pool.release(node, 0, None, sent=False)
+        self.assertEqual((node.outstanding, node.requests), (0, 0))
+
+    def test_probe(self):
+        probed = threading.Event()
+        pool = NodePool(URLS[:2], max_failures=1, probe_interval=0.01, probe=lambda node: probed.set())
+        try:
+            self.call(pool, failed=True)
+            self.assertTrue(probed.wait(1))
+            self.assertEqual(pool.check(), dict((url, True) for url in URLS[:2]))
+        finally:
+            pool.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import time
+import unittest
+
+from cortex4py.api import Api
+from cortex4py.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from cortex4py.exceptions import CircuitOpenError, ServiceUnavailableError
+
+URL = 'http://127.0.0.1:1'
+RUN = 'analyzer/an0000/run'
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def fail(self, breaker, endpoint='', count=1, status=None):
+        for _ in range(count):
+            breaker.record(breaker.allow(URL, endpoint), True, status)
+
+    def test_opens_on_failure_rate(self):
+        changes = []
+        breaker = CircuitBreaker(failure_rate=0.5, min_calls=4, listener=lambda *change: changes.append(change))
+        for failed in (False, False, True):
+            breaker.record(breaker.allow(URL), failed)
+        self.assertEqual(breaker.state(URL), CLOSED)
+
+        self.fail(breaker)
+        self.assertEqual(breaker.state(URL), OPEN)
+        self.assertEqual(changes, [(URL, CLOSED, OPEN)])
+        with self.assertRaises(CircuitOpenError) as context:
+            breaker.allow(URL)
+        self.assertGreater(context.exception.retry_after, 0)
+
+    def test_half_open(self):
+        breaker = CircuitBreaker(min_calls=1, open_duration=0.05)
+        self.fail(breaker)
+        time.sleep(0.06)
+        self.assertEqual(breaker.state(URL), HALF_OPEN)
+
+        circuits = breaker.allow(URL)
+        # A single trial call at a time
+        self.assertRaises(CircuitOpenError, breaker.allow, URL)
+        breaker.record(circuits, True)
+        self.assertEqual(breaker.state(URL), OPEN)
+
+        time.sleep(0.06)
+        breaker.record(breaker.allow(URL), False)
+        self.assertEqual(breaker.state(URL), CLOSED)
+
+    def test_worker_failure_responses_spare_the_node(self):
+        breaker = CircuitBreaker(min_calls=2, per_worker=True)
+        self.fail(breaker, RUN, 2, status=503)
+        self.assertEqual(breaker.state(URL, RUN), OPEN)
+        self.assertEqual(breaker.state(URL), CLOSED)
+        breaker.record(breaker.allow(URL, 'analyzer/an0001/run'), False, 200)
+
+    def test_connection_errors_trip_the_node(self):
+        breaker = CircuitBreaker(min_calls=3, per_worker=True)
+        with Api(URL, 'key', retry=None, circuit_breaker=breaker, connect_timeout=1) as api:
+            for index in range(3):
+                self.assertRaises(ServiceUnavailableError, api.analyzers.run_by_id, 'an000{}'.format(index),
+                                  {'dataType': 'ip', 'data': '10.0.0.1'})
+            self.assertEqual(breaker.state(URL), OPEN)
+            self.assertRaises(CircuitOpenError, api.status)
+            self.assertRaises(CircuitOpenError, api.analyzers.run_by_id, 'an0009', {'dataType': 'ip', 'data': '1'})
+            self.assertEqual(api.nodes.stats['nodes'][URL]['requests'], 3)
+
+    def test_open_worker_gives_back_node_trial(self):
+        breaker = CircuitBreaker(min_calls=1, open_duration=0.05, per_worker=True)
+        self.fail(breaker, RUN, status=503)
+        self.fail(breaker)
+        time.sleep(0.06)
+        # The node is half open and the worker circuit is open
+        breaker.circuit(URL, RUN).opened_at = time.monotonic()
+        self.assertRaises(CircuitOpenError, breaker.allow, URL, RUN)
+        breaker.record(breaker.allow(URL), False)
+        self.assertEqual(breaker.state(URL), CLOSED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from benchmarks.fake_cortex import FakeCortex, FakeCortexServer
+from cortex4py.api import Api
+
+
+class JobExporterTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cortex = FakeCortex(jobs=23)
+        # Jobs sharing the same creation date, across several batches
+        with self.cortex.lock:
+            for job in list(self.cortex.jobs.values())[5:17]:
+                job['createdAt'] = 1546300805000
+        self.server = FakeCortexServer(self.cortex).start()
+        self.api = Api(self.server.url, 'key', retry=None)
+
+    def tearDown(self):
+        self.api.close()
+        self.server.stop()
+        shutil.rmtree(self.directory)
+
+    def export(self, **kwargs):
+        result = self.api.jobs.export(os.path.join(self.directory, 'jobs.jsonl.gz'), batch_size=5, **kwargs)
+        records = []
+        for path in result.files:
+            with gzip.open(path, 'rt') as file_obj:
+                records.extend(json.loads(line) for line in file_obj)
+        return result, records
+
+    def test_ascending(self):
+        result, records = self.export()
+        self.assertEqual(result.records, 23)
+        self.assertEqual(sorted(record['id'] for record in records), sorted(self.cortex.jobs))
+        dates = [record['createdAt'] for record in records]
+        self.assertEqual(dates, sorted(dates))
+
+    def test_descending(self):
+        result, records = self.export(sort='-createdAt', max_records=10)
+        self.assertEqual(len(result.files), 3)
+        self.assertEqual(sorted(record['id'] for record in records), sorted(self.cortex.jobs))
+        dates = [record['createdAt'] for record in records]
+        self.assertEqual(dates, sorted(dates, reverse=True))
+
+    def test_single_sort_field(self):
+        self.assertRaises(ValueError, self.api.jobs.export, os.path.join(self.directory, 'jobs.jsonl.gz'),
+                          sort='+createdAt,+id')
+
+
+if __name__ == '__main__':
+    unittest.main()
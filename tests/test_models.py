@@ -0,0 +1,78 @@
+import unittest
+
+from benchmarks.fake_cortex import FakeCortex, FakeCortexServer
+from cortex4py.api import Api
+from cortex4py.codec import JsonCodec
+from cortex4py.models import Job, ModelList
+
+
+class CountingCodec(JsonCodec):
+    def __init__(self):
+        self.decoded = 0
+
+    def loads(self, data):
+        self.decoded += 1
+        return super(CountingCodec, self).loads(data)
+
+
+class ModelsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeCortexServer(FakeCortex(jobs=5)).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def test_lists(self):
+        with Api(self.server.url, 'key') as api:
+            jobs = api.jobs.find_all({}, range='0-10')
+            self.assertIsInstance(jobs, list)
+            self.assertEqual(api.jobs.find_all({'_id': 'unknown'}), [])
+
+            jobs[0].status = 'Failure'
+            self.assertEqual(jobs[0].status, 'Failure')
+            jobs.sort(key=lambda job: job.createdAt, reverse=True)
+            self.assertEqual(len(jobs + [jobs[0]]), 6)
+
+    def test_compact_lists(self):
+        with Api(self.server.url, 'key', compact_lists=True) as api:
+            jobs = api.jobs.find_all({}, range='0-10')
+            self.assertIsInstance(jobs, ModelList)
+            self.assertEqual(len(jobs), 5)
+            self.assertEqual(api.jobs.find_all({'_id': 'unknown'}), [])
+
+            jobs[0].status = 'Failure'
+            self.assertIs(jobs[0], jobs[0])
+            self.assertEqual(jobs[0].status, 'Failure')
+            self.assertIs(jobs[1:3][0], jobs[1])
+            self.assertEqual(jobs, list(jobs))
+            self.assertEqual(list(jobs), jobs)
+
+            again = api.jobs.find_all({}, range='0-10')
+            self.assertNotEqual(again, jobs)
+            again[0].status = 'Failure'
+            self.assertEqual(again, jobs)
+
+    def test_lazy_fields(self):
+        codec = CountingCodec()
+        job = Job._from_response({'_id': 'job', 'id': 'job', 'parameters': '{"a": 1}', 'report': 'not json'}, codec)
+        self.assertEqual(job.parameters, {'a': 1})
+        self.assertNotIn('_id', job.json())
+        self.assertEqual(job.json()['parameters'], {'a': 1})
+        self.assertEqual(job.report, 'not json')
+        self.assertEqual(job.json()['report'], 'not json')
+        self.assertEqual(job.parameters, {'a': 1})
+
+    def test_api_codec(self):
+        codec = CountingCodec()
+        with Api(self.server.url, 'key', json_codec=codec) as api:
+            job = api.jobs.find_all({}, range='0-1')[0]
+            job.parameters = '{"a": 1}'
+            decoded = codec.decoded
+            self.assertEqual(str(job).count('"a": 1'), 1)
+            self.assertEqual(codec.decoded, decoded + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import asyncio
+import io
+import os
+import tempfile
+import unittest
+
+from email.parser import BytesParser
+
+from benchmarks.fake_cortex import FakeCortex, FakeCortexServer
+from cortex4py.api import Api
+from cortex4py.async_api import AsyncApi
+from cortex4py.multipart import MultipartEncoder
+
+CONTENT = bytes(bytearray(range(256))) * 1000
+
+
+def parse(encoder, body):
+    message = BytesParser().parsebytes(b'Content-Type: ' + encoder.content_type.encode('ascii') + b'\r\n\r\n' + body)
+    return dict((part.get_param('name', header='Content-Disposition'), part) for part in message.get_payload())
+
+
+class MultipartEncoderTest(unittest.TestCase):
+    def encode(self, content, chunk_size=1000):
+        progress = []
+        encoder = MultipartEncoder([('_json', '{"dataType": "file"}'), ('data', ('sample.bin', content, 'x/y'))],
+                                   chunk_size=chunk_size, callback=lambda sent, total: progress.append((sent, total)))
+        with encoder:
+            body = b''.join(encoder)
+        self.assertEqual(len(body), len(encoder))
+        return encoder, body, progress
+
+    def check(self, content):
+        encoder, body, progress = self.encode(content)
+        parts = parse(encoder, body)
+        self.assertEqual(parts['_json'].get_payload(), '{"dataType": "file"}')
+        self.assertEqual(parts['data'].get_filename(), 'sample.bin')
+        self.assertEqual(parts['data'].get_content_type(), 'x/y')
+        self.assertEqual(parts['data'].get_payload(decode=True), CONTENT)
+        self.assertEqual(progress[-1], (len(body), len(body)))
+        self.assertTrue(all(sent <= 1000 * (index + 1) for index, (sent, _) in enumerate(progress)))
+
+    def test_bytes(self):
+        self.check(CONTENT)
+        self.check(memoryview(CONTENT))
+
+    def test_file_object(self):
+        file_obj = io.BytesIO(b'header' + CONTENT)
+        file_obj.read(6)
+        self.check(file_obj)
+        self.assertFalse(file_obj.closed)
+
+    def test_path(self):
+        with tempfile.NamedTemporaryFile(delete=False) as file_obj:
+            file_obj.write(CONTENT)
+        try:
+            encoder = MultipartEncoder([('data', ('sample.bin', file_obj.name, 'x/y'))])
+            stream = encoder._opened[0]
+            self.assertEqual(len(b''.join(encoder)), len(encoder))
+            self.assertTrue(stream.closed)
+        finally:
+            os.remove(file_obj.name)
+
+
+class FileUploadTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeCortexServer(FakeCortex()).start()
+        self.observable = {'dataType': 'file', 'data': CONTENT, 'filename': 'sample.bin'}
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_sync(self):
+        progress = []
+        with Api(self.server.url, 'key') as api:
+            job = api.analyzers.run_by_id('an0000', self.observable, content_type='application/octet-stream',
+                                          progress=lambda sent, total: progress.append((sent, total)))
+        self.assertEqual(job.dataType, 'file')
+        self.assertEqual(progress[-1][0], progress[-1][1])
+
+    def test_async(self):
+        progress = []
+
+        async def run():
+            async with AsyncApi(self.server.url, 'key') as api:
+                return await api.analyzers.run_by_id('an0000', self.observable,
+                                                     content_type='application/octet-stream',
+                                                     progress=lambda sent, total: progress.append((sent, total)))
+
+        job = asyncio.run(run())
+        self.assertEqual(job.dataType, 'file')
+        self.assertGreater(len(progress), 1)
+        self.assertEqual(progress[-1][0], progress[-1][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
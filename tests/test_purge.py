@@ -0,0 +1,40 @@
+import unittest
+
+from benchmarks.fake_cortex import FakeCortex, FakeCortexServer
+from cortex4py.api import Api
+from cortex4py.metrics import MetricsCollector
+from cortex4py.query import Lt
+
+
+class JobPurgeTest(unittest.TestCase):
+    def setUp(self):
+        # Jobs created one second apart
+        self.cortex = FakeCortex(jobs=30)
+        self.server = FakeCortexServer(self.cortex).start()
+        self.metrics = MetricsCollector()
+        self.api = Api(self.server.url, 'key', retry=None, hooks=[self.metrics])
+        self.query = Lt('createdAt', 1546300800000 + 20 * 1000)
+
+    def tearDown(self):
+        self.api.close()
+        self.server.stop()
+
+    def deleted(self):
+        return sum(1 for job in self.cortex.jobs.values() if job['status'] == 'Deleted')
+
+    def test_dry_run(self):
+        result = self.api.jobs.purge(self.query, dry_run=True, page_size=7)
+        self.assertEqual(result.matched, 20)
+        self.assertEqual(self.deleted(), 0)
+        self.assertEqual(list(self.metrics.stats), ['POST job/_stats'])
+
+    def test_run(self):
+        result = self.api.jobs.purge(self.query, page_size=7, max_workers=4)
+        self.assertTrue(result.completed)
+        self.assertEqual((result.matched, result.deleted, result.failed), (20, 20, {}))
+        self.assertEqual(self.deleted(), 20)
+        self.assertEqual(self.api.jobs.purge(self.query, dry_run=True).matched, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
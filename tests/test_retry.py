@@ -0,0 +1,112 @@
+import asyncio
+import json
+import threading
+import unittest
+
+from benchmarks.stub_server import StubHandler, StubServer
+from cortex4py.api import Api
+from cortex4py.async_api import AsyncApi
+from cortex4py.exceptions import InvalidInputError, RateLimitError, ServerError, ServiceUnavailableError
+from cortex4py.retry import RetryPolicy
+
+
+class StatusHandler(StubHandler):
+    """Answers the calls with the statuses queued in ``server.statuses``, then with 200."""
+
+    def _answer(self):
+        self._read_body()
+        with self.server.lock:
+            self.server.calls += 1
+            status = self.server.statuses.pop(0) if len(self.server.statuses) > 0 else 200
+        if status >= 400:
+            body = json.dumps({'type': 'Error', 'message': 'failed'}).encode('utf-8')
+            self.send_response(status)
+            for name, value in self.server.retry_headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._send_json([] if self.path.endswith('_search') else {'id': 'job'})
+
+    def do_GET(self):
+        self._answer()
+
+    def do_POST(self):
+        self._answer()
+
+
+class RetryPolicyTest(unittest.TestCase):
+    def test_backoff(self):
+        policy = RetryPolicy(backoff_factor=0.5, max_backoff=3, jitter=False)
+        self.assertEqual([policy.delay(attempt) for attempt in range(5)], [0.5, 1, 2, 3, 3])
+
+        policy = RetryPolicy(backoff_factor=1, jitter=True)
+        self.assertTrue(all(0 <= policy.delay(2) <= 4 for _ in range(20)))
+
+    def test_should_retry(self):
+        policy = RetryPolicy(total=2)
+        self.assertTrue(policy.should_retry(0, 'GET', 'job/1', status=502))
+        self.assertFalse(policy.should_retry(2, 'GET', 'job/1', status=502))
+        self.assertFalse(policy.should_retry(0, 'GET', 'job/1', status=500))
+        self.assertTrue(policy.should_retry(0, 'POST', 'job/_search', status=504))
+        # A run must not be submitted twice, unless Cortex tells it was not processed
+        self.assertFalse(policy.should_retry(0, 'POST', 'analyzer/1/run', status=502))
+        self.assertTrue(policy.should_retry(0, 'POST', 'analyzer/1/run', status=503))
+        self.assertTrue(RetryPolicy(retry_non_idempotent=True).should_retry(0, 'POST', 'analyzer/1/run', status=502))
+
+
+class RetryTest(unittest.TestCase):
+    def setUp(self):
+        self.server = StubServer(StatusHandler).start()
+        self.server.httpd.lock = threading.Lock()
+        self.server.httpd.calls = 0
+        self.server.httpd.statuses = []
+        self.server.httpd.retry_headers = {}
+        self.policy = RetryPolicy(total=2, backoff_factor=0.01)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def respond(self, *statuses, **headers):
+        self.server.httpd.statuses = list(statuses)
+        self.server.httpd.retry_headers = headers
+
+    def test_retried(self):
+        self.respond(503, 502)
+        with Api(self.server.url, 'key', retry=self.policy) as api:
+            self.assertEqual(api.jobs.get_by_id('job').id, 'job')
+        self.assertEqual(self.server.httpd.calls, 3)
+        self.assertEqual(self.policy.stats['retries'], 2)
+
+    def test_retry_after(self):
+        self.respond(429, **{'Retry-After': '600'})
+        with Api(self.server.url, 'key', retry=RetryPolicy(max_retry_after=60)) as api:
+            self.assertRaises(RateLimitError, api.jobs.get_by_id, 'job')
+        self.assertEqual(self.server.httpd.calls, 1)
+
+    def test_exhausted(self):
+        expected = [(500, ServerError), (502, ServiceUnavailableError), (503, ServiceUnavailableError),
+                    (504, ServiceUnavailableError), (400, InvalidInputError)]
+        with Api(self.server.url, 'key', retry=self.policy) as api:
+            for status, error in expected:
+                self.respond(status, status, status)
+                self.assertRaises(error, api.jobs.get_by_id, 'job')
+        self.assertEqual(self.policy.stats['exhausted'], 3)
+
+    def test_exhausted_async(self):
+        expected = [(500, ServerError), (504, ServiceUnavailableError), (400, InvalidInputError)]
+
+        async def run():
+            async with AsyncApi(self.server.url, 'key', retry=self.policy) as api:
+                for status, error in expected:
+                    self.respond(status, status, status)
+                    with self.assertRaises(error):
+                        await api.jobs.get_by_id('job')
+
+        asyncio.run(run())
+
+
+if __name__ == '__main__':
+    unittest.main()
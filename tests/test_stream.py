@@ -0,0 +1,108 @@
+import json
+import random
+import unittest
+
+from cortex4py.stream import JsonStreamParser
+
+JOB = {
+    'id': 'job',
+    'status': 'Success',
+    'date': 1546300800000,
+    'escaped': 'a "quoted" \\ value, with [brackets] and {braces}',
+    'report': {
+        'success': True,
+        'summary': {'taxonomies': [{'level': 'info', 'value': 'a}b'}]},
+        'full': {'scans': [1, 2.5, None], 'raw': 'x' * 5000},
+        'artifacts': [{'dataType': 'ip', 'data': '10.0.0.{}'.format(index)} for index in range(50)]
+    },
+    'empty': {},
+    'none': []
+}
+BODY = json.dumps(JOB).encode('utf-8')
+
+
+def parse(body, chunk_sizes, **kwargs):
+    parser = JsonStreamParser(**kwargs)
+    items = []
+    position = 0
+    while position < len(body):
+        size = next(chunk_sizes)
+        items.extend(parser.feed(body[position:position + size]))
+        position += size
+    items.extend(parser.close())
+    return parser.document, items
+
+
+def split(*sizes):
+    while True:
+        yield from sizes
+
+
+def randomly(seed):
+    generator = random.Random(seed)
+    while True:
+        yield generator.randint(1, 64)
+
+
+class JsonStreamParserTest(unittest.TestCase):
+    def test_chunk_boundaries(self):
+        for chunk_sizes in (split(len(BODY)), split(1), split(7, 3, 1), randomly(1), randomly(2)):
+            self.assertEqual(parse(BODY, chunk_sizes), (JOB, []))
+
+    def test_scalar_document(self):
+        for body in (b'12345', b' "a string" ', b'[1, {"a": null}]', b'true'):
+            self.assertEqual(parse(body, split(1))[0], json.loads(body))
+
+    def test_projection(self):
+        for chunk_sizes in (split(len(BODY)), split(1), randomly(3)):
+            document, items = parse(BODY, chunk_sizes, fields=['report.summary', 'report.full.scans', 'missing.field'])
+            self.assertEqual(document, {
+                'id': 'job',
+                'status': 'Success',
+                'date': 1546300800000,
+                'escaped': JOB['escaped'],
+                'report': {'summary': JOB['report']['summary'], 'full': {'scans': [1, 2.5, None]}}
+            })
+            self.assertEqual(items, [])
+
+    def test_items(self):
+        for chunk_sizes in (split(len(BODY)), split(1), randomly(4)):
+            document, items = parse(BODY, chunk_sizes, items='report.artifacts', fields=['report.success'])
+            self.assertEqual(items, JOB['report']['artifacts'])
+            self.assertEqual(document['report'], {'success': True})
+            self.assertEqual(document['id'], 'job')
+
+    def test_items_returned_as_fed(self):
+        parser = JsonStreamParser(items='data')
+        self.assertEqual(parser.feed(b'{"data": [{"a": 1}, {"a"'), [{'a': 1}])
+        # The scalar may continue in the next chunk
+        self.assertEqual(parser.feed(b': 2}, 3'), [{'a': 2}])
+        self.assertEqual(parser.feed(b'4]}'), [34])
+        self.assertEqual(parser.close(), [])
+        self.assertEqual(parser.document, {})
+
+    def test_empty_items(self):
+        self.assertEqual(parse(BODY, split(5), items='none'), ({
+            'id': 'job', 'status': 'Success', 'date': 1546300800000, 'escaped': JOB['escaped']
+        }, []))
+
+    def test_truncated(self):
+        # Inside the top-level object, a skipped string, the items array and the last bracket
+        for cut in (1, BODY.index(b'xxxx'), BODY.index(b'10.0.0.7'), len(BODY) - 1):
+            for kwargs in ({}, {'fields': ['report.summary']}, {'items': 'report.artifacts'}):
+                parser = JsonStreamParser(**kwargs)
+                parser.feed(BODY[:cut])
+                self.assertRaises(ValueError, parser.close)
+
+    def test_truncated_scalar(self):
+        parser = JsonStreamParser(fields=['a'])
+        parser.feed(b'{"a": 12')
+        self.assertRaises(ValueError, parser.close)
+
+    def test_invalid(self):
+        parser = JsonStreamParser(fields=['a'])
+        self.assertRaises(ValueError, parser.feed, b'{"a" 1}')
+
+
+if __name__ == '__main__':
+    unittest.main()
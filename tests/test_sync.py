@@ -0,0 +1,63 @@
+import unittest
+
+from benchmarks.fake_cortex import FakeCortex, FakeCortexServer
+from cortex4py.api import Api
+from cortex4py.sync import SyncCursor
+
+
+class JobSyncTest(unittest.TestCase):
+    def setUp(self):
+        self.cortex = FakeCortex()
+        self.server = FakeCortexServer(self.cortex).start()
+        self.api = Api(self.server.url, 'key', retry=None)
+
+    def tearDown(self):
+        self.api.close()
+        self.server.stop()
+
+    def submit(self, updated_at):
+        job = self.cortex.submit('an0000', {'dataType': 'ip', 'data': '10.0.0.1'})
+        self.update(job['id'], updated_at)
+        return job['id']
+
+    def update(self, job_id, updated_at, **fields):
+        with self.cortex.lock:
+            self.cortex.jobs[job_id].update(fields, updatedAt=updated_at)
+
+    def sync(self, cursor, **kwargs):
+        return [job.id for job in self.api.jobs.sync_since(cursor, **kwargs)]
+
+    def test_ties_across_pages(self):
+        job_ids = [self.submit(1000) for _ in range(5)] + [self.submit(2000)]
+        cursor = SyncCursor()
+
+        self.assertEqual(sorted(self.sync(cursor, page_size=2)), sorted(job_ids))
+        self.assertEqual(cursor.value, 2000)
+        self.assertEqual(self.sync(cursor, page_size=2), [])
+
+        job_ids.append(self.submit(2000))
+        self.assertEqual(self.sync(cursor, page_size=2), job_ids[-1:])
+
+    def test_changed_job_at_boundary(self):
+        job_ids = [self.submit(1000), self.submit(2000), self.submit(3000)]
+        cursor = SyncCursor()
+        self.assertEqual(self.sync(cursor), job_ids)
+
+        self.update(job_ids[-1], 4000, status='Success')
+        jobs = list(self.api.jobs.sync_since(cursor))
+        self.assertEqual([job.id for job in jobs], job_ids[-1:])
+        self.assertEqual(jobs[0].status, 'Success')
+        self.assertEqual(self.sync(cursor), [])
+
+    def test_changed_job_within_overlap(self):
+        job_ids = [self.submit(1000), self.submit(2000), self.submit(3000)]
+        cursor = SyncCursor(overlap=1500)
+        self.assertEqual(self.sync(cursor), job_ids)
+
+        self.update(job_ids[1], 3000)
+        self.assertEqual(self.sync(cursor), job_ids[1:2])
+        self.assertEqual(self.sync(SyncCursor.loads(cursor.dumps())), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
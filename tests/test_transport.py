@@ -0,0 +1,44 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from benchmarks.fake_cortex import FakeCortex, FakeCortexServer
+from cortex4py.api import Api
+from cortex4py.exceptions import CortexError, NotFoundError
+from cortex4py.query import Eq
+from cortex4py.transport import RecordingTransport, ReplayTransport
+
+
+class RecordReplayTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'traffic.jsonl.gz')
+
+        with FakeCortexServer(FakeCortex(jobs=5)) as server:
+            with Api(server.url, 'key', json_codec='orjson', transport=RecordingTransport(self.path)) as api:
+                self.jobs = [job.json() for job in api.jobs.find_all(Eq('status', 'Success'), range='0-3')]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_replay_with_another_codec(self):
+        transport = ReplayTransport(self.path, speed=None)
+        with Api('http://cortex.invalid', 'key', json_codec='json', transport=transport) as api:
+            jobs = api.jobs.find_all(Eq('status', 'Success'), range='0-3')
+            self.assertEqual([job.json() for job in jobs], self.jobs)
+        self.assertEqual(transport.stats, {'hits': 1, 'misses': 0})
+
+    def test_miss(self):
+        transport = ReplayTransport(self.path, speed=None)
+        with Api('http://cortex.invalid', 'key', transport=transport) as api:
+            self.assertRaises(NotFoundError, api.jobs.find_all, Eq('status', 'Failure'))
+
+        with Api('http://cortex.invalid', 'key', transport=ReplayTransport(self.path, speed=None, strict=True)) as api:
+            with self.assertRaises(CortexError) as context:
+                api.jobs.find_all(Eq('status', 'Failure'))
+            self.assertIsInstance(context.exception.__cause__, KeyError)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+from benchmarks.fake_cortex import FakeCortex, FakeCortexServer
+from cortex4py.api import Api
+from cortex4py.exceptions import AuthorizationError, ServiceUnavailableError
+
+
+class JobWatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.cortex = FakeCortex()
+        self.server = FakeCortexServer(self.cortex).start()
+        self.api = Api(self.server.url, 'key', retry=None)
+        self.job_ids = [self.cortex.submit('an0000', {'dataType': 'ip', 'data': '10.0.0.{}'.format(index)})['id']
+                        for index in range(3)]
+
+    def tearDown(self):
+        self.api.close()
+        self.server.stop()
+
+    def fail_report(self, job_id, error, times=1):
+        get_report = self.api.jobs.get_report
+        failures = [times]
+
+        def flaky(report_id):
+            if report_id == job_id and failures[0] > 0:
+                failures[0] -= 1
+                raise error
+            return get_report(report_id)
+
+        self.api.jobs.get_report = flaky
+
+    def test_finished_jobs(self):
+        watcher = self.api.jobs.watch(self.job_ids, min_interval=0.01)
+        jobs = watcher.wait()
+        self.assertEqual([job.id for job in jobs], self.job_ids)
+        self.assertEqual(watcher.pending, [])
+
+    def test_report_fetch_failure_is_retried(self):
+        self.fail_report(self.job_ids[1], ServiceUnavailableError('unavailable'))
+        watcher = self.api.jobs.watch(self.job_ids, min_interval=0.01)
+
+        self.assertEqual([job.id for job in watcher.poll()], [self.job_ids[0], self.job_ids[2]])
+        self.assertEqual(watcher.pending, self.job_ids[1:2])
+        self.assertEqual([job.id for job in watcher.wait()], self.job_ids[1:2])
+
+    def test_report_fetch_error_is_reported(self):
+        self.fail_report(self.job_ids[1], AuthorizationError('forbidden'))
+        watcher = self.api.jobs.watch(self.job_ids, min_interval=0.01)
+
+        self.assertEqual([job.id for job in watcher.wait()], self.job_ids)
+        self.assertIsInstance(watcher.errors[self.job_ids[1]], AuthorizationError)
+
+    def test_missing_jobs(self):
+        watcher = self.api.jobs.watch(['unknown'] + self.job_ids, min_interval=0.01, max_missing=2)
+        self.assertEqual([job.id for job in watcher.wait()], self.job_ids)
+        self.assertEqual(watcher.missing, ['unknown'])
+        self.assertEqual(watcher.pending, [])
+
+
+if __name__ == '__main__':
+    unittest.main()